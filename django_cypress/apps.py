@@ -1,4 +1,10 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_migrate
+from django.utils.module_loading import autodiscover_modules
 
 
 class DjangoCypressConfig(AppConfig):
@@ -11,3 +17,35 @@ class DjangoCypressConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_cypress"
     label = "django_cypress"
+
+    def ready(self) -> None:
+        """Connect the signal receivers of the app and discover the factories.
+
+        The factories of the seeded models are registered in the
+        cypress_factories module of the installed apps. When the
+        DJANGO_CYPRESS_WORKER environment variable is set, e.g. by the
+        cypress_run command, the process uses the database of that worker.
+        When the DJANGO_CYPRESS_EMAIL_OUTBOX setting is enabled, the email
+        messages are kept in the in-memory outbox of django_cypress.
+        """
+        from .conf import get_setting
+        from .snapshots import invalidate_baselines
+        from .tracking import install_dirty_table_tracker
+        from .workers import worker_databases
+
+        worker_id = os.environ.get("DJANGO_CYPRESS_WORKER")
+        if worker_id:
+            worker_databases.use_for_process(worker_id)
+
+        if get_setting("EMAIL_OUTBOX"):
+            settings.EMAIL_BACKEND = "django_cypress.mail.EmailBackend"
+
+        pre_migrate.connect(
+            invalidate_baselines, dispatch_uid="django_cypress_invalidate_baselines"
+        )
+        connection_created.connect(
+            install_dirty_table_tracker,
+            dispatch_uid="django_cypress_install_dirty_table_tracker",
+        )
+
+        autodiscover_modules("cypress_factories")
@@ -0,0 +1,185 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple, Type
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Model, Q
+from django.db.models.constants import LOOKUP_SEP
+
+MAX_REPORTED_ROWS = 5
+
+
+def _counts(check: Dict[str, Any]) -> Dict[str, Count]:
+    """Return the counts needed to evaluate a check.
+
+    Args:
+    ----
+    check (Dict[str, Any]): The check.
+
+    Returns:
+    -------
+    Dict[str, Count]: The counted rows, by name: the rows matching the filter
+    of the check and, for a values check, those with other values.
+    """
+    matching = Q(**check.get("filter", {}))
+    counts = {"count": Count("pk", filter=matching, distinct=True)}
+
+    if "values" in check:
+        counts["mismatches"] = Count(
+            "pk", filter=matching & ~Q(**check["values"]), distinct=True
+        )
+
+    return counts
+
+
+def _field_path(model: Type[Model], key: str) -> str:
+    """Return the field path of a filter key, without its lookups.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the filter.
+    key (str): The filter key, e.g. "groups__name__startswith".
+
+    Returns:
+    -------
+    str: The path of the field, e.g. "groups__name", or the key itself if
+    it does not start with a field, e.g. "pk".
+    """
+    path = []
+    opts = model._meta
+
+    for part in key.split(LOOKUP_SEP):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            break
+
+        path.append(part)
+        related_model = field.related_model
+        if related_model is None or isinstance(related_model, str):
+            break
+        opts = related_model._meta
+
+    return LOOKUP_SEP.join(path) or key
+
+
+def _aggregate(
+    model: Type[Model],
+    checks: List[Tuple[int, Dict[str, Any]]],
+) -> Dict[int, Dict[str, int]]:
+    """Count the rows of several checks of a model with a single query.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the checks.
+    checks (List[Tuple[int, Dict[str, Any]]]): The checks with their index.
+
+    Returns:
+    -------
+    Dict[int, Dict[str, int]]: The counted rows of each check, by index.
+    """
+    aggregates = {
+        f"check_{index}_{name}": count
+        for index, check in checks
+        for name, count in _counts(check).items()
+    }
+    values = model._base_manager.aggregate(**aggregates)
+
+    return {
+        index: {name: values[f"check_{index}_{name}"] for name in _counts(check).keys()}
+        for index, check in checks
+    }
+
+
+def _result(
+    model: Type[Model],
+    check: Dict[str, Any],
+    counts: Dict[str, int],
+) -> Dict[str, Any]:
+    """Compare the counted rows of a check with its expectation.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the check.
+    check (Dict[str, Any]): The check.
+    counts (Dict[str, int]): The counted rows of the check.
+
+    Returns:
+    -------
+    Dict[str, Any]: The result of the check, with its expected and actual values.
+    """
+    if "values" in check:
+        passed = counts["count"] > 0 and counts["mismatches"] == 0
+        actual = check["values"]
+        if not passed:
+            fields = dict.fromkeys(_field_path(model, key) for key in check["values"])
+            actual = list(
+                model._base_manager.filter(**check.get("filter", {}))
+                .order_by("pk")
+                .values(*fields)[:MAX_REPORTED_ROWS]
+            )
+        return {"passed": passed, "expected": check["values"], "actual": actual}
+
+    if "count" in check:
+        return {
+            "passed": counts["count"] == check["count"],
+            "expected": check["count"],
+            "actual": counts["count"],
+        }
+
+    expected = check.get("exists", True)
+    return {
+        "passed": (counts["count"] > 0) == expected,
+        "expected": expected,
+        "actual": counts["count"] > 0,
+    }
+
+
+def evaluate_checks(checks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Evaluate declarative checks of the database state.
+
+    Each check holds the label of a model, the filter of a query and an
+    expectation: "exists" (the default), "count", or "values" that every
+    matching row must have. The checks of a model are evaluated with a
+    single aggregate query, and the rows of the failed values checks are
+    read to report their actual values.
+
+    Args:
+    ----
+    checks (List[Dict[str, Any]]): The checks.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The result of each check, in the same order.
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    checks_by_model: Dict[Type[Model], List[Tuple[int, Dict[str, Any]]]] = defaultdict(
+        list
+    )
+
+    for index, check in enumerate(checks):
+        try:
+            checks_by_model[apps.get_model(check["model"])].append((index, check))
+        except Exception as e:
+            results[index] = {"passed": False, "error": str(e)}
+
+    for model, model_checks in checks_by_model.items():
+        try:
+            counts = _aggregate(model, model_checks)
+        except Exception:
+            # Evaluate the checks one by one to report the invalid ones.
+            counts = {}
+            for index, check in model_checks:
+                try:
+                    counts.update(_aggregate(model, [(index, check)]))
+                except Exception as e:
+                    results[index] = {"passed": False, "error": str(e)}
+
+        for index, check in model_checks:
+            if index not in results:
+                try:
+                    results[index] = _result(model, check, counts[index])
+                except Exception as e:
+                    results[index] = {"passed": False, "error": str(e)}
+
+    return [{"check": check, **results[index]} for index, check in enumerate(checks)]
@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.views.decorators.csrf import csrf_exempt
+
+from . import views
+from .executor import run_blocking
+from .workers import use_worker_database
+
+
+class AsyncViewMixin(views.CypressView):
+    """Turn a Cypress view into an asynchronous view.
+
+    The whole synchronous dispatch, including the CSRF check and the
+    handler, runs in the dedicated thread pool, so the event loop keeps
+    serving the application while the database is flushed or migrated.
+    The views managing the test transaction set thread_sensitive to run
+    in the thread of the request instead, which holds the lock of the
+    shared connection.
+    """
+
+    view_is_async = True
+    thread_sensitive = False
+
+    @csrf_exempt
+    async def dispatch(  # type: ignore[override]
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Dispatch the request in the thread pool.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+        *args: The positional arguments of the URL.
+        **kwargs: The keyword arguments of the URL.
+
+        Returns:
+        -------
+        HttpResponseBase: The response of the handler.
+        """
+        if self.thread_sensitive:
+            dispatch = sync_to_async(self._dispatch, thread_sensitive=True)
+            response = await dispatch(request, *args, **kwargs)
+        else:
+            response = await run_blocking(self._dispatch, request, *args, **kwargs)
+
+        # Django returns the responses of OPTIONS requests and of the
+        # unknown methods as coroutines when the view is asynchronous.
+        if asyncio.iscoroutine(response):
+            response = await response
+
+        return response
+
+    def _dispatch(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Dispatch the request synchronously on the database of its worker.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+        *args: The positional arguments of the URL.
+        **kwargs: The keyword arguments of the URL.
+
+        Returns:
+        -------
+        HttpResponseBase: The response of the handler.
+        """
+        with use_worker_database(getattr(request, "cypress_database", None)):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class CreateUserView(AsyncViewMixin, views.CreateUserView):
+    """Asynchronous variant of the CreateUserView."""
+
+
+class LoginView(AsyncViewMixin, views.LoginView):
+    """Asynchronous variant of the LoginView."""
+
+
+class CreateUsersView(AsyncViewMixin, views.CreateUsersView):
+    """Asynchronous variant of the CreateUsersView."""
+
+
+class SeedView(AsyncViewMixin, views.SeedView):
+    """Asynchronous variant of the SeedView."""
+
+
+class WaitForView(AsyncViewMixin, views.WaitForView):
+    """Asynchronous variant of the WaitForView.
+
+    The wait runs in the thread pool, so it does not block the other
+    requests.
+    """
+
+
+class AssertView(AsyncViewMixin, views.AssertView):
+    """Asynchronous variant of the AssertView."""
+
+
+class RefreshDatabaseView(AsyncViewMixin, views.RefreshDatabaseView):
+    """Asynchronous variant of the RefreshDatabaseView."""
+
+
+class MigrateView(AsyncViewMixin, views.MigrateView):
+    """Asynchronous variant of the MigrateView."""
+
+
+class ManageView(AsyncViewMixin, views.ManageView):
+    """Asynchronous variant of the ManageView."""
+
+
+class LoadFixturesView(AsyncViewMixin, views.LoadFixturesView):
+    """Asynchronous variant of the LoadFixturesView."""
+
+
+class JobView(AsyncViewMixin, views.JobView):
+    """Asynchronous variant of the JobView."""
+
+
+class BeginTransactionView(AsyncViewMixin, views.BeginTransactionView):
+    """Asynchronous variant of the BeginTransactionView."""
+
+    thread_sensitive = True
+
+
+class RollbackTransactionView(AsyncViewMixin, views.RollbackTransactionView):
+    """Asynchronous variant of the RollbackTransactionView."""
+
+    thread_sensitive = True
+
+
+class SaveSnapshotView(AsyncViewMixin, views.SaveSnapshotView):
+    """Asynchronous variant of the SaveSnapshotView."""
+
+
+class RestoreSnapshotView(AsyncViewMixin, views.RestoreSnapshotView):
+    """Asynchronous variant of the RestoreSnapshotView."""
+
+
+class WarmupView(AsyncViewMixin, views.WarmupView):
+    """Asynchronous variant of the WarmupView."""
+
+
+class CSRFTokenView(AsyncViewMixin, views.CSRFTokenView):
+    """Asynchronous variant of the CSRFTokenView."""
+
+
+class StatsView(AsyncViewMixin, views.StatsView):
+    """Asynchronous variant of the StatsView."""
+
+
+class QueriesView(AsyncViewMixin, views.QueriesView):
+    """Asynchronous variant of the QueriesView."""
+
+
+class MailView(AsyncViewMixin, views.MailView):
+    """Asynchronous variant of the MailView.
+
+    The wait runs in the thread pool, so it does not block the other
+    requests.
+    """
+
+
+class ProfilesView(AsyncViewMixin, views.ProfilesView):
+    """Asynchronous variant of the ProfilesView."""
+
+
+class BatchView(AsyncViewMixin, views.BatchView):
+    """Asynchronous variant of the BatchView.
+
+    The operations of the batch run in the same thread as the batch
+    itself, so they use the synchronous views.
+    """
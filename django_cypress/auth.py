@@ -0,0 +1,132 @@
+import threading
+from importlib import import_module
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+
+from .passwords import make_cypress_password
+
+
+def build_user(
+    user_model: Any,
+    attributes: Dict[str, Any],
+) -> Any:
+    """Build an unsaved user the same way create_user does.
+
+    Args:
+    ----
+    user_model (Any): The User Model.
+    attributes (Dict[str, Any]): The attributes of the user.
+
+    Returns:
+    -------
+    Any: The unsaved user.
+    """
+    password = attributes.pop("password", None)
+
+    username_field = user_model.USERNAME_FIELD
+    if username_field in attributes:
+        attributes[username_field] = user_model.normalize_username(
+            attributes[username_field]
+        )
+
+    email_field = user_model.get_email_field_name()
+    if email_field in attributes:
+        attributes[email_field] = BaseUserManager.normalize_email(
+            attributes[email_field]
+        )
+
+    user = user_model(**attributes)
+    user.password = make_cypress_password(password)
+    return user
+
+
+class SessionCache:
+    """Reuse the sessions written for the users logged in by Cypress.
+
+    A session is reused while it still exists in the session engine and
+    the password of its user did not change, so a user logged in by every
+    test gets a single session per run. The sessions are kept per
+    database, so each parallel Cypress worker has its own.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the session cache."""
+        self._sessions: Dict[Tuple[str, str, Any], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def get_session_key(self, user: AbstractBaseUser, backend: str) -> str:
+        """Return the key of a session in which a user is logged in.
+
+        Args:
+        ----
+        user (AbstractBaseUser): The user.
+        backend (str): The path of the authentication backend of the user.
+
+        Returns:
+        -------
+        str: The session key.
+        """
+        engine = import_module(settings.SESSION_ENGINE)
+        cache_key = (
+            connections[DEFAULT_DB_ALIAS].alias,
+            settings.SESSION_ENGINE,
+            user.pk,
+        )
+        session_auth_hash = user.get_session_auth_hash()
+
+        with self._lock:
+            cached_session = self._sessions.get(cache_key)
+        if (
+            cached_session is not None
+            and cached_session[1] == session_auth_hash
+            and engine.SessionStore().exists(cached_session[0])
+        ):
+            return cached_session[0]
+
+        session = engine.SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = backend
+        session[HASH_SESSION_KEY] = session_auth_hash
+        session.save()
+
+        with self._lock:
+            self._sessions[cache_key] = (session.session_key, session_auth_hash)
+
+        return session.session_key
+
+    def clear(self) -> None:
+        """Forget every session."""
+        with self._lock:
+            self._sessions.clear()
+
+
+session_cache = SessionCache()
+
+
+def set_session_cookie(response: HttpResponse, session_key: str) -> None:
+    """Set the session cookie the same way the SessionMiddleware does.
+
+    Args:
+    ----
+    response (HttpResponse): The HTTP response.
+    session_key (str): The session key.
+    """
+    response.set_cookie(
+        settings.SESSION_COOKIE_NAME,
+        session_key,
+        max_age=(
+            None
+            if settings.SESSION_EXPIRE_AT_BROWSER_CLOSE
+            else settings.SESSION_COOKIE_AGE
+        ),
+        domain=settings.SESSION_COOKIE_DOMAIN,
+        path=settings.SESSION_COOKIE_PATH,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=settings.SESSION_COOKIE_HTTPONLY,
+        samesite=settings.SESSION_COOKIE_SAMESITE,
+    )
@@ -0,0 +1,44 @@
+from typing import Any, List, Optional, Sequence, Type
+
+from django.db import connections, router
+from django.db.models import Max, Model
+
+
+def bulk_insert(
+    model: Type[Model],
+    objects: Sequence[Model],
+    batch_size: Optional[int] = None,
+) -> List[Any]:
+    """Insert model instances with bulk_create and return their primary keys.
+
+    Databases that cannot return the rows of a bulk insert leave the
+    primary keys of the instances empty. For those, the keys greater
+    than the last key before the insert are read back.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the instances.
+    objects (Sequence[Model]): The instances to insert.
+    batch_size (Optional[int]): The number of instances inserted per query.
+
+    Returns:
+    -------
+    List[Any]: The primary keys of the inserted instances.
+    """
+    using = router.db_for_write(model)
+    manager = model._base_manager.using(using)
+    previous_pk = None
+
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        previous_pk = manager.aggregate(previous_pk=Max("pk"))["previous_pk"]
+
+    manager.bulk_create(objects, batch_size=batch_size)
+
+    if all(instance.pk is not None for instance in objects):
+        return [instance.pk for instance in objects]
+
+    queryset = manager.order_by("pk")
+    if previous_pk is not None:
+        queryset = queryset.filter(pk__gt=previous_pk)
+
+    return list(queryset.values_list("pk", flat=True))
@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.conf import settings
+
+DEFAULTS = {
+    "REFRESH_DATABASE_MODE": "flush",
+    "SECRET": None,
+    "PASSWORD_HASHER": None,
+    "MEMOIZE_PASSWORDS": True,
+    "MIGRATION_CACHE_DIR": None,
+    "MIGRATION_CACHE_SIZE": 3,
+    "SNAPSHOT_DIR": None,
+    "SNAPSHOT_STORE_SIZE": 1024**3,
+    "ASYNC_VIEWS": None,
+    "THREAD_POOL_SIZE": 4,
+    "JOB_POOL_SIZE": 4,
+    "SEED_BATCH_SIZE": 1000,
+    "WAIT_FOR_TIMEOUT": 30,
+    "EMAIL_OUTBOX": False,
+}
+
+
+def get_setting(name: str) -> Any:
+    """Return the value of a django_cypress setting.
+
+    Settings are read from the Django settings module using the
+    ``DJANGO_CYPRESS_`` prefix and fall back to the package defaults.
+
+    Args:
+    ----
+    name (str): The name of the setting without the prefix.
+
+    Returns:
+    -------
+    Any: The configured value or the default one.
+    """
+    return getattr(settings, f"DJANGO_CYPRESS_{name}", DEFAULTS[name])
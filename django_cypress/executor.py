@@ -0,0 +1,64 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+
+from .conf import get_setting
+from .isolation import transaction_isolation
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool running the blocking work of the async views.
+
+    The pool is created on first use with the number of threads set by
+    the DJANGO_CYPRESS_THREAD_POOL_SIZE setting. It is separate from the
+    default executor of the event loop and from the thread running the
+    synchronous views, so the setup work of Cypress never delays the
+    requests of the application under test.
+
+    Returns
+    -------
+        ThreadPoolExecutor: The thread pool.
+    """
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_setting("THREAD_POOL_SIZE"),
+                thread_name_prefix="django-cypress",
+            )
+
+        return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function without blocking the event loop.
+
+    While a test transaction is open, the shared connection can only be
+    used by the thread that pinned it, so the function runs in the thread
+    of the current request instead of the dedicated thread pool.
+
+    Args:
+    ----
+    func (Callable): The blocking function.
+    *args: The positional arguments of the function.
+    **kwargs: The keyword arguments of the function.
+
+    Returns:
+    -------
+    Any: The return value of the function.
+    """
+    if transaction_isolation.is_active:
+        return await sync_to_async(func, thread_sensitive=True)(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,123 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from django.db.models import Model
+
+Factory = Callable[..., Model]
+
+
+def default_factory(model: Type[Model], index: int, **overrides: Any) -> Model:
+    """Build an unsaved instance from the overrides alone.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the instance.
+    index (int): The position of the instance in the seeded rows.
+    **overrides: The field values of the instance.
+
+    Returns:
+    -------
+    Model: The unsaved instance.
+    """
+    return model(**overrides)
+
+
+class FactoryRegistry:
+    """The factories building the instances seeded by Cypress.
+
+    A factory is called with the model, the position of the instance in
+    the seeded rows and the overrides sent by Cypress, and returns an
+    unsaved instance. The factories are registered in the
+    cypress_factories module of the installed apps, which is imported
+    when the django_cypress app is ready. Models without a factory are
+    built from the overrides alone.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._factories: Dict[str, Factory] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        model: str,
+        factory: Optional[Factory] = None,
+    ) -> Any:
+        """Register the factory of a model.
+
+        It can also be used as a decorator, e.g.
+        ``@factories.register("shop.Order")``.
+
+        Args:
+        ----
+        model (str): The label of the model, e.g. "shop.Order".
+        factory (Optional[Factory]): The factory.
+
+        Returns:
+        -------
+        Any: The factory, or a decorator registering it.
+        """
+        if factory is None:
+            return lambda factory: self.register(model, factory)
+
+        with self._lock:
+            self._factories[model.lower()] = factory
+
+        return factory
+
+    def unregister(self, model: str) -> None:
+        """Remove the factory of a model.
+
+        Args:
+        ----
+        model (str): The label of the model.
+        """
+        with self._lock:
+            self._factories.pop(model.lower(), None)
+
+    def build(
+        self,
+        model: Type[Model],
+        count: int,
+        overrides: Optional[Dict[str, Any]] = None,
+    ) -> List[Model]:
+        """Build unsaved instances of a model with its factory.
+
+        The string overrides may contain "{n}", which is replaced by the
+        position of each instance, e.g. to build unique values.
+
+        Args:
+        ----
+        model (Type[Model]): The model.
+        count (int): The number of instances.
+        overrides (Optional[Dict[str, Any]]): The field values of the instances.
+
+        Returns:
+        -------
+        List[Model]: The unsaved instances.
+        """
+        with self._lock:
+            factory = self._factories.get(model._meta.label_lower, default_factory)
+
+        overrides = overrides or {}
+        templates = {
+            name: value
+            for name, value in overrides.items()
+            if isinstance(value, str) and "{n}" in value
+        }
+
+        instances = []
+        for index in range(count):
+            values = {
+                **overrides,
+                **{
+                    name: template.replace("{n}", str(index))
+                    for name, template in templates.items()
+                },
+            }
+            instances.append(factory(model, index, **values))
+
+        return instances
+
+
+factories = FactoryRegistry()
@@ -0,0 +1,371 @@
+import copy
+import gzip
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Type
+
+from django.core import serializers
+from django.core.management.base import CommandError
+from django.core.management.color import no_style
+from django.core.management.commands import loaddata
+from django.core.serializers.base import DeserializedObject
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.models import Model
+
+
+class FixtureCache:
+    """Keep the parsed objects of the fixture files in memory.
+
+    The objects of a file are parsed again only when its modification
+    time changes. The natural keys of the fixtures are resolved when they
+    are parsed, so they must point to the same rows on every load, e.g.
+    rows created by the migrations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._entries: Dict[Tuple[str, str], Tuple[int, List[DeserializedObject]]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        path: str,
+        using: str,
+        parse: Any,
+    ) -> List[DeserializedObject]:
+        """Return the parsed objects of a fixture file.
+
+        Args:
+        ----
+        path (str): The path of the fixture file.
+        using (str): The alias of the database.
+        parse (Any): The function parsing the file when it is not cached.
+
+        Returns:
+        -------
+        List[DeserializedObject]: The parsed objects.
+        """
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._entries.get((path, using))
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        objects = parse(path)
+        with self._lock:
+            self._entries[(path, using)] = (mtime, objects)
+
+        return objects
+
+    def clear(self) -> None:
+        """Forget every parsed fixture."""
+        with self._lock:
+            self._entries.clear()
+
+
+fixture_cache = FixtureCache()
+
+# find_fixtures() is wrapped by functools.lru_cache, whose cache would keep
+# every loader alive, so the loaders call the wrapped function.
+find_fixtures: Callable[
+    [loaddata.Command, str], List[Tuple[str, Optional[str], Optional[str]]]
+] = getattr(
+    loaddata.Command.find_fixtures, "__wrapped__", loaddata.Command.find_fixtures
+)
+
+
+def sort_models(models: Set[Type[Model]]) -> List[Type[Model]]:
+    """Sort models so that each one comes after the models it references.
+
+    The models of a reference cycle are kept in an arbitrary order, which
+    is fine because the constraints are checked at the end of the load.
+
+    Args:
+    ----
+    models (Set[Type[Model]]): The models.
+
+    Returns:
+    -------
+    List[Type[Model]]: The sorted models.
+    """
+    sorted_models: List[Type[Model]] = []
+    visiting: Set[Type[Model]] = set()
+
+    def visit(model: Type[Model]) -> None:
+        if model in sorted_models or model in visiting:
+            return
+
+        visiting.add(model)
+        for field in model._meta.fields:
+            if field.concrete and field.remote_field is not None:
+                related_model = field.remote_field.model
+                if related_model in models and related_model is not model:
+                    visit(related_model)
+        visiting.discard(model)
+        sorted_models.append(model)
+
+    for model in sorted(models, key=lambda model: model._meta.label):
+        visit(model)
+
+    return sorted_models
+
+
+def _compression_formats() -> Dict[Optional[str], Tuple[Callable[..., Any], str]]:
+    """Return the compression formats of the fixture files.
+
+    Recent Django versions provide them as a property of the loaddata
+    command, while Django 3.2 only sets them in its handle method.
+
+    Returns
+    -------
+        Dict[Optional[str], Tuple[Callable[..., Any], str]]: The open
+        function and its mode for each compression format.
+    """
+    formats: Dict[Optional[str], Tuple[Callable[..., Any], str]] = {
+        None: (open, "rb"),
+        "gz": (gzip.GzipFile, "rb"),
+        "zip": (loaddata.SingleZipReader, "r"),
+    }
+    if loaddata.has_bz2:
+        import bz2
+
+        formats["bz2"] = (bz2.BZ2File, "r")
+    if loaddata.has_lzma:
+        import lzma
+
+        formats["lzma"] = (lzma.LZMAFile, "r")
+        formats["xz"] = (lzma.LZMAFile, "r")
+
+    return formats
+
+
+class FixtureLoader(loaddata.Command):
+    """Load fixtures with bulk queries instead of one save per object.
+
+    The fixture files are found like the loaddata command does, and their
+    parsed objects are cached by the fixture cache. The objects are
+    inserted model by model in dependency order, the rows that already
+    exist are updated, and the sequences are reset once at the end. As
+    with bulk_create, the save method of the models and their signals are
+    not run. The objects of multi-table inherited models and the objects
+    with forward references are saved one by one like loaddata does.
+    """
+
+    compression_formats: Dict[Optional[str], Tuple[Callable[..., Any], str]]
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Initialize the loader.
+
+        Args:
+        ----
+        using (str): The alias of the database.
+        """
+        super().__init__()
+        self.using = using
+        self.app_label = ""
+        self.verbosity = 0
+        self.format = ""
+        self.ignore = False
+        self.serialization_formats = serializers.get_public_serializer_formats()
+        if not hasattr(self, "compression_formats"):
+            self.compression_formats = _compression_formats()
+
+    def load(self, fixture_labels: Sequence[str]) -> Dict[str, int]:
+        """Load fixtures in one transaction.
+
+        Args:
+        ----
+        fixture_labels (Sequence[str]): The fixture names, as for loaddata.
+
+        Returns:
+        -------
+        Dict[str, int]: The number of fixture files and of loaded objects.
+        """
+        fixture_files: List[str] = []
+        for fixture_label in fixture_labels:
+            found_files = find_fixtures(self, fixture_label)
+            fixture_files.extend(fixture_file for fixture_file, _, _ in found_files)
+
+        objects_by_model: Dict[Type[Model], List[DeserializedObject]] = {}
+        for fixture_file in fixture_files:
+            for obj in fixture_cache.get(fixture_file, self.using, self._parse):
+                model = type(obj.object)
+                if router.allow_migrate_model(self.using, model):
+                    objects_by_model.setdefault(model, []).append(obj)
+
+        connection = connections[self.using]
+        models = sort_models(set(objects_by_model))
+
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                deferred_objects = []
+                for model in models:
+                    deferred_objects.extend(
+                        self._insert(model, objects_by_model[model])
+                    )
+                for obj in deferred_objects:
+                    obj.save_deferred_fields(using=self.using)
+
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+
+        return {
+            "fixtures": len(fixture_files),
+            "objects": sum(len(objects) for objects in objects_by_model.values()),
+        }
+
+    def _parse(self, fixture_file: str) -> List[DeserializedObject]:
+        """Parse a fixture file.
+
+        Args:
+        ----
+        fixture_file (str): The path of the fixture file.
+
+        Returns:
+        -------
+        List[DeserializedObject]: The parsed objects.
+        """
+        _, serialization_format, compression_format = self.parse_name(
+            os.path.basename(fixture_file)
+        )
+        if serialization_format is None:
+            raise CommandError(
+                f"Problem installing fixture '{fixture_file}': unknown format."
+            )
+        open_method, mode = self.compression_formats[compression_format]
+
+        with open_method(fixture_file, mode) as fixture:
+            try:
+                return list(
+                    serializers.deserialize(
+                        serialization_format,
+                        fixture,
+                        using=self.using,
+                        handle_forward_references=True,
+                    )
+                )
+            except Exception as e:
+                raise CommandError(
+                    f"Problem installing fixture '{fixture_file}': {e}"
+                ) from e
+
+    def _insert(
+        self,
+        model: Type[Model],
+        objects: List[DeserializedObject],
+    ) -> List[DeserializedObject]:
+        """Insert or update the objects of a model.
+
+        The cached objects are copied, so they stay untouched by the insert.
+        When the database cannot update the conflicting rows of a bulk insert,
+        e.g. before Django 4.1, the objects are saved one by one.
+
+        Args:
+        ----
+        model (Type[Model]): The model of the objects.
+        objects (List[DeserializedObject]): The parsed objects.
+
+        Returns:
+        -------
+        List[DeserializedObject]: The copied objects with forward references,
+        which are saved once every object is inserted.
+        """
+        copies = [
+            DeserializedObject(copy.copy(obj.object), obj.m2m_data, obj.deferred_fields)
+            for obj in objects
+        ]
+        deferred_objects = [obj for obj in copies if obj.deferred_fields]
+
+        features = connections[self.using].features
+        # bulk_create() updates the conflicting rows since Django 4.1 only.
+        supports_upsert = getattr(features, "supports_update_conflicts", False)
+        has_pks = any(obj.object.pk is not None for obj in copies)
+
+        if model._meta.parents or (has_pks and not supports_upsert):
+            for obj in copies:
+                obj.save(using=self.using)
+            return deferred_objects
+
+        fields = [field for field in model._meta.local_fields if field.concrete]
+        update_fields = [field.name for field in fields if not field.primary_key]
+        options: Dict[str, Any] = {}
+
+        if update_fields and all(obj.object.pk is not None for obj in copies):
+            options = {"update_conflicts": True, "update_fields": update_fields}
+            # MySQL updates the rows conflicting with any unique key and does
+            # not accept the unique fields of the conflict.
+            if features.supports_update_conflicts_with_target:
+                options["unique_fields"] = [
+                    field.name for field in fields if field.primary_key
+                ]
+
+        model._base_manager.using(self.using).bulk_create(
+            [obj.object for obj in copies], **options
+        )
+
+        self._set_many_to_many(model, copies)
+
+        return deferred_objects
+
+    def _set_many_to_many(
+        self,
+        model: Type[Model],
+        objects: List[DeserializedObject],
+    ) -> None:
+        """Replace the many-to-many relations of the objects with bulk queries.
+
+        Args:
+        ----
+        model (Type[Model]): The model of the objects.
+        objects (List[DeserializedObject]): The inserted objects.
+        """
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            if through is None or not through._meta.auto_created:
+                continue
+
+            source = field.m2m_column_name()
+            target = field.m2m_reverse_name()
+            related_objects = [
+                (obj.object.pk, obj.m2m_data[field.name])
+                for obj in objects
+                if obj.m2m_data and field.name in obj.m2m_data
+            ]
+            if not related_objects:
+                continue
+
+            manager = through._base_manager.using(self.using)
+            manager.filter(
+                **{f"{source}__in": [pk for pk, _ in related_objects]}
+            ).delete()
+            manager.bulk_create(
+                [
+                    through(**{source: pk, target: related_pk})
+                    for pk, related_pks in related_objects
+                    for related_pk in related_pks
+                ]
+            )
+
+
+def load_fixtures(
+    fixture_labels: Sequence[str],
+    using: Optional[str] = None,
+) -> Dict[str, int]:
+    """Load fixtures with bulk queries, reusing their parsed objects.
+
+    Args:
+    ----
+    fixture_labels (Sequence[str]): The fixture names, as for loaddata.
+    using (Optional[str]): The alias of the database.
+
+    Returns:
+    -------
+    Dict[str, int]: The number of fixture files and of loaded objects.
+    """
+    return FixtureLoader(using or DEFAULT_DB_ALIAS).load(fixture_labels)
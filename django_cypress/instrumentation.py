@@ -0,0 +1,270 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_state = threading.local()
+
+
+class RequestTiming:
+    """Measure the phases of a request to a Cypress endpoint.
+
+    An instance is installed as an execute wrapper of the default database
+    connection, so each phase records its wall time, the time spent in the
+    database and the number of queries. Phases can be nested, and the
+    phases nested in a prefixing phase are named after it, e.g. the
+    "insert" phase of a "seed" operation is recorded as "seed.insert".
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._active: List[Dict[str, float]] = []
+        self._prefixes: List[str] = []
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """Run a query and add its duration to the active phases.
+
+        Args:
+        ----
+        execute (Callable): The function running the query.
+        sql (str): The SQL statement.
+        params (Any): The parameters of the statement.
+        many (bool): Whether the statement runs with several sets of parameters.
+        context (Dict[str, Any]): The connection and the cursor of the query.
+
+        Returns:
+        -------
+        Any: The result of the query.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            for metrics in self._active:
+                metrics["db_ms"] += duration
+                metrics["queries"] += 1
+
+    @contextmanager
+    def phase(self, name: str, prefix: bool = False) -> Iterator[None]:
+        """Measure a phase of the request.
+
+        Args:
+        ----
+        name (str): The name of the phase.
+        prefix (bool): Whether to name the nested phases after this one.
+        """
+        name = ".".join([*self._prefixes[-1:], name])
+        metrics = self.phases.setdefault(
+            name, {"wall_ms": 0.0, "db_ms": 0.0, "queries": 0}
+        )
+        self._active.append(metrics)
+        if prefix:
+            self._prefixes.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            metrics["wall_ms"] += (time.perf_counter() - start) * 1000
+            self._active.pop()
+            if prefix:
+                self._prefixes.pop()
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Return the metrics of the phases.
+
+        Returns
+        -------
+            Dict[str, Dict[str, float]]: The wall time, the database time and the
+            number of queries of each phase, with the times in milliseconds.
+        """
+        return {
+            name: {
+                "wall_ms": round(metrics["wall_ms"], 3),
+                "db_ms": round(metrics["db_ms"], 3),
+                "queries": metrics["queries"],
+            }
+            for name, metrics in self.phases.items()
+        }
+
+    def server_timing(self) -> str:
+        """Return the value of the Server-Timing header.
+
+        Returns
+        -------
+            str: One metric for the wall time and one for the database time
+            of each phase.
+        """
+        return ", ".join(
+            f"{name};dur={metrics['wall_ms']:.3f}, "
+            + f'{name}-db;dur={metrics["db_ms"]:.3f};desc="{metrics["queries"]} queries"'
+            for name, metrics in self.phases.items()
+        )
+
+
+class LatencyStats:
+    """Aggregate the latency of the Cypress endpoints since the server started.
+
+    The latencies are counted in a histogram per endpoint, whose buckets
+    are upper bounds in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, duration: float) -> None:
+        """Record the latency of a request.
+
+        Args:
+        ----
+        endpoint (str): The name of the endpoint.
+        duration (float): The latency in milliseconds.
+        """
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                endpoint,
+                {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(HISTOGRAM_BUCKETS) + 1),
+                },
+            )
+            stats["count"] += 1
+            stats["total_ms"] += duration
+            stats["max_ms"] = max(stats["max_ms"], duration)
+            stats["histogram"][bisect.bisect_left(HISTOGRAM_BUCKETS, duration)] += 1
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of every endpoint.
+
+        Returns
+        -------
+            Dict[str, Dict[str, Any]]: The number of requests, the total, mean and
+            maximum latencies and the histogram of each endpoint.
+        """
+        labels = [f"<={bucket}" for bucket in HISTOGRAM_BUCKETS]
+        labels.append(f">{HISTOGRAM_BUCKETS[-1]}")
+
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "histogram": {
+                        label: stats["histogram"][index]
+                        for index, label in enumerate(labels)
+                    },
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        """Forget every recorded latency."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+latency_stats = LatencyStats()
+
+
+@contextmanager
+def track_request(endpoint: str) -> Iterator[Optional[RequestTiming]]:
+    """Measure a request to a Cypress endpoint.
+
+    The whole request is measured as the "total" phase and its latency is
+    recorded in the statistics. A request dispatched inside another one,
+    e.g. an operation of a batch, is measured by the phase of the outer
+    request around it.
+
+    Args:
+    ----
+    endpoint (str): The name of the endpoint.
+
+    Yields:
+    ------
+    Optional[RequestTiming]: The timing of the request, or None if it is
+    nested in another request.
+    """
+    if getattr(_state, "timing", None) is not None:
+        yield None
+        return
+
+    timing = RequestTiming()
+    _state.timing = timing
+    try:
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(timing):
+            with timing.phase("total"):
+                yield timing
+    finally:
+        _state.timing = None
+        latency_stats.record(endpoint, timing.phases["total"]["wall_ms"])
+
+
+@contextmanager
+def phase(name: str, prefix: bool = False) -> Iterator[None]:
+    """Measure a phase of the current request, if any.
+
+    Args:
+    ----
+    name (str): The name of the phase.
+    prefix (bool): Whether to name the nested phases after this one.
+    """
+    timing: Optional[RequestTiming] = getattr(_state, "timing", None)
+    if timing is None:
+        yield
+        return
+
+    with timing.phase(name, prefix):
+        yield
+
+
+def add_timing(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    timing: RequestTiming,
+) -> None:
+    """Add the timing of a request to its response.
+
+    The Server-Timing header is always set. The timing block is added
+    to the JSON body when the request carries the X-Cypress-Timing header.
+
+    Args:
+    ----
+    request (HttpRequest): The HTTP request object.
+    response (HttpResponseBase): The response of the view.
+    timing (RequestTiming): The timing of the request.
+    """
+    response["Server-Timing"] = timing.server_timing()
+
+    if not request.headers.get("X-Cypress-Timing"):
+        return
+    if not isinstance(response, HttpResponse):
+        return
+    if response.get("Content-Type") != "application/json":
+        return
+
+    body = json.loads(response.content)
+    if isinstance(body, dict):
+        body["timing"] = timing.as_dict()
+        response.content = json.dumps(body)
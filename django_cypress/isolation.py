@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+class TransactionIsolation:
+    """Isolate Cypress tests by rolling back a shared transaction.
+
+    While a test transaction is open, every request is pinned to the
+    same database connection, which is wrapped in an atomic block.
+    Rolling the transaction back discards everything the test wrote,
+    similarly to Django's TestCase.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Initialize the transaction isolation.
+
+        Args:
+        ----
+        using (str): The alias of the isolated database.
+        """
+        self.using = using
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connection: Optional[BaseDatabaseWrapper] = None
+        self._atomic: Optional[transaction.Atomic] = None
+
+    @property
+    def is_active(self) -> bool:
+        """Return whether a test transaction is open."""
+        return self._connection is not None
+
+    def begin(self) -> None:
+        """Open a test transaction on a new shared connection.
+
+        A test transaction that is already open is rolled back first.
+        """
+        with self._lock:
+            self.rollback()
+
+            connection = connections[self.using].copy()
+            connection.inc_thread_sharing()
+            self._connection = connection
+
+            with self.pinned():
+                self._atomic = transaction.atomic(using=self.using)
+                self._atomic.__enter__()
+
+    def rollback(self) -> None:
+        """Roll back the test transaction and close the shared connection."""
+        with self._lock:
+            if self._connection is None or self._atomic is None:
+                return
+
+            with self.pinned():
+                transaction.set_rollback(True, using=self.using)
+                self._atomic.__exit__(None, None, None)
+
+            self._connection.close()
+            self._connection.dec_thread_sharing()
+            self._connection = None
+            self._atomic = None
+
+    @contextmanager
+    def pinned(self) -> Iterator[None]:
+        """Use the shared connection in the current thread.
+
+        Only one thread at a time can use the shared connection, so the
+        context holds a lock for its whole duration. Nothing is done when
+        no test transaction is open, so the requests run concurrently.
+        """
+        if not self.is_active:
+            yield
+            return
+
+        with self._lock:
+            self._local.depth = getattr(self._local, "depth", 0) + 1
+            try:
+                if self._connection is None:
+                    # The test transaction was rolled back while waiting.
+                    yield
+                    return
+
+                original_connection = connections[self.using]
+                connections[self.using] = self._connection
+                try:
+                    yield
+                finally:
+                    connections[self.using] = original_connection
+            finally:
+                self._local.depth -= 1
+
+    @contextmanager
+    def released(self) -> Iterator[None]:
+        """Let the other threads use the shared connection for a while.
+
+        The locks held by the pinned() contexts of the current thread are
+        released, e.g. while a request waits for the writes of another one,
+        and taken back at the end.
+        """
+        depth = getattr(self._local, "depth", 0)
+        for _ in range(depth):
+            self._lock.release()
+        try:
+            yield
+        finally:
+            for _ in range(depth):
+                self._lock.acquire()
+
+
+transaction_isolation = TransactionIsolation()
@@ -0,0 +1,176 @@
+import io
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from django.core import management
+from django.db import close_old_connections
+
+from .conf import get_setting
+from .isolation import transaction_isolation
+from .workers import use_worker_database
+
+MAX_FINISHED_JOBS = 100
+
+
+class Job:
+    """A management command running in the background.
+
+    The output of the command is captured while it runs, so it can be
+    polled to follow the progress of the command.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        parameters: List[str],
+        database: Optional[str] = None,
+    ) -> None:
+        """Initialize the job.
+
+        Args:
+        ----
+        command (str): The name of the management command.
+        parameters (List[str]): The arguments of the command.
+        database (Optional[str]): The alias of the database of the Cypress
+            worker that started the job, if any.
+        """
+        self.id = uuid.uuid4().hex
+        self.command = command
+        self.parameters = parameters
+        self.database = database
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.stdout = io.StringIO()
+        self.stderr = io.StringIO()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Return whether the command exited."""
+        return self.status in ("succeeded", "failed")
+
+    def run(self) -> None:
+        """Run the command and record its exit state.
+
+        The command only uses the shared connection of a test transaction
+        when one is open. Otherwise the requests, including the ones
+        polling the job, keep running concurrently with the command.
+        """
+        self.started_at = time.monotonic()
+        self.status = "running"
+
+        try:
+            with use_worker_database(self.database), transaction_isolation.pinned():
+                management.call_command(
+                    self.command,
+                    *self.parameters,
+                    stdout=self.stdout,
+                    stderr=self.stderr,
+                )
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        else:
+            self.status = "succeeded"
+        finally:
+            self.finished_at = time.monotonic()
+            close_old_connections()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the state of the job.
+
+        Returns
+        -------
+            Dict[str, Any]: The state of the job, serializable to JSON.
+        """
+        if self.started_at is None:
+            duration = None
+        else:
+            duration = (self.finished_at or time.monotonic()) - self.started_at
+
+        return {
+            "job_id": self.id,
+            "command": self.command,
+            "status": self.status,
+            "stdout": self.stdout.getvalue(),
+            "stderr": self.stderr.getvalue(),
+            "error": self.error,
+            "duration": duration,
+        }
+
+
+class JobQueue:
+    """Run management commands in a thread pool and keep track of them.
+
+    The pool size is set by the DJANGO_CYPRESS_JOB_POOL_SIZE setting.
+    Only the most recent finished jobs are kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the job queue."""
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        command: str,
+        parameters: List[str],
+        database: Optional[str] = None,
+    ) -> Job:
+        """Schedule a management command.
+
+        Args:
+        ----
+        command (str): The name of the management command.
+        parameters (List[str]): The arguments of the command.
+        database (Optional[str]): The alias of the database of the Cypress
+            worker that started the job, if any.
+
+        Returns:
+        -------
+        Job: The scheduled job.
+        """
+        job = Job(command, parameters, database)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=get_setting("JOB_POOL_SIZE"),
+                    thread_name_prefix="django-cypress-job",
+                )
+
+            self._jobs[job.id] = job
+            self._prune()
+            self._executor.submit(job.run)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job.
+
+        Args:
+        ----
+        job_id (str): The ID of the job.
+
+        Returns:
+        -------
+        Optional[Job]: The job, or None if it does not exist.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs exceeding MAX_FINISHED_JOBS."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+
+        for job_id in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+
+job_queue = JobQueue()
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends import locmem
+
+from .isolation import transaction_isolation
+
+POLL_INTERVAL = 0.1
+
+
+def message_as_dict(message: EmailMessage) -> Dict[str, Any]:
+    """Return the fields of an email message.
+
+    Args:
+    ----
+    message (EmailMessage): The email message.
+
+    Returns:
+    -------
+    Dict[str, Any]: The fields of the message, its HTML alternative if any,
+    and the names of its attachments.
+    """
+    html = next(
+        (
+            content
+            for content, mimetype in getattr(message, "alternatives", [])
+            if mimetype == "text/html"
+        ),
+        None,
+    )
+
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "html": html,
+        "from_email": message.from_email,
+        "to": message.to,
+        "cc": message.cc,
+        "bcc": message.bcc,
+        "reply_to": message.reply_to,
+        "attachments": [
+            (
+                attachment.get_filename()
+                if hasattr(attachment, "get_filename")
+                else attachment[0]
+            )
+            for attachment in message.attachments
+        ],
+    }
+
+
+class Outbox:
+    """The email messages sent through the in-memory email backend.
+
+    The messages are kept in django.core.mail.outbox, like Django's
+    locmem backend does, so the outbox of Django's test runner is used
+    when the tests run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the outbox."""
+        self._condition = threading.Condition()
+
+    def notify(self) -> None:
+        """Wake up the requests waiting for messages."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def find(
+        self,
+        to: Optional[str] = None,
+        subject: Optional[str] = None,
+    ) -> List[EmailMessage]:
+        """Return the messages sent to a recipient with a subject.
+
+        Args:
+        ----
+        to (Optional[str]): An address among the recipients of the messages.
+        subject (Optional[str]): A part of the subject of the messages.
+
+        Returns:
+        -------
+        List[EmailMessage]: The matching messages, the oldest first.
+        """
+        return [
+            message
+            for message in list(getattr(mail, "outbox", []))
+            if (
+                to is None
+                or any(
+                    to.lower() in recipient.lower()
+                    for recipient in message.recipients()
+                )
+            )
+            and (subject is None or subject.lower() in message.subject.lower())
+        ]
+
+    def wait_for(
+        self,
+        to: Optional[str] = None,
+        subject: Optional[str] = None,
+        timeout: float = 10,
+    ) -> List[EmailMessage]:
+        """Wait until a message is sent to a recipient with a subject.
+
+        The shared connection of the test transaction is released while
+        waiting, so the other requests can send the message.
+
+        Args:
+        ----
+        to (Optional[str]): An address among the recipients of the messages.
+        subject (Optional[str]): A part of the subject of the messages.
+        timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+        -------
+        List[EmailMessage]: The matching messages, or an empty list after the
+        timeout.
+        """
+        deadline = time.monotonic() + timeout
+
+        with transaction_isolation.released():
+            while True:
+                messages = self.find(to, subject)
+                remaining = deadline - time.monotonic()
+                if messages or remaining <= 0:
+                    return messages
+
+                # Messages sent by other backends, e.g. Django's locmem backend
+                # in the tests, do not notify the outbox.
+                with self._condition:
+                    self._condition.wait(min(remaining, POLL_INTERVAL))
+
+    def clear(self) -> None:
+        """Delete every message."""
+        if hasattr(mail, "outbox"):
+            mail.outbox.clear()
+
+
+outbox = Outbox()
+
+
+class EmailBackend(locmem.EmailBackend):
+    """An email backend keeping the messages in the Cypress outbox.
+
+    It is enabled by the DJANGO_CYPRESS_EMAIL_OUTBOX setting.
+    """
+
+    def send_messages(self, messages: Sequence[EmailMessage]) -> int:
+        """Store the messages and wake up the requests waiting for them.
+
+        Args:
+        ----
+        messages (Sequence[EmailMessage]): The messages.
+
+        Returns:
+        -------
+        int: The number of messages.
+        """
+        count = super().send_messages(messages)
+        outbox.notify()
+
+        return count
@@ -0,0 +1,352 @@
+"""Create new commands for python manage.py <command>."""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, List, Optional
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+    OutputWrapper,
+)
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.sqlite3.creation import (
+    DatabaseCreation as SQLiteDatabaseCreation,
+)
+
+from django_cypress.migration_cache import migrate
+from django_cypress.sharding import (
+    find_specs,
+    load_timings,
+    merge_timings,
+    split_specs,
+)
+from django_cypress.workers import worker_databases
+
+
+class Command(BaseCommand):
+    """Run the Cypress specs in parallel shards.
+
+    This Django management command migrates the database once, clones it for
+    each shard and starts one Django server and one Cypress process per shard.
+
+    Attributes
+    ----------
+    help (str): A short description of the command.
+    """
+
+    help = "Run the Cypress specs in parallel shards"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define command-line arguments for the parallel Cypress run.
+
+        Args:
+        ----
+        parser (CommandParser): The argument parser.
+
+        Returns:
+        -------
+        None
+        """
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="The number of parallel Django servers and Cypress processes",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8001,
+            help="The port of the first Django server, the others use the next ports",
+        )
+        parser.add_argument(
+            "--specs",
+            default="cypress/e2e",
+            help="The directory of the Cypress spec files",
+        )
+        parser.add_argument(
+            "--timings",
+            default="cypress/timings.json",
+            help="The file of the spec durations used to balance the shards",
+        )
+        parser.add_argument(
+            "--server-timeout",
+            type=float,
+            default=60,
+            help="The number of seconds to wait for the Django servers to start",
+        )
+        parser.add_argument(
+            "cypress_args",
+            nargs="*",
+            help="Extra arguments of npx cypress run, after --",
+        )
+
+    def handle(self, **options: Any) -> None:
+        """Handle the command execution.
+
+        Args:
+        ----
+        **options: Command options and arguments.
+
+        Returns:
+        -------
+        None
+        """
+        if options["shards"] < 1:
+            raise CommandError("--shards must be at least 1.")
+
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.vendor == "sqlite" and SQLiteDatabaseCreation.is_in_memory_db(
+            connection.settings_dict["NAME"]
+        ):
+            raise CommandError("cypress_run requires an on-disk database.")
+
+        shards = split_specs(
+            find_specs(options["specs"]),
+            options["shards"],
+            load_timings(options["timings"]),
+        )
+        if not shards:
+            raise CommandError(f"No Cypress spec found in {options['specs']}.")
+
+        action = migrate(DEFAULT_DB_ALIAS)
+        self.stdout.write(f"Database {action}.")
+
+        servers: List[subprocess.Popen] = []
+        readers: List[threading.Thread] = []
+        try:
+            for index in range(len(shards)):
+                worker_databases.get_alias(f"shard{index}")
+                server = self._start_server(index, options["port"] + index)
+                servers.append(server)
+                readers.append(
+                    self._start_reader(f"[server {index}]", server.stderr, self.stderr)
+                )
+
+            for index in range(len(shards)):
+                self._wait_for_server(
+                    options["port"] + index, options["server_timeout"]
+                )
+
+            exit_codes = self._run_cypress(shards, options)
+        finally:
+            for server in servers:
+                server.terminate()
+            for server in servers:
+                server.wait()
+            for reader in readers:
+                reader.join()
+            worker_databases.reset(drop=True)
+
+        self._report(shards, exit_codes)
+
+    def _start_server(
+        self,
+        index: int,
+        port: int,
+    ) -> subprocess.Popen:
+        """Start the Django server of a shard.
+
+        The server uses the database cloned for the shard, which is
+        selected by the DJANGO_CYPRESS_WORKER environment variable. Its
+        errors are forwarded, e.g. to show why it did not start.
+
+        Args:
+        ----
+        index (int): The index of the shard.
+        port (int): The port of the server.
+
+        Returns:
+        -------
+        subprocess.Popen: The server process.
+        """
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "django",
+                "runserver",
+                "--noreload",
+                f"127.0.0.1:{port}",
+            ],
+            env={**os.environ, "DJANGO_CYPRESS_WORKER": f"shard{index}"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    def _wait_for_server(
+        self,
+        port: int,
+        timeout: float,
+    ) -> None:
+        """Wait until a Django server accepts connections.
+
+        Args:
+        ----
+        port (int): The port of the server.
+        timeout (float): The number of seconds to wait.
+
+        Returns:
+        -------
+        None
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1):
+                    return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise CommandError(
+                        f"The Django server on port {port} did not start."
+                    ) from None
+                time.sleep(0.2)
+
+    def _run_cypress(
+        self,
+        shards: List[List[Path]],
+        options: Any,
+    ) -> List[int]:
+        """Run one Cypress process per shard and wait for them.
+
+        The output of each process is prefixed with its shard. Each process
+        records the durations of its specs in its own timings file, which are
+        merged once every process exited. When a process cannot be started or
+        the run is interrupted, the processes already started are terminated.
+
+        Args:
+        ----
+        shards (List[List[Path]]): The spec files of each shard.
+        options (Any): The options of the command.
+
+        Returns:
+        -------
+        List[int]: The exit code of each Cypress process.
+        """
+        processes = []
+        readers = []
+        timings = [
+            str(Path(options["timings"]).with_suffix(f".shard{index}.json"))
+            for index in range(len(shards))
+        ]
+
+        exit_codes = []
+
+        try:
+            for index, specs in enumerate(shards):
+                process = subprocess.Popen(
+                    [
+                        "npx",
+                        "cypress",
+                        "run",
+                        "--spec",
+                        ",".join(str(spec) for spec in specs),
+                        "--config",
+                        f"baseUrl=http://127.0.0.1:{options['port'] + index}",
+                        *options["cypress_args"],
+                    ],
+                    env={**os.environ, "CYPRESS_djangoCypressTimings": timings[index]},
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                )
+                processes.append(process)
+                readers.append(
+                    self._start_reader(f"[shard {index}]", process.stdout, self.stdout)
+                )
+
+            exit_codes = [process.wait() for process in processes]
+        finally:
+            if len(exit_codes) < len(shards):
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait()
+            for reader in readers:
+                reader.join()
+
+        merge_timings(options["timings"], timings)
+
+        return exit_codes
+
+    def _start_reader(
+        self,
+        prefix: str,
+        output: Optional[IO[str]],
+        stream: OutputWrapper,
+    ) -> threading.Thread:
+        """Forward the output of a process in a new thread.
+
+        Args:
+        ----
+        prefix (str): The prefix of each line, naming the process.
+        output (Optional[IO[str]]): The output of the process.
+        stream (OutputWrapper): The output of the command to write to.
+
+        Returns:
+        -------
+        threading.Thread: The thread, which exits with the process.
+        """
+        reader = threading.Thread(
+            target=self._forward_output, args=(prefix, output, stream)
+        )
+        reader.start()
+
+        return reader
+
+    def _forward_output(
+        self,
+        prefix: str,
+        output: IO[str],
+        stream: OutputWrapper,
+    ) -> None:
+        """Write the output of a process prefixed with its name.
+
+        Args:
+        ----
+        prefix (str): The prefix of each line, naming the process.
+        output (IO[str]): The output of the process.
+        stream (OutputWrapper): The output of the command to write to.
+
+        Returns:
+        -------
+        None
+        """
+        for line in output:
+            stream.write(f"{prefix} {line}", ending="")
+
+    def _report(
+        self,
+        shards: List[List[Path]],
+        exit_codes: List[int],
+    ) -> None:
+        """Summarize the shards and fail if any of them failed.
+
+        Args:
+        ----
+        shards (List[List[Path]]): The spec files of each shard.
+        exit_codes (List[int]): The exit code of each Cypress process.
+
+        Returns:
+        -------
+        None
+        """
+        for index, specs in enumerate(shards):
+            exit_code = exit_codes[index]
+            status = "passed" if exit_code == 0 else f"failed ({exit_code})"
+            self.stdout.write(f"Shard {index}: {len(specs)} specs {status}")
+
+        failed = sum(1 for exit_code in exit_codes if exit_code != 0)
+        if failed:
+            raise CommandError(f"{failed} of {len(shards)} shards failed.")
+
+        self.stdout.write(self.style.SUCCESS("All the Cypress shards passed."))
@@ -0,0 +1,183 @@
+from http import HTTPStatus
+from typing import Callable, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from .isolation import transaction_isolation
+from .profiling import Profile, profile_lock, profile_store
+from .queries import CapturedRequest, query_log
+from .workers import use_worker_database, worker_databases
+
+
+class TransactionIsolationMiddleware:
+    """Pin the requests to the shared connection of the test transaction.
+
+    The middleware does nothing until a test transaction is opened
+    through the BeginTransactionView.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the middleware.
+
+        Args:
+        ----
+        get_response (Callable): The next middleware or the view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request on the shared connection if needed.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        HttpResponse: The response of the view.
+        """
+        with transaction_isolation.pinned():
+            return self.get_response(request)
+
+
+class WorkerDatabaseMiddleware:
+    """Route the requests of each parallel Cypress worker to its own database.
+
+    The worker is identified by the X-Cypress-Worker header, which is
+    sent by the Cypress commands, or by the cypress_worker cookie, which
+    routes the requests of the application under test. Requests without
+    a worker use the default database.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the middleware.
+
+        Args:
+        ----
+        get_response (Callable): The next middleware or the view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request on the database of its worker.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        HttpResponse: The response of the view.
+        """
+        worker_id = request.headers.get(
+            "X-Cypress-Worker", request.COOKIES.get("cypress_worker")
+        )
+        database: Optional[str] = None
+
+        if worker_id:
+            try:
+                database = worker_databases.get_alias(worker_id)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        # The asynchronous views read the database in the thread pool.
+        request.cypress_database = database  # type: ignore[attr-defined]
+
+        with use_worker_database(database):
+            return self.get_response(request)
+
+
+class QueryCaptureMiddleware:
+    """Record the SQL queries run by each request of the application under test.
+
+    The requests are identified by the X-Cypress-Request-Id header when
+    Cypress sends it, otherwise by a generated ID. The ID is sent back in
+    the same header. The requests to the Cypress endpoints are ignored.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the middleware.
+
+        Args:
+        ----
+        get_response (Callable): The next middleware or the view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request while recording its queries.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        HttpResponse: The response of the view.
+        """
+        if "/__cypress__/" in request.path:
+            return self.get_response(request)
+
+        captured_request = CapturedRequest(
+            request.headers.get("X-Cypress-Request-Id"),
+            request.method or "",
+            request.path,
+        )
+
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(captured_request):
+            response = self.get_response(request)
+
+        query_log.add(captured_request)
+        response["X-Cypress-Request-Id"] = captured_request.request_id
+
+        return response
+
+
+class ProfilingMiddleware:
+    """Profile the requests of the application under test on demand.
+
+    A request is profiled with cProfile when it carries the
+    X-Cypress-Profile header. The "memory" value of the header also traces
+    its memory allocations with tracemalloc, e.g. "cpu,memory". The ID of
+    the profile is sent back in the same header. The requests to the
+    Cypress endpoints are never profiled.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        """Initialize the middleware.
+
+        Args:
+        ----
+        get_response (Callable): The next middleware or the view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request under the profilers if requested.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        HttpResponse: The response of the view.
+        """
+        modes = request.headers.get("X-Cypress-Profile")
+        if not modes or "/__cypress__/" in request.path:
+            return self.get_response(request)
+
+        profile = Profile(
+            request.method or "",
+            request.path,
+            memory="memory" in modes.lower().split(","),
+        )
+
+        with profile_lock:
+            response = profile.run(lambda: self.get_response(request))
+
+        profile_store.add(profile)
+        response["X-Cypress-Profile"] = profile.id
+
+        return response
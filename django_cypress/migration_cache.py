@@ -0,0 +1,388 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from django.core import management
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .conf import get_setting
+from .fingerprints import (
+    applied_migrations_fingerprint,
+    is_migrated,
+    mark_migrated,
+    migration_graph_fingerprint,
+    migration_state_fingerprint,
+)
+from .snapshots import SQLiteSnapshot, invalidate_baselines, mark_used
+from .tracking import dirty_tables
+
+
+class MigrationCache:
+    """An on-disk cache of migrated databases.
+
+    Each entry is keyed by the fingerprint of the migration files and
+    holds a copy of a database right after its migration. Subclasses
+    implement the copy for a specific database vendor. The least
+    recently used entries are evicted when the cache is full.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        using: str = DEFAULT_DB_ALIAS,
+        size: int = 3,
+    ) -> None:
+        """Initialize the migration cache.
+
+        Args:
+        ----
+        directory (str): The directory storing the cache entries.
+        using (str): The alias of the cached database.
+        size (int): The maximum number of entries.
+        """
+        self.directory = Path(directory)
+        self.using = using
+        self.size = size
+
+    @property
+    def connection(self) -> BaseDatabaseWrapper:
+        """Return the connection of the cached database."""
+        return connections[self.using]
+
+    def has(self, key: str) -> bool:
+        """Check whether the cache contains an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        bool: True if the entry exists.
+        """
+        return self._metadata_path(key).is_file()
+
+    def applied_fingerprint(self, key: str) -> str:
+        """Return the applied migrations fingerprint of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        str: The fingerprint of the applied migrations of the cached database.
+        """
+        return self._read_metadata(key)["applied"]
+
+    def store(self, key: str) -> None:
+        """Store a copy of the database and evict the old entries.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        metadata = self._dump(key)
+        metadata["applied"] = applied_migrations_fingerprint(self.using)
+        self._metadata_path(key).write_text(json.dumps(metadata))
+        mark_used(self._metadata_path(key))
+
+        self.evict()
+
+    def restore(self, key: str) -> None:
+        """Replace the database with the copy stored in an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        """
+        self._load(key, self._read_metadata(key))
+        mark_used(self._metadata_path(key))
+        invalidate_baselines(self.using)
+        dirty_tables.mark_all(self.using)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries exceeding the size."""
+        paths = sorted(
+            self.directory.glob(f"{self.using}-*.json"),
+            key=lambda path: path.stat().st_mtime_ns,
+            reverse=True,
+        )
+
+        for path in paths[self.size :]:
+            key = path.stem[len(self.using) + 1 :]
+            self._discard(key, self._read_metadata(key))
+            path.unlink()
+
+    def _metadata_path(self, key: str) -> Path:
+        """Return the path of the metadata file of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Path: The path of the metadata file.
+        """
+        return self.directory / f"{self.using}-{key}.json"
+
+    def _read_metadata(self, key: str) -> Dict[str, Any]:
+        """Read the metadata of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Dict[str, Any]: The metadata of the entry.
+        """
+        return json.loads(self._metadata_path(key).read_text())
+
+    def _dump(self, key: str) -> Dict[str, Any]:
+        """Copy the database into a new entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Dict[str, Any]: The metadata needed to load the entry.
+        """
+        raise NotImplementedError
+
+    def _load(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Copy an entry into the database.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        raise NotImplementedError
+
+    def _discard(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Delete the copy of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        raise NotImplementedError
+
+
+class SQLiteMigrationCache(MigrationCache):
+    """A migration cache storing SQLite database files.
+
+    The files are written and read by SQLite snapshots.
+    """
+
+    def _database_path(self, key: str) -> Path:
+        """Return the path of the database file of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Path: The path of the database file.
+        """
+        return self.directory / f"{self.using}-{key}.sqlite3"
+
+    def _dump(self, key: str) -> Dict[str, Any]:
+        """Copy the database into a new entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Dict[str, Any]: The metadata needed to load the entry.
+        """
+        SQLiteSnapshot(self.using, self._database_path(key)).capture()
+
+        return {}
+
+    def _load(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Copy an entry into the database.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        SQLiteSnapshot(self.using, self._database_path(key)).restore()
+
+    def _discard(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Delete the copy of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        self._database_path(key).unlink(missing_ok=True)
+
+
+class PostgreSQLMigrationCache(MigrationCache):
+    """A migration cache storing PostgreSQL template databases.
+
+    The databases live on the PostgreSQL server, while the cache
+    directory only keeps track of them. Restoring an entry recreates
+    the database from its template, so no other connection to the
+    database may be open.
+    """
+
+    def _dump(self, key: str) -> Dict[str, Any]:
+        """Copy the database into a new entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+
+        Returns:
+        -------
+        Dict[str, Any]: The metadata needed to load the entry.
+        """
+        database = self.connection.settings_dict["NAME"]
+        template = f"{database}_cypress_{key[:16]}"
+
+        self._execute(
+            f"DROP DATABASE IF EXISTS {self._quote(template)}",
+            f"CREATE DATABASE {self._quote(template)} "
+            + f"WITH TEMPLATE {self._quote(database)}",
+        )
+
+        return {"template": template}
+
+    def _load(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Copy an entry into the database.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        database = self.connection.settings_dict["NAME"]
+        # pg_version is only defined by the PostgreSQL database wrapper.
+        pg_version = getattr(self.connection, "pg_version", 0)
+        force = " WITH (FORCE)" if pg_version >= 130000 else ""
+
+        self._execute(
+            f"DROP DATABASE {self._quote(database)}{force}",
+            f"CREATE DATABASE {self._quote(database)} "
+            + f"WITH TEMPLATE {self._quote(metadata['template'])}",
+        )
+
+    def _discard(self, key: str, metadata: Dict[str, Any]) -> None:
+        """Delete the copy of an entry.
+
+        Args:
+        ----
+        key (str): The migration graph fingerprint.
+        metadata (Dict[str, Any]): The metadata of the entry.
+        """
+        self._execute(f"DROP DATABASE IF EXISTS {self._quote(metadata['template'])}")
+
+    def _quote(self, name: str) -> str:
+        """Quote the name of a database.
+
+        Args:
+        ----
+        name (str): The name of the database.
+
+        Returns:
+        -------
+        str: The quoted name.
+        """
+        return self.connection.ops.quote_name(name)
+
+    def _execute(self, *statements: str) -> None:
+        """Run statements outside of the cached database.
+
+        The connection to the cached database is closed first, because
+        PostgreSQL refuses to copy or drop a database in use.
+
+        Args:
+        ----
+        *statements (str): The SQL statements.
+        """
+        self.connection.close()
+
+        with self.connection._nodb_cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def get_migration_cache(using: str = DEFAULT_DB_ALIAS) -> Optional[MigrationCache]:
+    """Return the migration cache of a database.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+
+    Returns:
+    -------
+    Optional[MigrationCache]: The migration cache, or None if the cache is
+    disabled or the database vendor is not supported.
+    """
+    directory = get_setting("MIGRATION_CACHE_DIR")
+    if not directory:
+        return None
+
+    cache_classes = {
+        "sqlite": SQLiteMigrationCache,
+        "postgresql": PostgreSQLMigrationCache,
+    }
+    cache_class = cache_classes.get(connections[using].vendor)
+    if cache_class is None:
+        return None
+
+    return cache_class(directory, using, get_setting("MIGRATION_CACHE_SIZE"))
+
+
+def migrate(using: str = DEFAULT_DB_ALIAS) -> str:
+    """Migrate a database, reusing the previous migrations when possible.
+
+    The migration is skipped when the migration state did not change
+    since the last migration. Otherwise, the database is restored from
+    the migration cache if it holds the current migration files, or it
+    is migrated and stored in the cache.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+
+    Returns:
+    -------
+    str: The action taken, either "skipped", "restored" or "migrated".
+    """
+    if is_migrated(migration_state_fingerprint(using), using):
+        return "skipped"
+
+    cache = get_migration_cache(using)
+    key = migration_graph_fingerprint()
+
+    if cache is not None and cache.has(key):
+        if cache.applied_fingerprint(key) == applied_migrations_fingerprint(using):
+            action = "skipped"
+        else:
+            cache.restore(key)
+            action = "restored"
+    else:
+        management.call_command("migrate", database=using)
+        if cache is not None:
+            cache.store(key)
+        action = "migrated"
+
+    mark_migrated(migration_state_fingerprint(using), using)
+
+    return action
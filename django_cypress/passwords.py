@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Optional
+
+from django.contrib.auth.hashers import BasePasswordHasher, get_hasher, make_password
+
+from .conf import get_setting
+
+
+@lru_cache(maxsize=1024)
+def _make_memoized_password(password: str, hasher: BasePasswordHasher) -> str:
+    """Hash a password once per password hasher.
+
+    Args:
+    ----
+    password (str): The plain text password.
+    hasher (BasePasswordHasher): The password hasher.
+
+    Returns:
+    -------
+    str: The hashed password.
+    """
+    return make_password(password, hasher=hasher)
+
+
+def make_cypress_password(password: Optional[str]) -> str:
+    """Hash a password for a user created by Cypress.
+
+    The password is hashed with the hasher selected by the
+    DJANGO_CYPRESS_PASSWORD_HASHER setting. When the
+    DJANGO_CYPRESS_MEMOIZE_PASSWORDS setting is enabled, the
+    hash of a plain text password is computed only once.
+
+    Args:
+    ----
+    password (Optional[str]): The plain text password or None for an
+        unusable password.
+
+    Returns:
+    -------
+    str: The hashed password.
+    """
+    if password is None:
+        return make_password(None)
+
+    hasher = get_hasher(get_setting("PASSWORD_HASHER") or "default")
+
+    if get_setting("MEMOIZE_PASSWORDS"):
+        return _make_memoized_password(password, hasher)
+
+    return make_password(password, hasher=hasher)
@@ -0,0 +1,228 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MAX_PROFILES = 50
+MAX_STACK_DEPTH = 64
+
+FunctionKey = Tuple[str, int, str]
+
+
+def _label(function: FunctionKey) -> str:
+    """Return the label of a function in a collapsed stack.
+
+    Args:
+    ----
+    function (FunctionKey): The file name, line number and name of the function.
+
+    Returns:
+    -------
+    str: The label, without the separators of the collapsed stack format.
+    """
+    filename, lineno, name = function
+    label = f"{os.path.basename(filename)}:{lineno}({name})" if lineno else name
+
+    return label.replace(" ", "_").replace(";", ",")
+
+
+class Profile:
+    """The CPU and memory profile of a request of the application under test."""
+
+    def __init__(self, method: str, path: str, memory: bool) -> None:
+        """Initialize the profile.
+
+        Args:
+        ----
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        memory (bool): Whether the memory allocations are traced.
+        """
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.memory = memory
+        self.duration: Optional[float] = None
+        self.stats: Optional[pstats.Stats] = None
+        self.allocations: List[Dict[str, Any]] = []
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        """Run a function under the profilers.
+
+        Args:
+        ----
+        func (Callable): The function processing the request.
+
+        Returns:
+        -------
+        Any: The return value of the function.
+        """
+        profiler = cProfile.Profile()
+        if self.memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        try:
+            return profiler.runcall(func)
+        finally:
+            self.duration = (time.perf_counter() - start) * 1000
+            self.stats = pstats.Stats(profiler)
+
+            if self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.allocations = [
+                    {
+                        "location": str(statistic.traceback),
+                        "size": statistic.size,
+                        "count": statistic.count,
+                    }
+                    for statistic in snapshot.statistics("lineno")[:50]
+                ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the summary of the profile.
+
+        Returns
+        -------
+            Dict[str, Any]: The ID, the request and the duration of the profile.
+        """
+        return {
+            "profile_id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "memory": self.memory,
+            "duration_ms": round(self.duration or 0, 3),
+        }
+
+    def pstats(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """Return the CPU profile in the pstats text format.
+
+        Args:
+        ----
+        sort (str): The pstats sort key.
+        limit (int): The maximum number of functions.
+
+        Returns:
+        -------
+        str: The profile, as printed by pstats.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        if self.stats is not None:
+            stats.add(self.stats)
+        stats.sort_stats(sort).print_stats(limit)
+
+        return stream.getvalue()
+
+    def collapsed(self) -> str:
+        """Return the CPU profile in the collapsed stack format of flame graphs.
+
+        cProfile records the calls between functions, not the full stacks,
+        so the time of a function called from several places is split
+        between its callers in proportion to the time of each call.
+
+        Returns
+        -------
+            str: One line per stack with its own time in microseconds.
+        """
+        # The raw statistics of pstats.Stats are not declared by typeshed.
+        raw_stats: Dict[FunctionKey, tuple] = getattr(self.stats, "stats", {})
+        callees: Dict[FunctionKey, Dict[FunctionKey, tuple]] = defaultdict(dict)
+        for function, (_, _, _, _, callers) in raw_stats.items():
+            for caller, call_stats in callers.items():
+                callees[caller][function] = call_stats
+
+        stacks: Dict[str, float] = defaultdict(float)
+
+        def visit(function: FunctionKey, stack: Tuple[str, ...], share: float) -> None:
+            _, _, own_time, cumulative_time, _ = raw_stats[function]
+            stack = (*stack, _label(function))
+            stacks[";".join(stack)] += own_time * share
+
+            if len(stack) >= MAX_STACK_DEPTH:
+                return
+
+            for callee, call_stats in callees[function].items():
+                callee_time = raw_stats[callee][3]
+                callee_share = share * call_stats[3] / callee_time if callee_time else 0
+                if _label(callee) not in stack and callee_share * callee_time > 1e-6:
+                    visit(callee, stack, callee_share)
+
+        for function, (_, _, _, _, callers) in raw_stats.items():
+            if not callers:
+                visit(function, (), 1.0)
+
+        return "\n".join(
+            f"{stack} {round(own_time * 1e6)}"
+            for stack, own_time in stacks.items()
+            if round(own_time * 1e6) > 0
+        )
+
+
+class ProfileStore:
+    """Keep the most recent profiles in memory."""
+
+    def __init__(self, size: int = MAX_PROFILES) -> None:
+        """Initialize the profile store.
+
+        Args:
+        ----
+        size (int): The maximum number of profiles kept.
+        """
+        self.size = size
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        """Store a profile, evicting the oldest one if the store is full.
+
+        Args:
+        ----
+        profile (Profile): The profile.
+        """
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """Return a profile.
+
+        Args:
+        ----
+        profile_id (str): The ID of the profile.
+
+        Returns:
+        -------
+        Optional[Profile]: The profile, or None if it does not exist.
+        """
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def all(self) -> List[Profile]:
+        """Return every stored profile, the oldest first.
+
+        Returns
+        -------
+            List[Profile]: The profiles.
+        """
+        with self._lock:
+            return list(self._profiles.values())
+
+    def clear(self) -> None:
+        """Forget every profile."""
+        with self._lock:
+            self._profiles.clear()
+
+
+profile_store = ProfileStore()
+# Python allows a single profiler at a time, so the profiled requests
+# are processed one after the other.
+profile_lock = threading.Lock()
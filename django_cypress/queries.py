@@ -0,0 +1,158 @@
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+MAX_CAPTURED_REQUESTS = 1000
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class CapturedRequest:
+    """The SQL queries run by a request of the application under test.
+
+    An instance is installed as an execute wrapper of the database
+    connection while the request is processed.
+    """
+
+    def __init__(self, request_id: Optional[str], method: str, path: str) -> None:
+        """Initialize the captured request.
+
+        Args:
+        ----
+        request_id (Optional[str]): The ID sent by Cypress, or None to
+            generate one.
+        method (str): The HTTP method of the request.
+        path (str): The path of the request.
+        """
+        self.request_id = request_id or uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.queries: List[Dict[str, Any]] = []
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """Run a query and record it.
+
+        Args:
+        ----
+        execute (Callable): The function running the query.
+        sql (str): The SQL statement.
+        params (Any): The parameters of the statement.
+        many (bool): Whether the statement runs with several sets of parameters.
+        context (Dict[str, Any]): The connection and the cursor of the query.
+
+        Returns:
+        -------
+        Any: The result of the query.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": str(sql),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            )
+
+    def duplicates(self) -> List[Dict[str, Any]]:
+        """Return the queries run several times with different parameters.
+
+        These are the typical symptom of an N+1 query problem. The queries
+        are compared without their literals.
+
+        Returns
+        -------
+            List[Dict[str, Any]]: The normalized SQL and the number of runs of
+            each duplicated query, the most frequent first.
+        """
+        counts = Counter(LITERAL.sub("?", query["sql"]) for query in self.queries)
+
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in counts.most_common()
+            if count > 1
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the captured queries of the request.
+
+        Returns
+        -------
+            Dict[str, Any]: The request, its queries and their duplicates,
+            serializable to JSON.
+        """
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "count": len(self.queries),
+            "queries": self.queries,
+            "duplicates": self.duplicates(),
+        }
+
+
+class QueryLog:
+    """Keep the queries of the most recent requests of the application."""
+
+    def __init__(self, size: int = MAX_CAPTURED_REQUESTS) -> None:
+        """Initialize the query log.
+
+        Args:
+        ----
+        size (int): The maximum number of requests kept.
+        """
+        self._requests: Deque[CapturedRequest] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, captured_request: CapturedRequest) -> None:
+        """Record the queries of a request.
+
+        Args:
+        ----
+        captured_request (CapturedRequest): The captured request.
+        """
+        with self._lock:
+            self._requests.append(captured_request)
+
+    def find(
+        self,
+        request_id: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> List[CapturedRequest]:
+        """Return the captured requests matching an ID or a path.
+
+        Args:
+        ----
+        request_id (Optional[str]): The ID of the request.
+        path (Optional[str]): The path of the requests.
+
+        Returns:
+        -------
+        List[CapturedRequest]: The matching requests, the oldest first.
+        """
+        with self._lock:
+            return [
+                captured_request
+                for captured_request in self._requests
+                if request_id in (None, captured_request.request_id)
+                and path in (None, captured_request.path)
+            ]
+
+    def clear(self) -> None:
+        """Forget every captured request."""
+        with self._lock:
+            self._requests.clear()
+
+
+query_log = QueryLog()
@@ -0,0 +1,112 @@
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SPEC_PATTERNS = ("*.cy.js", "*.cy.jsx", "*.cy.ts", "*.cy.tsx")
+
+
+def find_specs(directory: str) -> List[Path]:
+    """Find the Cypress spec files of a directory.
+
+    Args:
+    ----
+    directory (str): The directory of the specs, e.g. cypress/e2e.
+
+    Returns:
+    -------
+    List[Path]: The spec files, sorted by path.
+    """
+    return sorted(
+        path for pattern in SPEC_PATTERNS for path in Path(directory).rglob(pattern)
+    )
+
+
+def load_timings(path: str) -> Dict[str, float]:
+    """Read the durations of the specs recorded by the timings plugin.
+
+    Args:
+    ----
+    path (str): The path of the timings file.
+
+    Returns:
+    -------
+    Dict[str, float]: The duration of each spec in milliseconds, keyed by the
+    path of the spec. It is empty if the file does not exist.
+    """
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def merge_timings(path: str, sources: List[str]) -> None:
+    """Merge timings files into one and delete them.
+
+    Args:
+    ----
+    path (str): The path of the merged timings file.
+    sources (List[str]): The paths of the timings files to merge.
+    """
+    timings = load_timings(path)
+
+    for source in sources:
+        timings.update(load_timings(source))
+        Path(source).unlink(missing_ok=True)
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(timings, indent=2, sort_keys=True))
+
+
+def split_specs(
+    specs: List[Path],
+    shards: int,
+    timings: Optional[Dict[str, float]] = None,
+    root: Optional[Path] = None,
+) -> List[List[Path]]:
+    """Split spec files into shards of similar durations.
+
+    The longest specs are assigned first, each one to the shard with the
+    shortest total duration so far. The specs without a recorded duration
+    count as the average duration, so without timings the shards differ
+    by one spec at most. Shards without specs are dropped.
+
+    Args:
+    ----
+    specs (List[Path]): The spec files.
+    shards (int): The number of shards.
+    timings (Optional[Dict[str, float]]): The recorded duration of the specs,
+        keyed by their path relative to the Cypress project root.
+    root (Optional[Path]): The Cypress project root, by default the current
+        directory. The specs and the timings are matched by absolute path.
+
+    Returns:
+    -------
+    List[List[Path]]: The spec files of each shard, sorted by path.
+    """
+    root = root or Path.cwd()
+    resolved_timings = {
+        (root / spec).resolve(): duration for spec, duration in (timings or {}).items()
+    }
+    resolved_specs = {spec: (root / spec).resolve() for spec in specs}
+    known = [
+        resolved_timings[path]
+        for path in resolved_specs.values()
+        if path in resolved_timings
+    ]
+    default_duration = sum(known) / len(known) if known else 1.0
+
+    durations = {
+        spec: resolved_timings.get(path, default_duration)
+        for spec, path in resolved_specs.items()
+    }
+    ordered_specs = sorted(specs, key=lambda spec: -durations[spec])
+
+    split: List[List[Path]] = [[] for _ in range(shards)]
+    loads = [(0.0, index) for index in range(shards)]
+    for spec in ordered_specs:
+        load, index = heapq.heappop(loads)
+        split[index].append(spec)
+        heapq.heappush(loads, (load + durations[spec], index))
+
+    return [sorted(shard) for shard in split if shard]
@@ -0,0 +1,570 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.core import management
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .conf import get_setting
+from .fingerprints import migration_state_fingerprint
+from .tracking import dirty_tables
+
+_baselines: Dict[str, "Snapshot"] = {}
+_lock = threading.Lock()
+_store_lock = threading.Lock()
+
+
+def mark_used(path: Path) -> None:
+    """Set the modification time of a file to the current time.
+
+    The time is set explicitly, because the timestamps written by the
+    file system are too coarse to order files used in quick succession.
+
+    Args:
+    ----
+    path (Path): The path of the file.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class Snapshot:
+    """A copy of the state of a database.
+
+    Subclasses implement the capture and the restoration of the
+    data for a specific database vendor. The copy is kept in memory,
+    unless a path is given.
+    """
+
+    def __init__(
+        self,
+        using: str = DEFAULT_DB_ALIAS,
+        path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the snapshot.
+
+        Args:
+        ----
+        using (str): The alias of the database to snapshot.
+        path (Optional[Path]): The file storing the copy.
+        """
+        self.using = using
+        self.path = path
+
+    @property
+    def connection(self) -> BaseDatabaseWrapper:
+        """Return the connection of the snapshotted database."""
+        return connections[self.using]
+
+    def capture(self) -> None:
+        """Copy the current state of the database into the snapshot."""
+        raise NotImplementedError
+
+    def restore(self) -> None:
+        """Bring the database back to the state of the snapshot."""
+        raise NotImplementedError
+
+
+class SQLiteSnapshot(Snapshot):
+    """A snapshot that uses the SQLite online backup API.
+
+    The whole database is copied page by page into another database,
+    which makes both the capture and the restoration independent of
+    the number of tables.
+    """
+
+    def capture(self) -> None:
+        """Copy the current state of the database into the snapshot."""
+        self.connection.ensure_connection()
+
+        if self.path is None:
+            self._database = sqlite3.connect(":memory:", check_same_thread=False)
+            self.connection.connection.backup(self._database)
+            return
+
+        temporary_path = self.path.with_suffix(".tmp")
+        target = sqlite3.connect(temporary_path)
+        try:
+            self.connection.connection.backup(target)
+        finally:
+            target.close()
+        os.replace(temporary_path, self.path)
+
+    def restore(self) -> None:
+        """Bring the database back to the state of the snapshot.
+
+        SQLite refuses to back up into a database with an open transaction,
+        e.g. an atomic batch or a test transaction, so the rows are copied
+        table by table instead.
+        """
+        self.connection.ensure_connection()
+        source = self._database if self.path is None else sqlite3.connect(self.path)
+
+        try:
+            if self.connection.in_atomic_block:
+                self._table_snapshot(source).restore()
+            else:
+                source.backup(self.connection.connection)
+        finally:
+            if self.path is not None:
+                source.close()
+
+    def _table_snapshot(self, source: sqlite3.Connection) -> "TableSnapshot":
+        """Return a TableSnapshot holding the Django tables of the snapshot.
+
+        Args:
+        ----
+        source (sqlite3.Connection): The database of the snapshot.
+
+        Returns:
+        -------
+        TableSnapshot: The snapshot of the rows, ready to be restored.
+        """
+        snapshot = TableSnapshot(self.using)
+        snapshot._tables = {}
+        table_names = set(
+            self.connection.introspection.django_table_names(
+                only_existing=True, include_views=False
+            )
+        )
+
+        for (table,) in source.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall():
+            if table not in table_names:
+                continue
+            cursor = source.execute(
+                "SELECT * FROM %s" % self.connection.ops.quote_name(table)
+            )
+            columns = [column[0] for column in cursor.description]
+            snapshot._tables[table] = (columns, cursor.fetchall())
+
+        return snapshot
+
+
+class TableSnapshot(Snapshot):
+    """A snapshot that copies the rows of every Django table.
+
+    It works with every database vendor supported by Django. The
+    restoration empties the tables and inserts the captured rows
+    back without emitting the post_migrate signal. It can be limited
+    to a subset of the tables.
+    """
+
+    def capture(self) -> None:
+        """Copy the current state of the database into the snapshot."""
+        quote_name = self.connection.ops.quote_name
+        self._tables: Dict[str, Tuple[List[str], List[Tuple[Any, ...]]]] = {}
+
+        with self.connection.cursor() as cursor:
+            table_names = self.connection.introspection.django_table_names(
+                only_existing=True, include_views=False
+            )
+            for table in table_names:
+                columns = [
+                    column.name
+                    for column in self.connection.introspection.get_table_description(
+                        cursor, table
+                    )
+                ]
+                cursor.execute(
+                    "SELECT %s FROM %s"
+                    % (", ".join(map(quote_name, columns)), quote_name(table))
+                )
+                rows = [
+                    tuple(
+                        bytes(value) if isinstance(value, memoryview) else value
+                        for value in row
+                    )
+                    for row in cursor.fetchall()
+                ]
+                self._tables[table] = (columns, rows)
+
+        if self.path is not None:
+            with open(self.path, "wb") as file:
+                pickle.dump(self._tables, file)
+            del self._tables
+
+    def restore(self, tables: Optional[Collection[str]] = None) -> None:
+        """Bring the database back to the state of the snapshot.
+
+        Args:
+        ----
+        tables (Optional[Collection[str]]): The names of the tables to
+            restore, or None to restore every table.
+        """
+        if self.path is not None:
+            with open(self.path, "rb") as file:
+                self._tables = pickle.load(file)
+
+        try:
+            self._restore_tables(tables)
+        finally:
+            if self.path is not None:
+                del self._tables
+
+    def _restore_tables(self, tables: Optional[Collection[str]]) -> None:
+        """Empty the tables and insert the captured rows.
+
+        Every table is flushed at once. A subset of the tables is emptied
+        with DELETE statements instead, because PostgreSQL refuses to
+        truncate a table referenced by a table that is not truncated.
+
+        Args:
+        ----
+        tables (Optional[Collection[str]]): The names of the tables to
+            restore, or None to restore every table.
+        """
+        if tables is None:
+            tables = list(self._tables)
+            flush_statements = self.connection.ops.sql_flush(
+                no_style(), tables, reset_sequences=True
+            )
+        else:
+            tables = [table for table in self._tables if table in tables]
+            flush_statements = self._delete_statements(tables)
+
+        with self.connection.constraint_checks_disabled():
+            with transaction.atomic(
+                using=self.using,
+                savepoint=self.connection.features.can_rollback_ddl,
+            ):
+                with self.connection.cursor() as cursor:
+                    for sql in flush_statements:
+                        cursor.execute(sql)
+                    self._insert_rows(cursor, tables)
+                    for sql in self.connection.ops.sequence_reset_sql(
+                        no_style(), self._models(tables)
+                    ):
+                        cursor.execute(sql)
+
+    def _delete_statements(self, tables: List[str]) -> List[str]:
+        """Return the statements emptying tables and resetting their sequences.
+
+        Args:
+        ----
+        tables (List[str]): The names of the tables.
+
+        Returns:
+        -------
+        List[str]: The SQL statements.
+        """
+        quote_name = self.connection.ops.quote_name
+        statements = [f"DELETE FROM {quote_name(table)}" for table in tables]
+
+        with self.connection.cursor() as cursor:
+            sequences = [
+                sequence
+                for table in tables
+                for sequence in self.connection.introspection.get_sequences(
+                    cursor, table
+                )
+            ]
+
+        return statements + self.connection.ops.sequence_reset_by_name_sql(
+            no_style(), sequences
+        )
+
+    def _insert_rows(self, cursor: Any, tables: List[str]) -> None:
+        """Insert the captured rows of the given tables.
+
+        Args:
+        ----
+        cursor (Any): The cursor used to run the queries.
+        tables (List[str]): The names of the tables to fill.
+        """
+        quote_name = self.connection.ops.quote_name
+
+        for table in tables:
+            columns, rows = self._tables[table]
+            if not rows:
+                continue
+            cursor.executemany(
+                "INSERT INTO %s (%s) VALUES (%s)"
+                % (
+                    quote_name(table),
+                    ", ".join(map(quote_name, columns)),
+                    ", ".join(["%s"] * len(columns)),
+                ),
+                rows,
+            )
+
+    def _models(self, tables: List[str]) -> List[Any]:
+        """Return the models stored in the given tables.
+
+        Args:
+        ----
+        tables (List[str]): The names of the tables.
+
+        Returns:
+        -------
+        List[Any]: The models whose sequences need to be reset.
+        """
+        return [
+            model
+            for model in apps.get_models(include_auto_created=True)
+            if model._meta.db_table in tables
+            and router.allow_migrate_model(self.using, model)
+        ]
+
+
+class SnapshotStore:
+    """A size-bounded on-disk store of named snapshots.
+
+    Each snapshot is stored with the migration state of the database
+    at capture time and is discarded once the migration state changes.
+    The least recently used snapshots are evicted when the total size
+    of the store exceeds its limit. The directory must be private to the
+    current user, because restoring a snapshot of a database other than
+    SQLite unpickles it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        using: str = DEFAULT_DB_ALIAS,
+        max_size: int = 1024**3,
+    ) -> None:
+        """Initialize the snapshot store.
+
+        Args:
+        ----
+        directory (str): The directory storing the snapshots.
+        using (str): The alias of the snapshotted database.
+        max_size (int): The maximum total size of the snapshots in bytes.
+        """
+        self.directory = Path(directory)
+        self.using = using
+        self.max_size = max_size
+
+    def save(self, name: str) -> None:
+        """Capture the database as a named snapshot.
+
+        Args:
+        ----
+        name (str): The name of the snapshot.
+        """
+        self._check_directory()
+        snapshot_path, metadata_path = self._paths(name)
+
+        with _store_lock:
+            create_snapshot(self.using, snapshot_path).capture()
+            metadata = {
+                "name": name,
+                "fingerprint": migration_state_fingerprint(self.using),
+            }
+            metadata_path.write_text(json.dumps(metadata))
+            mark_used(metadata_path)
+
+            self._evict(keep=metadata_path)
+
+    def restore(self, name: str) -> bool:
+        """Restore a named snapshot.
+
+        Args:
+        ----
+        name (str): The name of the snapshot.
+
+        Returns:
+        -------
+        bool: True if the snapshot was restored, False if it does not exist
+        or the migration state changed since its capture.
+        """
+        self._check_directory()
+        snapshot_path, metadata_path = self._paths(name)
+
+        with _store_lock:
+            if not metadata_path.is_file():
+                return False
+
+            metadata = json.loads(metadata_path.read_text())
+            if metadata["fingerprint"] != migration_state_fingerprint(self.using):
+                self._delete(metadata_path)
+                return False
+
+            create_snapshot(self.using, snapshot_path).restore()
+            dirty_tables.mark_all(self.using)
+            mark_used(metadata_path)
+
+        return True
+
+    def _check_directory(self) -> None:
+        """Create the directory if needed and make sure it is private.
+
+        Windows has no POSIX ownership, and its temporary directory is
+        already private to the user.
+        """
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not hasattr(os, "getuid"):
+            return
+
+        status = self.directory.stat()
+        if status.st_uid != os.getuid():
+            raise ImproperlyConfigured(
+                f"The snapshot directory {self.directory} is not owned by the "
+                + "current user."
+            )
+        if status.st_mode & stat.S_IWOTH:
+            raise ImproperlyConfigured(
+                f"The snapshot directory {self.directory} is writable by other users."
+            )
+
+    def _paths(self, name: str) -> Tuple[Path, Path]:
+        """Return the paths of the snapshot and the metadata files.
+
+        Args:
+        ----
+        name (str): The name of the snapshot.
+
+        Returns:
+        -------
+        Tuple[Path, Path]: The path of the snapshot and of its metadata.
+        """
+        key = hashlib.sha256(name.encode("utf-8")).hexdigest()[:32]
+        stem = f"{self.using}-{key}"
+
+        return self.directory / f"{stem}.snapshot", self.directory / f"{stem}.json"
+
+    def _delete(self, metadata_path: Path) -> None:
+        """Delete a snapshot and its metadata.
+
+        Args:
+        ----
+        metadata_path (Path): The path of the metadata of the snapshot.
+        """
+        metadata_path.with_suffix(".snapshot").unlink(missing_ok=True)
+        metadata_path.unlink(missing_ok=True)
+
+    def _evict(self, keep: Path) -> None:
+        """Delete the least recently used snapshots exceeding the maximum size.
+
+        Args:
+        ----
+        keep (Path): The metadata path of a snapshot that must be kept.
+        """
+        metadata_paths = sorted(
+            self.directory.glob(f"{self.using}-*.json"),
+            key=lambda path: path.stat().st_mtime_ns,
+        )
+        sizes = {
+            path: path.with_suffix(".snapshot").stat().st_size
+            for path in metadata_paths
+            if path.with_suffix(".snapshot").is_file()
+        }
+        total_size = sum(sizes.values())
+
+        for path in metadata_paths:
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+
+            total_size -= sizes.get(path, 0)
+            self._delete(path)
+
+
+def create_snapshot(
+    using: str = DEFAULT_DB_ALIAS,
+    path: Optional[Path] = None,
+) -> Snapshot:
+    """Create the most efficient snapshot for the given database.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+    path (Optional[Path]): The file storing the copy, if any.
+
+    Returns:
+    -------
+    Snapshot: A snapshot that has not been captured yet.
+    """
+    if connections[using].vendor == "sqlite":
+        return SQLiteSnapshot(using, path)
+
+    return TableSnapshot(using, path)
+
+
+def get_snapshot_store(using: str = DEFAULT_DB_ALIAS) -> SnapshotStore:
+    """Return the store of the named snapshots of a database.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+
+    Returns:
+    -------
+    SnapshotStore: The snapshot store.
+    """
+    directory = get_setting("SNAPSHOT_DIR")
+    if not directory:
+        # The temporary directory is shared by every user of the system.
+        suffix = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+        directory = os.path.join(
+            tempfile.gettempdir(), f"django-cypress-snapshots{suffix}"
+        )
+
+    return SnapshotStore(directory, using, get_setting("SNAPSHOT_STORE_SIZE"))
+
+
+def restore_baseline(using: str = DEFAULT_DB_ALIAS, dirty_only: bool = False) -> None:
+    """Reset the database to its freshly migrated state.
+
+    The first call flushes the database and captures the result as
+    the baseline snapshot. The following calls restore that snapshot.
+    The baselines are kept per connection, so each Cypress worker has
+    its own one.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+    dirty_only (bool): Whether to restore only the tables written since
+        the last reset. It requires a TableSnapshot as baseline.
+    """
+    alias = connections[using].alias
+
+    with _lock:
+        snapshot = _baselines.get(alias)
+
+        if dirty_only:
+            dirty_tables.install(connections[using])
+            if not isinstance(snapshot, TableSnapshot):
+                snapshot = None
+
+        if snapshot is None:
+            management.call_command("flush", "--no-input", database=using)
+            snapshot = TableSnapshot(using) if dirty_only else create_snapshot(using)
+            snapshot.capture()
+            _baselines[alias] = snapshot
+        elif dirty_only and isinstance(snapshot, TableSnapshot):
+            snapshot.restore(tables=dirty_tables.pop(using))
+        else:
+            snapshot.restore()
+
+        dirty_tables.pop(using)
+
+
+def invalidate_baselines(using: str = DEFAULT_DB_ALIAS, **kwargs: Any) -> None:
+    """Discard the baseline snapshot of a database.
+
+    This is connected to the pre_migrate signal, because a baseline
+    captured before a migration does not match the new schema.
+
+    Args:
+    ----
+    using (str): The alias of the database.
+    **kwargs: The remaining arguments of the signal.
+    """
+    with _lock:
+        _baselines.pop(connections[using].alias, None)
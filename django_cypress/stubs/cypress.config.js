@@ -1,6 +1,10 @@
+const recordTimings = require('./cypress/plugins/timings');
+
 module.exports = {
   e2e: {
-    setupNodeEvents(on, config) {},
+    setupNodeEvents(on, config) {
+      recordTimings(on, config);
+    },
     baseUrl: 'http://localhost:8000',
     supportFile: 'cypress/support/index.js',
   },
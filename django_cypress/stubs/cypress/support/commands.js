@@ -1,63 +1,309 @@
+let cachedCsrfToken = null;
+
+const getCsrfToken = (refresh = false) => {
+    if (cachedCsrfToken && !refresh) {
+        return cy.wrap(cachedCsrfToken, { log: false });
+    }
+
+    return cy.csrfToken().then((response) => {
+        cachedCsrfToken = response["body"]["token"];
+        return cachedCsrfToken;
+    });
+};
+
+const djangoHeaders = (headers) => {
+    const worker = Cypress.env('djangoCypressWorker');
+
+    if (worker) {
+        headers = { ...headers, "X-Cypress-Worker": String(worker) };
+    }
+
+    if (Cypress.env('djangoCypressTiming')) {
+        headers = { ...headers, "X-Cypress-Timing": "true" };
+    }
+
+    return headers;
+};
+
+const logTiming = (method, url, response) => {
+    const timing = response.body && response.body.timing;
+
+    if (timing) {
+        Cypress.log({
+            name: 'django',
+            message: `${method} ${url} ${timing.total.wall_ms}ms, ${timing.total.queries} queries`,
+            consoleProps: () => timing,
+        });
+    }
+
+    return response;
+};
+
+const djangoRequest = (method, url, body = {}) => {
+    return sendDjangoRequest(method, url, body).then((response) => {
+        return logTiming(method, url, response);
+    });
+};
+
+const sendDjangoRequest = (method, url, body) => {
+    const secret = Cypress.env('djangoCypressSecret');
+
+    if (secret) {
+        return cy.request({
+            method: method,
+            url: url,
+            body: body,
+            log: false,
+            headers: djangoHeaders({
+                "X-Cypress-Secret": secret
+            })
+        });
+    }
+
+    return getCsrfToken().then((token) => {
+        return cy.request({
+            method: method,
+            url: url,
+            body: body,
+            log: false,
+            failOnStatusCode: false,
+            headers: djangoHeaders({
+                "X-CSRFToken": token
+            })
+        });
+    }).then((response) => {
+        if (response.status === 403) {
+            // The cached token is no longer valid, e.g. the cookies were cleared.
+            return getCsrfToken(true).then((token) => {
+                return cy.request({
+                    method: method,
+                    url: url,
+                    body: body,
+                    log: false,
+                    headers: djangoHeaders({
+                        "X-CSRFToken": token
+                    })
+                });
+            });
+        }
+
+        if (response.status >= 400) {
+            throw new Error(
+                `${method} ${url} failed with status ${response.status}: ${JSON.stringify(response.body)}`
+            );
+        }
+
+        return response;
+    });
+};
+
 Cypress.Commands.add('csrfToken', () => {
     return cy.request({
         method: 'GET',
         url: '/__cypress__/csrftoken/',
         log: false,
+        headers: djangoHeaders({}),
     });
 });
 
+Cypress.Commands.add('warmup', (options = {}) => {
+    return djangoRequest('POST', '/__cypress__/warmup/', { force: Boolean(options.force) })
+        .then((response) => response.body);
+});
+
 Cypress.Commands.add('manage', (command, parameters = []) => {
-    return cy.csrfToken().then((token) => {
-        return cy.request({
-            method: 'POST',
-            url: '/__cypress__/manage/',
-            body: { command: command, parameters: parameters  },
-            log: false,
-            headers: {
-                "X-CSRFToken": token["body"]["token"]
+    return djangoRequest('POST', '/__cypress__/manage/', { command: command, parameters: parameters });
+});
+
+Cypress.Commands.add('waitForJob', (jobId, options = {}) => {
+    const timeout = options.timeout || 300000;
+    const maxInterval = options.maxInterval || 2000;
+    const startedAt = Date.now();
+
+    const poll = (interval) => {
+        return djangoRequest('GET', `/__cypress__/jobs/${jobId}/`).then((response) => {
+            const job = response.body;
+
+            if (job.status === 'succeeded') {
+                return job;
             }
+
+            if (job.status === 'failed') {
+                throw new Error(`The command ${job.command} failed: ${job.error}\n${job.stderr}`);
+            }
+
+            if (Date.now() - startedAt > timeout) {
+                throw new Error(`The command ${job.command} did not finish within ${timeout}ms.`);
+            }
+
+            return cy.wait(interval, { log: false }).then(() => {
+                return poll(Math.min(interval * 2, maxInterval));
+            });
         });
+    };
+
+    return poll(100);
+});
+
+Cypress.Commands.add('manageAsync', (command, parameters = [], options = {}) => {
+    return djangoRequest('POST', '/__cypress__/manage/', {
+        command: command,
+        parameters: parameters,
+        background: true
+    }).then((response) => {
+        const jobId = response.body.job_id;
+
+        if (options.wait === false) {
+            return jobId;
+        }
+
+        return cy.waitForJob(jobId, options);
     });
 });
 
 Cypress.Commands.add('migrate', () => {
-    return cy.csrfToken().then((token) => {
-        return cy.request({
-            method: 'POST',
-            url: '/__cypress__/migrate/',
-            body: {},
-            log: false,
-            headers: {
-                "X-CSRFToken": token["body"]["token"]
-            }
-        });
-    });
+    return djangoRequest('POST', '/__cypress__/migrate/');
 });
 
 Cypress.Commands.add('refreshDatabase', () => {
-    return cy.csrfToken().then((token) => {
-        return cy.request({
-            method: 'POST',
-            url: '/__cypress__/refreshDatabase/',
-            body: {},
-            log: false,
-            headers: {
-                "X-CSRFToken": token["body"]["token"]
-            }
-        });
-    });
+    return djangoRequest('POST', '/__cypress__/refreshDatabase/');
 });
 
 Cypress.Commands.add('createUser', (attributes) => {
-    return cy.csrfToken().then((token) => {
-        return cy.request({
-            method: 'POST',
-            url: '/__cypress__/createUser/',
-            body: attributes,
-            log: false,
-            headers: {
-                "X-CSRFToken": token["body"]["token"]
+    return djangoRequest('POST', '/__cypress__/createUser/', attributes);
+});
+
+Cypress.Commands.add('beginTransaction', () => {
+    return djangoRequest('POST', '/__cypress__/beginTransaction/');
+});
+
+Cypress.Commands.add('rollbackTransaction', () => {
+    return djangoRequest('POST', '/__cypress__/rollbackTransaction/');
+});
+
+Cypress.Commands.add('batch', (operations, options = {}) => {
+    return djangoRequest('POST', '/__cypress__/batch/', {
+        operations: operations,
+        atomic: options.atomic || false
+    });
+});
+
+Cypress.Commands.add('loginAs', (username, attributes = {}) => {
+    return djangoRequest('POST', '/__cypress__/login/', { username: username, ...attributes })
+        .then((response) => response.body);
+});
+
+Cypress.Commands.add('createUsers', (users) => {
+    return djangoRequest('POST', '/__cypress__/createUsers/', { users: users });
+});
+
+Cypress.Commands.add('loadFixtures', (fixtures) => {
+    return djangoRequest('POST', '/__cypress__/loadFixtures/', { fixtures: fixtures });
+});
+
+Cypress.Commands.add('seed', (model, count = 1, overrides = {}) => {
+    return djangoRequest('POST', '/__cypress__/seed/', { model: model, count: count, overrides: overrides })
+        .then((response) => response.body.pks);
+});
+
+Cypress.Commands.add('waitFor', (model, filter = {}, options = {}) => {
+    return djangoRequest('POST', '/__cypress__/waitFor/', {
+        model: model,
+        filter: filter,
+        count: options.count,
+        timeout: options.timeout || 10000,
+    }).then((response) => response.body.count);
+});
+
+Cypress.Commands.add('mail', (filters = {}, options = {}) => {
+    const query = new URLSearchParams();
+
+    for (const [name, value] of Object.entries({ ...filters, timeout: options.timeout })) {
+        if (value !== undefined) {
+            query.append(name, value);
+        }
+    }
+
+    return djangoRequest('GET', `/__cypress__/mail/?${query}`).then((response) => response.body.messages);
+});
+
+Cypress.Commands.add('clearMail', () => {
+    return djangoRequest('DELETE', '/__cypress__/mail/');
+});
+
+Cypress.Commands.add('assertDb', (checks) => {
+    return djangoRequest('POST', '/__cypress__/assert/', { checks: checks }).then((response) => {
+        const failures = response.body.results
+            .filter((result) => !result.passed)
+            .map((result) => {
+                const check = JSON.stringify(result.check);
+
+                if (result.error) {
+                    return `${check}: ${result.error}`;
+                }
+
+                return `${check}: expected ${JSON.stringify(result.expected)}, got ${JSON.stringify(result.actual)}`;
+            });
+
+        if (failures.length > 0) {
+            throw new Error(`${failures.length} of ${checks.length} database checks failed:\n${failures.join('\n')}`);
+        }
+
+        return response.body.results;
+    });
+});
+
+Cypress.Commands.add('saveSnapshot', (name) => {
+    return djangoRequest('POST', '/__cypress__/saveSnapshot/', { name: name });
+});
+
+Cypress.Commands.add('restoreSnapshot', (name) => {
+    return djangoRequest('POST', '/__cypress__/restoreSnapshot/', { name: name });
+});
+
+Cypress.Commands.add('queriesFor', (requestId) => {
+    return djangoRequest('GET', `/__cypress__/queries/?request_id=${encodeURIComponent(requestId)}`)
+        .then((response) => response.body.requests[0]);
+});
+
+Cypress.Commands.add('assertMaxQueries', (url, maxQueries) => {
+    return djangoRequest('GET', `/__cypress__/queries/?path=${encodeURIComponent(url)}`).then((response) => {
+        const requests = response.body.requests;
+
+        if (requests.length === 0) {
+            throw new Error(`No request to ${url} was captured.`);
+        }
+
+        for (const request of requests) {
+            if (request.count > maxQueries) {
+                const duplicates = request.duplicates
+                    .map((duplicate) => `${duplicate.count} x ${duplicate.sql}`)
+                    .join('\n');
+
+                throw new Error(
+                    `${request.method} ${url} ran ${request.count} queries, more than ${maxQueries}.\n${duplicates}`
+                );
             }
-        });
+        }
+
+        return requests;
     });
-});
\ No newline at end of file
+});
+
+Cypress.Commands.add('profile', (callback, options = {}) => {
+    const modes = options.memory ? 'cpu,memory' : 'cpu';
+    let profiling = true;
+
+    djangoRequest('DELETE', '/__cypress__/profiles/');
+    cy.intercept({ url: options.url || '**', middleware: true }, (request) => {
+        if (profiling) {
+            request.headers['X-Cypress-Profile'] = modes;
+        }
+    });
+
+    cy.then(callback).then(() => {
+        profiling = false;
+    });
+
+    return djangoRequest('GET', '/__cypress__/profiles/').then((response) => response.body.profiles);
+});
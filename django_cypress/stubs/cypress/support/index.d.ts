@@ -2,6 +2,13 @@
 
 declare namespace Cypress {
     interface Chainable<Subject> {
+        /**
+         * Warm up the server: import the views, compile the templates and open the database connections.
+         *
+         * @example
+         * cy.warmup()
+         */
+        warmup(options?: { force?: boolean }): Chainable<any>;
         /**
          * Run an Management command.
          *
@@ -9,6 +16,28 @@ declare namespace Cypress {
          * cy.manage()
          */
         manage(command: string, parameters?: string[]): Chainable<any>;
+        /**
+         * Run a Management command in the background and wait for it.
+         * With `wait: false`, yield the job ID without waiting.
+         *
+         * @example
+         * cy.manageAsync("rebuild_index", ["--noinput"])
+         */
+        manageAsync(
+            command: string,
+            parameters?: string[],
+            options?: { wait?: boolean; timeout?: number; maxInterval?: number }
+        ): Chainable<any>;
+        /**
+         * Wait for a background Management command to finish.
+         *
+         * @example
+         * cy.waitForJob(jobId)
+         */
+        waitForJob(
+            jobId: string,
+            options?: { timeout?: number; maxInterval?: number }
+        ): Chainable<any>;
         /**
          * Get the CSRF Token.
          *
@@ -30,5 +59,122 @@ declare namespace Cypress {
          * cy.createUser()
          */
         createUser(attributes: object): Chainable<any>;
+        /**
+         * Log a user in without the login form, creating the user if needed.
+         *
+         * @example
+         * cy.loginAs("django-user", {password: "123456789", is_staff: true})
+         */
+        loginAs(username: string, attributes?: object): Chainable<any>;
+        /**
+         * Create several users with a single request.
+         *
+         * @example
+         * cy.createUsers([{username: "first-user"}, {username: "second-user"}])
+         */
+        createUsers(users: object[]): Chainable<any>;
+        /**
+         * Wait until a query of a model matches the expected number of rows.
+         *
+         * @example
+         * cy.waitFor("shop.Order", {status: "paid"}, {count: 1, timeout: 5000})
+         */
+        waitFor(model: string, filter?: object, options?: { count?: number; timeout?: number }): Chainable<any>;
+        /**
+         * Check the database state with a single request.
+         *
+         * @example
+         * cy.assertDb([{model: "shop.Order", filter: {reference: "ORDER-1"}, values: {status: "paid"}}])
+         */
+        assertDb(checks: object[]): Chainable<any>;
+        /**
+         * Get the email messages of the in-memory outbox, waiting for one if a timeout is given.
+         *
+         * @example
+         * cy.mail({to: "user@example.com", subject: "Welcome"}, {timeout: 5000})
+         */
+        mail(filters?: { to?: string; subject?: string }, options?: { timeout?: number }): Chainable<any>;
+        /**
+         * Delete the email messages of the in-memory outbox.
+         *
+         * @example
+         * cy.clearMail()
+         */
+        clearMail(): Chainable<any>;
+        /**
+         * Load fixtures with bulk queries, parsing each fixture file only once.
+         *
+         * @example
+         * cy.loadFixtures(["users", "orders"])
+         */
+        loadFixtures(fixtures: string[]): Chainable<any>;
+        /**
+         * Insert rows of a model built by its registered factory.
+         *
+         * @example
+         * cy.seed("shop.Order", 1000, {status: "paid"})
+         */
+        seed(model: string, count?: number, overrides?: object): Chainable<any>;
+        /**
+         * Open a test transaction that pins every request to one connection.
+         *
+         * @example
+         * cy.beginTransaction()
+         */
+        beginTransaction(): Chainable<any>;
+        /**
+         * Roll back the test transaction opened by cy.beginTransaction().
+         *
+         * @example
+         * cy.rollbackTransaction()
+         */
+        rollbackTransaction(): Chainable<any>;
+        /**
+         * Save the state of the database as a named snapshot.
+         *
+         * @example
+         * cy.saveSnapshot("admin with orders")
+         */
+        saveSnapshot(name: string): Chainable<any>;
+        /**
+         * Restore a named snapshot of the database.
+         * The response body tells whether the snapshot was restored.
+         *
+         * @example
+         * cy.restoreSnapshot("admin with orders")
+         */
+        restoreSnapshot(name: string): Chainable<any>;
+        /**
+         * Run several commands in a single request.
+         *
+         * @example
+         * cy.batch([{name: "refreshDatabase"}, {name: "createUser", body: {username: "django-user"}}])
+         */
+        batch(
+            operations: { name: string; body?: object }[],
+            options?: { atomic?: boolean }
+        ): Chainable<any>;
+        /**
+         * Get the SQL queries run by a request of the application,
+         * captured by the QueryCaptureMiddleware.
+         *
+         * @example
+         * cy.queriesFor(requestId)
+         */
+        queriesFor(requestId: string): Chainable<any>;
+        /**
+         * Assert that every captured request to a path ran at most a number of SQL queries.
+         *
+         * @example
+         * cy.assertMaxQueries("/orders/", 10)
+         */
+        assertMaxQueries(url: string, maxQueries: number): Chainable<any>;
+        /**
+         * Profile the requests of the application sent while running a callback.
+         *
+         * @example
+         * cy.profile(() => cy.visit("/orders/"), { memory: true })
+         */
+        profile(callback: () => void, options?: { memory?: boolean; url?: string }): Chainable<any>;
     }
 }
\ No newline at end of file
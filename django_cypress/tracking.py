@@ -0,0 +1,128 @@
+import re
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .conf import get_setting
+
+WRITE_STATEMENT = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    + r"|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+[`\"\[]?([^\s`\"\]\(,;]+)",
+    re.IGNORECASE,
+)
+
+
+class DirtyTableTracker:
+    """Record the tables written by the queries of a connection.
+
+    An instance is installed as an execute wrapper of the database
+    connections. It parses the write statements and remembers their
+    tables until they are popped by the next database reset. The tables
+    are recorded under the alias of the connection, so an alias pointing
+    to the database of a Cypress worker resolves to the worker.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._tables: Dict[str, Optional[Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: Dict[str, Any],
+    ) -> Any:
+        """Record the table of a write statement and run it.
+
+        Args:
+        ----
+        execute (Callable): The function running the query.
+        sql (str): The SQL statement.
+        params (Any): The parameters of the statement.
+        many (bool): Whether the statement runs with several sets of parameters.
+        context (Dict[str, Any]): The connection and the cursor of the query.
+
+        Returns:
+        -------
+        Any: The result of the query.
+        """
+        match = WRITE_STATEMENT.match(sql) if isinstance(sql, str) else None
+        if match is not None:
+            self.add(context["connection"].alias, {match.group(1)})
+
+        return execute(sql, params, many, context)
+
+    def install(self, connection: BaseDatabaseWrapper) -> None:
+        """Wrap the queries of a connection with the tracker.
+
+        Args:
+        ----
+        connection (BaseDatabaseWrapper): The database connection.
+        """
+        # The tracker goes first, because Django's execute_wrapper() context
+        # managers pop the last wrapper when they exit.
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, self)
+
+    def add(self, using: str, tables: Set[str]) -> None:
+        """Mark tables as dirty.
+
+        Args:
+        ----
+        using (str): The alias of the database.
+        tables (Set[str]): The names of the tables.
+        """
+        with self._lock:
+            dirty_tables = self._tables.setdefault(using, set())
+            if dirty_tables is not None:
+                dirty_tables.update(tables)
+
+    def mark_all(self, using: str) -> None:
+        """Mark every table as dirty, e.g. after writes the tracker cannot see.
+
+        Args:
+        ----
+        using (str): The alias of the database.
+        """
+        with self._lock:
+            self._tables[connections[using].alias] = None
+
+    def pop(self, using: str) -> Optional[Set[str]]:
+        """Return the dirty tables and forget them.
+
+        Args:
+        ----
+        using (str): The alias of the database.
+
+        Returns:
+        -------
+        Optional[Set[str]]: The names of the dirty tables, or None if every
+        table is dirty.
+        """
+        with self._lock:
+            return self._tables.pop(connections[using].alias, set())
+
+
+dirty_tables = DirtyTableTracker()
+
+
+def install_dirty_table_tracker(
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,
+) -> None:
+    """Install the dirty table tracker on a new connection if it is enabled.
+
+    This is connected to the connection_created signal.
+
+    Args:
+    ----
+    connection (BaseDatabaseWrapper): The new database connection.
+    **kwargs: The remaining arguments of the signal.
+    """
+    if get_setting("REFRESH_DATABASE_MODE") == "dirty":
+        dirty_tables.install(connection)
@@ -1,21 +1,139 @@
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.urls import path
 
-from .views import (
-    CreateUserView,
-    CSRFTokenView,
-    ManageView,
-    MigrateView,
-    RefreshDatabaseView,
-)
+from . import async_views, views
+from .conf import get_setting
+
+use_async_views = get_setting("ASYNC_VIEWS")
+if use_async_views is None:
+    # ASGI_APPLICATION is only set by the Channels and Daphne deployments, the
+    # other ASGI servers need DJANGO_CYPRESS_ASYNC_VIEWS = True.
+    use_async_views = bool(getattr(settings, "ASGI_APPLICATION", None))
+    use_async_views = use_async_views and django.VERSION >= (4, 1)
+elif use_async_views and django.VERSION < (4, 1):
+    # The asynchronous class-based views need Django 4.1.
+    raise ImproperlyConfigured(
+        "DJANGO_CYPRESS_ASYNC_VIEWS requires Django 4.1 or later."
+    )
+
+cypress_views = async_views if use_async_views else views
 
 urlpatterns = [
-    path("__cypress__/manage/", ManageView.as_view(), name="manage-view"),
+    path(
+        "__cypress__/manage/",
+        cypress_views.ManageView.as_view(),
+        name="manage-view",
+    ),
+    path(
+        "__cypress__/loadFixtures/",
+        cypress_views.LoadFixturesView.as_view(),
+        name="load-fixtures-view",
+    ),
+    path(
+        "__cypress__/jobs/<str:job_id>/",
+        cypress_views.JobView.as_view(),
+        name="job-view",
+    ),
     path(
         "__cypress__/refreshDatabase/",
-        RefreshDatabaseView.as_view(),
+        cypress_views.RefreshDatabaseView.as_view(),
         name="refresh-database-view",
     ),
-    path("__cypress__/migrate/", MigrateView.as_view(), name="migrate-view"),
-    path("__cypress__/csrftoken/", CSRFTokenView.as_view(), name="csrftoken-view"),
-    path("__cypress__/createUser/", CreateUserView.as_view(), name="create-user-view"),
+    path(
+        "__cypress__/migrate/",
+        cypress_views.MigrateView.as_view(),
+        name="migrate-view",
+    ),
+    path(
+        "__cypress__/warmup/",
+        cypress_views.WarmupView.as_view(),
+        name="warmup-view",
+    ),
+    path(
+        "__cypress__/csrftoken/",
+        cypress_views.CSRFTokenView.as_view(),
+        name="csrftoken-view",
+    ),
+    path(
+        "__cypress__/createUser/",
+        cypress_views.CreateUserView.as_view(),
+        name="create-user-view",
+    ),
+    path(
+        "__cypress__/login/",
+        cypress_views.LoginView.as_view(),
+        name="login-view",
+    ),
+    path(
+        "__cypress__/createUsers/",
+        cypress_views.CreateUsersView.as_view(),
+        name="create-users-view",
+    ),
+    path(
+        "__cypress__/seed/",
+        cypress_views.SeedView.as_view(),
+        name="seed-view",
+    ),
+    path(
+        "__cypress__/waitFor/",
+        cypress_views.WaitForView.as_view(),
+        name="wait-for-view",
+    ),
+    path(
+        "__cypress__/assert/",
+        cypress_views.AssertView.as_view(),
+        name="assert-view",
+    ),
+    path(
+        "__cypress__/stats/",
+        cypress_views.StatsView.as_view(),
+        name="stats-view",
+    ),
+    path(
+        "__cypress__/queries/",
+        cypress_views.QueriesView.as_view(),
+        name="queries-view",
+    ),
+    path(
+        "__cypress__/mail/",
+        cypress_views.MailView.as_view(),
+        name="mail-view",
+    ),
+    path(
+        "__cypress__/profiles/",
+        cypress_views.ProfilesView.as_view(),
+        name="profiles-view",
+    ),
+    path(
+        "__cypress__/profiles/<str:profile_id>/",
+        cypress_views.ProfilesView.as_view(),
+        name="profile-view",
+    ),
+    path(
+        "__cypress__/batch/",
+        cypress_views.BatchView.as_view(),
+        name="batch-view",
+    ),
+    path(
+        "__cypress__/beginTransaction/",
+        cypress_views.BeginTransactionView.as_view(),
+        name="begin-transaction-view",
+    ),
+    path(
+        "__cypress__/rollbackTransaction/",
+        cypress_views.RollbackTransactionView.as_view(),
+        name="rollback-transaction-view",
+    ),
+    path(
+        "__cypress__/saveSnapshot/",
+        cypress_views.SaveSnapshotView.as_view(),
+        name="save-snapshot-view",
+    ),
+    path(
+        "__cypress__/restoreSnapshot/",
+        cypress_views.RestoreSnapshotView.as_view(),
+        name="restore-snapshot-view",
+    ),
 ]
@@ -1,14 +1,105 @@
+import copy
 import json
+from contextlib import nullcontext
 from http import HTTPStatus
+from http.cookies import SimpleCookie
+from typing import Any, ContextManager, Dict, List, Optional, Type
 
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import management
-from django.http import HttpRequest, JsonResponse
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http.response import HttpResponseBase
 from django.middleware.csrf import get_token
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
+from .assertions import evaluate_checks
+from .auth import build_user, session_cache, set_session_cookie
+from .bulk import bulk_insert
+from .conf import get_setting
+from .factories import factories
+from .fixtures import load_fixtures
+from .instrumentation import add_timing, latency_stats, phase, track_request
+from .isolation import transaction_isolation
+from .jobs import job_queue
+from .mail import message_as_dict, outbox
+from .migration_cache import migrate
+from .profiling import profile_store
+from .queries import query_log
+from .snapshots import get_snapshot_store, restore_baseline
+from .waiting import wait_for_rows
+from .warmup import warmup
 
-class CreateUserView(View):
+
+@method_decorator(csrf_exempt, name="dispatch")
+class CypressView(View):
+    """Base view of the django_cypress endpoints.
+
+    The views are protected against CSRF, unless the request carries
+    the secret configured by the DJANGO_CYPRESS_SECRET setting in
+    the X-Cypress-Secret header. Every request is measured and its
+    timing is sent in the Server-Timing header.
+    """
+
+    def dispatch(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Check the CSRF token or the secret and dispatch the request.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+        *args: The positional arguments of the URL.
+        **kwargs: The keyword arguments of the URL.
+
+        Returns:
+        -------
+        HttpResponseBase: The response of the handler.
+        """
+        with track_request(type(self).__name__) as timing:
+            if self._has_valid_secret(request):
+                response = super().dispatch(request, *args, **kwargs)
+            else:
+                response = csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+        if timing is not None:
+            add_timing(request, response, timing)
+
+        return response
+
+    def _has_valid_secret(
+        self,
+        request: HttpRequest,
+    ) -> bool:
+        """Check whether the request carries the configured secret.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        bool: True if a secret is configured and the header matches it.
+        """
+        secret = get_setting("SECRET")
+        header = request.headers.get("X-Cypress-Secret")
+
+        if not secret or header is None:
+            return False
+
+        return constant_time_compare(header, secret)
+
+
+class CreateUserView(CypressView):
     """A view for creating a user via HTTP POST requests."""
 
     def post(
@@ -29,20 +120,255 @@ class CreateUserView(View):
 
         try:
             user_model = get_user_model()
-            user = user_model.objects.create_user(**body)
+            with phase("create_user"):
+                user = user_model.objects.create_user(**body)
             return JsonResponse({"user_id": user.id}, status=HTTPStatus.CREATED)
         except Exception as e:
             return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
 
 
-class RefreshDatabaseView(View):
-    """A view for running Django's flush command via HTTP POST requests."""
+class LoginView(CypressView):
+    """A view for logging a user in via HTTP POST requests.
+
+    The user is created if it does not exist yet, and the response sets
+    the cookie of a session written directly through the session engine,
+    so the login form, its password check and its redirects are skipped.
+    The session of a user is reused by the following logins.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to log a user in.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the username
+            and the attributes of the user to create if it does not exist.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the ID of the user and whether
+        it was created, with the session cookie.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+
+        try:
+            user_model = get_user_model()
+            username_field = user_model.USERNAME_FIELD
+            if username_field != "username" and "username" in body:
+                body[username_field] = body.pop("username")
+            username = user_model.normalize_username(body[username_field])
+            backend = body.pop("backend", None) or settings.AUTHENTICATION_BACKENDS[0]
+
+            user = user_model._default_manager.filter(
+                **{username_field: username}
+            ).first()
+            created = user is None
+            if user is None:
+                with phase("create_user"):
+                    user = build_user(user_model, body)
+                    user.save()
+
+            with phase("session"):
+                session_key = session_cache.get_session_key(user, backend)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        response = JsonResponse({"user_id": user.pk, "created": created})
+        set_session_cookie(response, session_key)
+
+        return response
+
+
+class CreateUsersView(CypressView):
+    """A view for creating several users via HTTP POST requests.
+
+    The users are inserted with a single bulk query and their passwords
+    are hashed with the hasher configured for Cypress.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to create several users.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the users data.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the IDs of the new users.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+
+        try:
+            user_model = get_user_model()
+            with phase("hash_passwords"):
+                users = [
+                    build_user(user_model, dict(attributes))
+                    for attributes in body.get("users", [])
+                ]
+            with phase("insert"):
+                user_ids = bulk_insert(user_model, users)
+            return JsonResponse({"user_ids": user_ids}, status=HTTPStatus.CREATED)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+
+class SeedView(CypressView):
+    """A view for seeding the rows of any model via HTTP POST requests.
+
+    The instances are built by the factory registered for the model and
+    inserted with bulk queries of DJANGO_CYPRESS_SEED_BATCH_SIZE rows.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to seed the rows of a model.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the label of
+            the model, the number of rows and the overrides of their fields.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the primary keys of the new rows.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+
+        try:
+            model = apps.get_model(body["model"])
+            with phase("build"):
+                instances = factories.build(
+                    model, int(body.get("count", 1)), body.get("overrides")
+                )
+            with phase("insert"):
+                pks = bulk_insert(
+                    model,
+                    instances,
+                    batch_size=body.get("batch_size") or get_setting("SEED_BATCH_SIZE"),
+                )
+            return JsonResponse({"pks": pks}, status=HTTPStatus.CREATED)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+
+class WaitForView(CypressView):
+    """A view for waiting until rows are written via HTTP POST requests.
+
+    The request blocks until a query of a model matches the expected
+    number of rows or until its timeout, which is capped by the
+    DJANGO_CYPRESS_WAIT_FOR_TIMEOUT setting.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to wait for rows.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the label of
+            the model, the filter of the query, the expected number of rows and
+            the timeout in milliseconds.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the number of rows, with the
+        408 status code if the rows were not found before the timeout.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+        timeout = get_setting("WAIT_FOR_TIMEOUT")
+        timeout_parameter = body.get("timeout")
+
+        if timeout_parameter is not None:
+            try:
+                timeout = min(float(timeout_parameter) / 1000, timeout)
+            except (TypeError, ValueError):
+                return JsonResponse(
+                    {"error": f"Invalid timeout: {timeout_parameter!r}."},
+                    status=HTTPStatus.BAD_REQUEST,
+                )
+
+        try:
+            with phase("wait_for"):
+                found, count = wait_for_rows(
+                    apps.get_model(body["model"]),
+                    body.get("filter", {}),
+                    body.get("count"),
+                    timeout,
+                )
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        if not found:
+            return JsonResponse(
+                {
+                    "error": f"Timed out after {timeout:g}s waiting for "
+                    + f"{body['model']} rows, found {count}.",
+                    "count": count,
+                },
+                status=HTTPStatus.REQUEST_TIMEOUT,
+            )
+
+        return JsonResponse({"success": True, "count": count})
+
+
+class AssertView(CypressView):
+    """A view for checking the database state via HTTP POST requests.
+
+    Every check of a request is evaluated, and the checks of a model share
+    a single query.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to evaluate checks of the database state.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the checks.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing whether every check passed and
+        the result of each check.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+
+        with phase("assert"):
+            results = evaluate_checks(body.get("checks", []))
+
+        return JsonResponse(
+            {"passed": all(result["passed"] for result in results), "results": results}
+        )
+
+
+class RefreshDatabaseView(CypressView):
+    """A view for resetting the database via HTTP POST requests.
+
+    The DJANGO_CYPRESS_REFRESH_DATABASE_MODE setting selects how the
+    database is reset. The "flush" mode runs Django's flush command,
+    the "snapshot" mode restores a snapshot of the freshly migrated
+    database and the "dirty" mode restores only the tables written
+    since the last reset. The email outbox is cleared as well.
+    """
 
     def post(
         self,
         _: HttpRequest,
     ) -> JsonResponse:
-        """Handle HTTP POST requests to execute Django's flush command.
+        """Handle HTTP POST requests to reset the database.
 
         Args:
         ----
@@ -50,15 +376,36 @@ class RefreshDatabaseView(View):
 
         Returns:
         -------
-        JsonResponse: A JSON response indicating the success of the command execution.
+        JsonResponse: A JSON response indicating the success of the reset.
         """
-        management.call_command("flush", "--no-input")
+        mode = get_setting("REFRESH_DATABASE_MODE")
+
+        with phase(mode):
+            if mode == "flush":
+                management.call_command("flush", "--no-input")
+            elif mode == "snapshot":
+                restore_baseline(DEFAULT_DB_ALIAS)
+            elif mode == "dirty":
+                restore_baseline(DEFAULT_DB_ALIAS, dirty_only=True)
+            else:
+                raise ImproperlyConfigured(
+                    f"Unknown DJANGO_CYPRESS_REFRESH_DATABASE_MODE: {mode!r}."
+                )
+
+        outbox.clear()
 
         return JsonResponse({"success": True})
 
 
-class MigrateView(View):
-    """A view for running Django's migrate command via HTTP POST requests."""
+class MigrateView(CypressView):
+    """A view for running Django's migrate command via HTTP POST requests.
+
+    The migration files and the applied migrations are fingerprinted
+    after each migration. The command is skipped while the fingerprint
+    does not change. When the DJANGO_CYPRESS_MIGRATION_CACHE_DIR setting
+    is set, migrated databases are cached on disk and restored instead
+    of being migrated again.
+    """
 
     def post(
         self,
@@ -72,15 +419,22 @@ class MigrateView(View):
 
         Returns:
         -------
-        JsonResponse: A JSON response indicating the success of the command execution.
+        JsonResponse: A JSON response indicating the success of the command
+        execution and whether the database was "migrated", "restored" or "skipped".
         """
-        management.call_command("migrate")
+        with phase("migrate"):
+            action = migrate(DEFAULT_DB_ALIAS)
+
+        return JsonResponse({"success": True, "action": action})
 
-        return JsonResponse({"success": True})
 
+class ManageView(CypressView):
+    """A view for running Django management commands via HTTP POST requests.
 
-class ManageView(View):
-    """A view for running Django management commands via HTTP POST requests."""
+    A command can run in the background by setting "background" in the
+    request body. The response then holds the ID of a job whose state is
+    available through the JobView.
+    """
 
     def post(
         self,
@@ -94,20 +448,252 @@ class ManageView(View):
 
         Returns:
         -------
-        JsonResponse: A JSON response indicating the success of the command execution.
+        JsonResponse: A JSON response indicating the success of the command execution,
+        or containing the ID of the job running the command in the background.
         """
         body = json.loads(request.body.decode("utf-8"))
         command = body.get("command")
         parameters = body.get("parameters")
-        management.call_command(
-            command,
-            *parameters,
-        )
+
+        if body.get("background", False):
+            job = job_queue.submit(
+                command,
+                list(parameters or []),
+                getattr(request, "cypress_database", None),
+            )
+            return JsonResponse({"job_id": job.id}, status=HTTPStatus.ACCEPTED)
+
+        with phase("command"):
+            management.call_command(
+                command,
+                *parameters,
+            )
+
+        return JsonResponse({"success": True})
+
+
+class LoadFixturesView(CypressView):
+    """A view for loading fixtures via HTTP POST requests.
+
+    Unlike the loaddata command, the parsed fixtures are cached and
+    inserted with bulk queries.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to load fixtures.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the fixture names.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the number of fixture files and
+        of loaded objects.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+
+        try:
+            with phase("load_fixtures"):
+                counts = load_fixtures(body.get("fixtures", []))
+            return JsonResponse(counts)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+
+class JobView(CypressView):
+    """A view for polling a background management command via HTTP GET requests."""
+
+    def get(
+        self,
+        _: HttpRequest,
+        job_id: str,
+    ) -> JsonResponse:
+        """Handle HTTP GET requests to retrieve the state of a job.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+        job_id (str): The ID of the job.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the status, the output
+        and the error of the job.
+        """
+        job = job_queue.get(job_id)
+        if job is None:
+            return JsonResponse(
+                {"error": f"Unknown job: {job_id!r}."}, status=HTTPStatus.NOT_FOUND
+            )
+
+        return JsonResponse(job.as_dict())
+
+
+class BeginTransactionView(CypressView):
+    """A view for opening a test transaction via HTTP POST requests.
+
+    Every following request runs inside the transaction until it is
+    rolled back through the RollbackTransactionView.
+    """
+
+    def post(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to open a test transaction.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        middleware = "django_cypress.middleware.TransactionIsolationMiddleware"
+        if middleware not in settings.MIDDLEWARE:
+            raise ImproperlyConfigured(
+                f"{middleware} must be added to the MIDDLEWARE setting "
+                + "to use test transactions."
+            )
+
+        with phase("begin"):
+            transaction_isolation.begin()
+
+        return JsonResponse({"success": True})
+
+
+class RollbackTransactionView(CypressView):
+    """A view for rolling back the test transaction via HTTP POST requests."""
+
+    def post(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to roll back the test transaction.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        with phase("rollback"):
+            transaction_isolation.rollback()
+
+        return JsonResponse({"success": True})
+
+
+class SaveSnapshotView(CypressView):
+    """A view for saving a named snapshot of the database via HTTP POST requests."""
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to save a named snapshot.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the name of the snapshot.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+        name = body.get("name")
+        if not isinstance(name, str) or not name:
+            return JsonResponse(
+                {"error": "The name of the snapshot is required."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        try:
+            with phase("save_snapshot"):
+                get_snapshot_store(DEFAULT_DB_ALIAS).save(name)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
 
         return JsonResponse({"success": True})
 
 
-class CSRFTokenView(View):
+class RestoreSnapshotView(CypressView):
+    """A view for restoring a named snapshot of the database via HTTP POST requests."""
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to restore a named snapshot.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the name of the snapshot.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating whether the snapshot was restored.
+        It is not restored when it does not exist or the migrations changed.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+        name = body.get("name")
+        if not isinstance(name, str) or not name:
+            return JsonResponse(
+                {"error": "The name of the snapshot is required."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        try:
+            with phase("restore_snapshot"):
+                restored = get_snapshot_store(DEFAULT_DB_ALIAS).restore(name)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        return JsonResponse({"success": True, "restored": restored})
+
+
+class WarmupView(CypressView):
+    """A view for warming up the server via HTTP POST requests.
+
+    The URLconf and its views are imported, the model fields are cached,
+    the templates are compiled and the database drivers are imported, so
+    the first test does not pay for them.
+    """
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to warm up the server.
+
+        The warm up runs once per process, unless "force" is set in the
+        request body.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the duration and the result of
+        each phase of the warm up.
+        """
+        body = json.loads(request.body.decode("utf-8") or "{}")
+
+        with phase("warmup"):
+            report = warmup.run(force=body.get("force", False))
+
+        return JsonResponse(report)
+
+
+class CSRFTokenView(CypressView):
     """A view for retrieving the CSRF token via HTTP GET requests."""
 
     def get(
@@ -127,3 +713,388 @@ class CSRFTokenView(View):
         token = get_token(request)
 
         return JsonResponse({"token": token})
+
+
+class StatsView(CypressView):
+    """A view for the latency statistics of the Cypress endpoints.
+
+    The statistics are aggregated per endpoint since the server started.
+    """
+
+    def get(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP GET requests to retrieve the latency statistics.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the number of requests, the
+        latencies and the latency histogram of each endpoint.
+        """
+        return JsonResponse({"endpoints": latency_stats.as_dict()})
+
+    def delete(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP DELETE requests to reset the latency statistics.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        latency_stats.reset()
+
+        return JsonResponse({"success": True})
+
+
+class QueriesView(CypressView):
+    """A view for the SQL queries captured by the QueryCaptureMiddleware."""
+
+    def get(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP GET requests to retrieve the captured queries.
+
+        The requests can be filtered by the request_id and the path
+        query parameters.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the captured requests with their
+        queries and their duplicated queries.
+        """
+        captured_requests = query_log.find(
+            request_id=request.GET.get("request_id"),
+            path=request.GET.get("path"),
+        )
+
+        return JsonResponse(
+            {
+                "requests": [
+                    captured_request.as_dict() for captured_request in captured_requests
+                ]
+            }
+        )
+
+    def delete(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP DELETE requests to forget the captured queries.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        query_log.clear()
+
+        return JsonResponse({"success": True})
+
+
+class MailView(CypressView):
+    """A view for the email messages of the in-memory outbox."""
+
+    def get(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP GET requests to retrieve the email messages.
+
+        The messages can be filtered by the to and the subject query
+        parameters. When the timeout query parameter is set, in
+        milliseconds, the request waits until a matching message is sent.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the matching messages, with the
+        408 status code if no message was sent before the timeout.
+        """
+        to = request.GET.get("to")
+        subject = request.GET.get("subject")
+        timeout_parameter = request.GET.get("timeout")
+
+        if timeout_parameter:
+            try:
+                timeout = float(timeout_parameter) / 1000
+            except ValueError:
+                return JsonResponse(
+                    {"error": f"Invalid timeout: {timeout_parameter!r}."},
+                    status=HTTPStatus.BAD_REQUEST,
+                )
+
+            timeout = min(timeout, get_setting("WAIT_FOR_TIMEOUT"))
+            with phase("wait_for_mail"):
+                messages = outbox.wait_for(to, subject, timeout)
+            if not messages:
+                return JsonResponse(
+                    {"error": f"No email message was sent after {timeout:g}s."},
+                    status=HTTPStatus.REQUEST_TIMEOUT,
+                )
+        else:
+            messages = outbox.find(to, subject)
+
+        return JsonResponse(
+            {"messages": [message_as_dict(message) for message in messages]}
+        )
+
+    def delete(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP DELETE requests to delete the email messages.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        outbox.clear()
+
+        return JsonResponse({"success": True})
+
+
+class ProfilesView(CypressView):
+    """A view for the profiles recorded by the ProfilingMiddleware."""
+
+    def get(
+        self,
+        request: HttpRequest,
+        profile_id: Optional[str] = None,
+    ) -> HttpResponse:
+        """Handle HTTP GET requests to retrieve the profiles.
+
+        Without a profile ID, the summaries of every profile are listed.
+        Otherwise, the profile is returned in the format given by the format
+        query parameter: "pstats" (the default) for the pstats report sorted by
+        the sort query parameter, "collapsed" for the stacks of a flame graph,
+        or "memory" for the largest memory allocations.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+        profile_id (Optional[str]): The ID of the profile.
+
+        Returns:
+        -------
+        HttpResponse: A JSON response containing the profile summaries or the
+        memory allocations, or a text response containing the CPU profile.
+        """
+        if profile_id is None:
+            return JsonResponse(
+                {"profiles": [profile.summary() for profile in profile_store.all()]}
+            )
+
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            return JsonResponse(
+                {"error": f"Unknown profile: {profile_id!r}."},
+                status=HTTPStatus.NOT_FOUND,
+            )
+
+        output_format = request.GET.get("format", "pstats")
+        if output_format == "pstats":
+            content = profile.pstats(
+                sort=request.GET.get("sort", "cumulative"),
+                limit=int(request.GET.get("limit", 50)),
+            )
+        elif output_format == "collapsed":
+            content = profile.collapsed()
+        elif output_format == "memory":
+            return JsonResponse(
+                {**profile.summary(), "allocations": profile.allocations}
+            )
+        else:
+            return JsonResponse(
+                {"error": f"Unknown format: {output_format!r}."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        return HttpResponse(content, content_type="text/plain; charset=utf-8")
+
+    def delete(
+        self,
+        _: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP DELETE requests to forget the profiles.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response indicating the success of the operation.
+        """
+        profile_store.clear()
+
+        return JsonResponse({"success": True})
+
+
+class BatchView(CypressView):
+    """A view for running several operations via one HTTP POST request.
+
+    Each operation is handled by the view of the matching Cypress
+    command, so a batch behaves exactly like the individual requests
+    while saving the HTTP round trips.
+    """
+
+    operations: Dict[str, Type[CypressView]] = {
+        "manage": ManageView,
+        "loadFixtures": LoadFixturesView,
+        "migrate": MigrateView,
+        "refreshDatabase": RefreshDatabaseView,
+        "createUser": CreateUserView,
+        "login": LoginView,
+        "createUsers": CreateUsersView,
+        "seed": SeedView,
+        "assert": AssertView,
+        "saveSnapshot": SaveSnapshotView,
+        "restoreSnapshot": RestoreSnapshotView,
+    }
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> JsonResponse:
+        """Handle HTTP POST requests to run a batch of operations.
+
+        The operations run in order and the batch stops at the first
+        failing one. When the batch is atomic, a failure rolls back
+        every operation of the batch. The cookies set by the operations,
+        e.g. the session cookie of a login, are set on the batch response.
+        The phases of each operation are measured under its name, followed
+        by its number when the batch repeats it, e.g. "seed" and "seed-2".
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object containing the operations.
+
+        Returns:
+        -------
+        JsonResponse: A JSON response containing the result of each operation.
+        """
+        body = json.loads(request.body.decode("utf-8"))
+        operations = body.get("operations", [])
+        atomic = body.get("atomic", False)
+        results = []
+        cookies: "SimpleCookie[str]" = SimpleCookie()
+        counts: Dict[str, int] = {}
+
+        context: ContextManager[Any] = nullcontext()
+        if atomic:
+            context = transaction.atomic()
+
+        with context:
+            for operation in operations:
+                name = operation.get("name", "")
+                counts[name] = counts.get(name, 0) + 1
+                label = name if counts[name] == 1 else f"{name}-{counts[name]}"
+
+                with phase(label, prefix=True):
+                    response = self._run_operation(request, operation)
+                results.append(
+                    {
+                        "status": response.status_code,
+                        "body": json.loads(response.content),
+                    }
+                )
+                cookies.update(response.cookies)
+
+                if response.status_code >= HTTPStatus.BAD_REQUEST:
+                    if atomic:
+                        transaction.set_rollback(True)
+                    return self._batch_response(
+                        results, cookies, HTTPStatus.BAD_REQUEST
+                    )
+
+        return self._batch_response(results, cookies, HTTPStatus.OK)
+
+    def _batch_response(
+        self,
+        results: List[Dict[str, Any]],
+        cookies: SimpleCookie,
+        status: int,
+    ) -> JsonResponse:
+        """Return the response of a batch.
+
+        Args:
+        ----
+        results (List[Dict[str, Any]]): The result of each operation.
+        cookies (SimpleCookie): The cookies set by the operations.
+        status (int): The HTTP Status Code of the batch.
+
+        Returns:
+        -------
+        JsonResponse: The results of the operations, with their cookies.
+        """
+        response = JsonResponse({"results": results}, status=status)
+        response.cookies.update(cookies)
+
+        return response
+
+    def _run_operation(
+        self,
+        request: HttpRequest,
+        operation: Dict[str, Any],
+    ) -> HttpResponse:
+        """Run a single operation of the batch.
+
+        Args:
+        ----
+        request (HttpRequest): The HTTP request object of the batch.
+        operation (Dict[str, Any]): The name and the body of the operation.
+
+        Returns:
+        -------
+        HttpResponse: The response of the view handling the operation.
+        """
+        name = operation.get("name", "")
+        view_class = self.operations.get(name)
+
+        if view_class is None:
+            return JsonResponse(
+                {"error": f"Unknown operation: {name!r}."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        operation_request = copy.copy(request)
+        operation_request._body = json.dumps(operation.get("body", {})).encode("utf-8")
+
+        try:
+            response = view_class.as_view()(operation_request)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        if not isinstance(response, HttpResponse):
+            return JsonResponse(
+                {"error": f"The {name!r} operation did not return a response body."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        return response
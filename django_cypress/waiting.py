@@ -0,0 +1,52 @@
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from django.db.models import Model
+
+from .isolation import transaction_isolation
+
+MIN_POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 0.1
+
+
+def wait_for_rows(
+    model: Type[Model],
+    filters: Dict[str, Any],
+    count: Optional[int] = None,
+    timeout: float = 10,
+) -> Tuple[bool, int]:
+    """Wait until a query of a model matches the expected number of rows.
+
+    The query runs again with a growing interval, up to a tenth of a
+    second, so the wait ends shortly after the rows are written. The
+    shared connection of the test transaction is released between the
+    queries, so the other requests can write the rows in the meantime.
+
+    Args:
+    ----
+    model (Type[Model]): The model of the query.
+    filters (Dict[str, Any]): The keyword arguments of the filter of the query.
+    count (Optional[int]): The expected number of rows, or None for at least one.
+    timeout (float): The maximum number of seconds to wait.
+
+    Returns:
+    -------
+    Tuple[bool, int]: Whether the expected rows were found before the timeout,
+    and the last number of rows.
+    """
+    queryset = model._base_manager.filter(**filters)
+    deadline = time.monotonic() + timeout
+    interval = MIN_POLL_INTERVAL
+
+    while True:
+        actual_count = queryset.count()
+        if actual_count == count if count is not None else actual_count > 0:
+            return True, actual_count
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False, actual_count
+
+        with transaction_isolation.released():
+            time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
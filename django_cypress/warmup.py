@@ -0,0 +1,182 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.apps import apps
+from django.db import connections
+from django.template import engines
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def _iter_patterns(resolver: URLResolver) -> Iterator[URLPattern]:
+    """Yield the URL patterns of a resolver and of its included resolvers.
+
+    Args:
+    ----
+    resolver (URLResolver): The URL resolver.
+
+    Returns:
+    -------
+    Iterator[URLPattern]: The URL patterns.
+    """
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_patterns(pattern)
+        else:
+            yield pattern
+
+
+def warm_urls() -> Dict[str, Any]:
+    """Import the URLconf and its views and populate the reverse lookups.
+
+    Returns
+    -------
+        Dict[str, Any]: The number of views.
+    """
+    resolver = get_resolver()
+    views = {pattern.lookup_str for pattern in _iter_patterns(resolver)}
+    # Populate the reverse lookups of the resolver and of its namespaces.
+    resolver.reverse_dict  # noqa: B018
+    for namespace in resolver.namespace_dict.keys():
+        resolver.namespace_dict[namespace][1].reverse_dict  # noqa: B018
+
+    return {"count": len(views)}
+
+
+def warm_models() -> Dict[str, Any]:
+    """Compute the lazily cached relations and fields of the models.
+
+    Returns
+    -------
+        Dict[str, Any]: The number of models.
+    """
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+
+    return {"count": len(models)}
+
+
+def warm_templates() -> Dict[str, Any]:
+    """Compile the templates of the template directories into the loaders cache.
+
+    Every file of the directories of the template loaders is loaded, so
+    the cached loader keeps its compiled template. The files that are not
+    valid templates are skipped.
+
+    Returns
+    -------
+        Dict[str, Any]: The number of compiled and skipped templates.
+    """
+    compiled = 0
+    skipped = 0
+
+    for engine in engines.all():
+        for directory in _template_directories(engine):
+            for path in sorted(Path(directory).rglob("*")):
+                if not path.is_file():
+                    continue
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                    compiled += 1
+                except Exception:
+                    skipped += 1
+
+    return {"count": compiled, "skipped": skipped}
+
+
+def _template_directories(engine: Any) -> List[str]:
+    """Return the directories searched by the loaders of a template engine.
+
+    Args:
+    ----
+    engine (Any): The template engine.
+
+    Returns:
+    -------
+    List[str]: The template directories.
+    """
+    template_loaders = getattr(getattr(engine, "engine", None), "template_loaders", [])
+    directories: List[str] = []
+
+    for loader in template_loaders:
+        # The cached loader wraps the loaders reading the files.
+        for inner_loader in getattr(loader, "loaders", [loader]):
+            if hasattr(inner_loader, "get_dirs"):
+                directories.extend(
+                    str(directory) for directory in inner_loader.get_dirs()
+                )
+
+    return list(dict.fromkeys(directories))
+
+
+def warm_databases() -> Dict[str, Any]:
+    """Import the database drivers and set up a connection to each database.
+
+    The connections belong to the thread of the warm up and are closed at
+    the end of its request unless CONN_MAX_AGE keeps them, so this phase
+    warms the import of the drivers and the first connection setup (e.g.
+    the server version checks), not the connections of the next requests.
+
+    Returns
+    -------
+        Dict[str, Any]: The number of connections.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+
+    return {"count": len(connections.all())}
+
+
+PHASES = {
+    "urls": warm_urls,
+    "models": warm_models,
+    "templates": warm_templates,
+    "databases": warm_databases,
+}
+
+
+class Warmup:
+    """Warm up the caches filled by the first requests of a process.
+
+    The warm up runs once per process, the following calls return the
+    report of the first one unless they force it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the warm up."""
+        self._report: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def run(self, force: bool = False) -> Dict[str, Any]:
+        """Run every phase of the warm up.
+
+        Args:
+        ----
+        force (bool): Whether to run the warm up even if it already ran.
+
+        Returns:
+        -------
+        Dict[str, Any]: The duration and the result of each phase, and whether
+        the warm up ran during this call.
+        """
+        with self._lock:
+            if self._report is not None and not force:
+                return {**self._report, "warmed": False}
+
+            phases = {}
+            for name, warm in PHASES.items():
+                start = time.perf_counter()
+                result = warm()
+                phases[name] = {
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                    **result,
+                }
+
+            self._report = {"phases": phases}
+
+            return {**self._report, "warmed": True}
+
+
+warmup = Warmup()
@@ -0,0 +1,219 @@
+import copy
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.sqlite3.creation import (
+    DatabaseCreation as SQLiteDatabaseCreation,
+)
+
+WORKER_ID = re.compile(r"^[A-Za-z0-9_]{1,32}$")
+CLONE_ATTEMPTS = 3
+
+
+class WorkerDatabases:
+    """Give each parallel Cypress worker its own copy of the database.
+
+    The database of a worker is registered as a new connection alias and
+    cloned from the default database the first time the worker is seen.
+    SQLite databases are copied with the online backup API, PostgreSQL
+    databases are created with the default database as template, which
+    closes the other connections to the default database.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Initialize the worker databases.
+
+        Args:
+        ----
+        using (str): The alias of the database to clone.
+        """
+        self.using = using
+        self._aliases: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get_alias(self, worker_id: str) -> str:
+        """Return the alias of the database of a worker, cloning it if needed.
+
+        Args:
+        ----
+        worker_id (str): The ID of the worker, made of letters, digits
+            and underscores.
+
+        Returns:
+        -------
+        str: The alias of the database of the worker.
+        """
+        if not WORKER_ID.match(worker_id):
+            raise ValueError(f"Invalid Cypress worker ID: {worker_id!r}.")
+
+        alias = f"{self.using}_worker_{worker_id}"
+
+        with self._lock:
+            if alias not in self._aliases:
+                connections.settings[alias] = self._settings(alias, worker_id)
+                self._clone(alias)
+                self._aliases.add(alias)
+
+        return alias
+
+    def use_for_process(self, worker_id: str) -> None:
+        """Use the database of a worker as the default database of the process.
+
+        This lets a whole Django server run on the database cloned for a
+        worker, e.g. by the cypress_run command.
+
+        Args:
+        ----
+        worker_id (str): The ID of the worker.
+        """
+        if not WORKER_ID.match(worker_id):
+            raise ValueError(f"Invalid Cypress worker ID: {worker_id!r}.")
+
+        alias = f"{self.using}_worker_{worker_id}"
+        connection = connections[self.using]
+        name = self._settings(alias, worker_id)["NAME"]
+
+        connection.close()
+        connection.settings_dict["NAME"] = name
+
+    def reset(self, drop: bool = False) -> None:
+        """Forget the databases of the workers.
+
+        They are cloned again from the default database the next time
+        their worker is seen.
+
+        Args:
+        ----
+        drop (bool): Whether to delete the databases too.
+        """
+        with self._lock:
+            for alias in self._aliases:
+                connections[alias].close()
+                if drop:
+                    self._drop(alias)
+                del connections[alias]
+                del connections.settings[alias]
+
+            self._aliases.clear()
+
+    def _settings(self, alias: str, worker_id: str) -> dict:
+        """Return the settings of the database of a worker.
+
+        Args:
+        ----
+        alias (str): The alias of the database of the worker.
+        worker_id (str): The ID of the worker.
+
+        Returns:
+        -------
+        dict: The settings of the database, named after the default one.
+        """
+        source = connections[self.using]
+        settings_dict = copy.deepcopy(source.settings_dict)
+
+        if source.vendor == "sqlite" and SQLiteDatabaseCreation.is_in_memory_db(
+            source.settings_dict["NAME"]
+        ):
+            settings_dict["NAME"] = f"file:memorydb_{alias}?mode=memory&cache=shared"
+        else:
+            suffix = f"worker_{worker_id}"
+            settings_dict["NAME"] = source.creation.get_test_db_clone_settings(suffix)[
+                "NAME"
+            ]
+
+        return settings_dict
+
+    def _clone(self, alias: str) -> None:
+        """Copy the default database into the database of a worker.
+
+        Args:
+        ----
+        alias (str): The alias of the database of the worker.
+        """
+        source = connections[self.using]
+        target = connections[alias]
+
+        if source.vendor == "sqlite":
+            source.ensure_connection()
+            target.ensure_connection()
+            source.connection.backup(target.connection)
+        elif source.vendor == "postgresql":
+            source_name = source.ops.quote_name(source.settings_dict["NAME"])
+            target_name = source.ops.quote_name(target.settings_dict["NAME"])
+
+            # PostgreSQL refuses to copy a database in use, e.g. by the other
+            # request threads or by the test transaction.
+            source.close()
+            with source._nodb_cursor() as cursor:
+                cursor.execute(f"DROP DATABASE IF EXISTS {target_name}")
+                for attempt in range(CLONE_ATTEMPTS):
+                    cursor.execute(
+                        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                        + "WHERE datname = %s AND pid <> pg_backend_pid()",
+                        [source.settings_dict["NAME"]],
+                    )
+                    try:
+                        cursor.execute(
+                            f"CREATE DATABASE {target_name} WITH TEMPLATE {source_name}"
+                        )
+                        break
+                    except OperationalError as e:
+                        # Another connection was opened in the meantime.
+                        if attempt == CLONE_ATTEMPTS - 1:
+                            raise OperationalError(
+                                f"Cannot clone {source_name} for a Cypress worker, "
+                                + f"it is still in use: {e}"
+                            ) from e
+        else:
+            raise ImproperlyConfigured(
+                f"Worker databases are not supported on {source.vendor}."
+            )
+
+    def _drop(self, alias: str) -> None:
+        """Delete the database of a worker.
+
+        Args:
+        ----
+        alias (str): The alias of the database of the worker.
+        """
+        source = connections[self.using]
+        name = connections[alias].settings_dict["NAME"]
+
+        if source.vendor == "sqlite":
+            if not SQLiteDatabaseCreation.is_in_memory_db(name):
+                Path(name).unlink(missing_ok=True)
+        elif source.vendor == "postgresql":
+            with source._nodb_cursor() as cursor:
+                cursor.execute(f"DROP DATABASE IF EXISTS {source.ops.quote_name(name)}")
+
+
+worker_databases = WorkerDatabases()
+
+
+@contextmanager
+def use_worker_database(alias: Optional[str]) -> Iterator[None]:
+    """Use the database of a worker as the default database in the current thread.
+
+    Nothing is done when no alias is given.
+
+    Args:
+    ----
+    alias (Optional[str]): The alias of the database of the worker.
+    """
+    if alias is None:
+        yield
+        return
+
+    original_connection = connections[DEFAULT_DB_ALIAS]
+    worker_connection: BaseDatabaseWrapper = connections[alias]
+    connections[DEFAULT_DB_ALIAS] = worker_connection
+    try:
+        yield
+    finally:
+        connections[DEFAULT_DB_ALIAS] = original_connection
@@ -0,0 +1,28 @@
+// Record the duration of each spec file after `cypress run`.
+// The `cypress_run` management command reads the timings to split the specs
+// into shards of similar durations.
+const fs = require('fs');
+const path = require('path');
+
+module.exports = (on, config) => {
+    on('after:run', (results) => {
+        // `cypress open` does not report the results of the runs.
+        if (!results || !results.runs) {
+            return;
+        }
+
+        const file = config.env.djangoCypressTimings || 'cypress/timings.json';
+        let timings = {};
+
+        if (fs.existsSync(file)) {
+            timings = JSON.parse(fs.readFileSync(file, 'utf8'));
+        }
+
+        for (const run of results.runs) {
+            timings[run.spec.relative] = run.stats.duration;
+        }
+
+        fs.mkdirSync(path.dirname(file), { recursive: true });
+        fs.writeFileSync(file, JSON.stringify(timings, null, 2));
+    });
+};
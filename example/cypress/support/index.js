@@ -17,6 +17,25 @@
 
 import './commands';
 
-before(() => {});
+before(() => {
+    // Pay the first-request costs of the server before the first test.
+    cy.warmup();
+});
+
+beforeEach(() => {
+    // Route the requests of the application to the database of this worker.
+    const worker = Cypress.env('djangoCypressWorker');
+
+    if (worker) {
+        cy.setCookie('cypress_worker', String(worker), { log: false });
+    }
+
+    // Tag the requests of the application to find their SQL queries.
+    if (Cypress.env('djangoCypressQueries')) {
+        cy.intercept({ url: '**', middleware: true }, (request) => {
+            request.headers['X-Cypress-Request-Id'] = `${Date.now()}-${Cypress._.uniqueId()}`;
+        });
+    }
+});
 
 after(() => {});
\ No newline at end of file
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Run the latency benchmarks of the django_cypress endpoints.
+
+The results are printed and written as JSON. When a baseline file from a
+previous run is given, the command fails if an endpoint got slower than
+the threshold.
+
+Usage:
+    python run_benchmarks.py --output results.json
+    python run_benchmarks.py --baseline results.json --threshold 0.2
+    DJANGO_CYPRESS_TEST_DATABASE=postgresql python run_benchmarks.py
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import django
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="The benchmarks to run")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--output", help="The JSON file of the results")
+    parser.add_argument("--baseline", help="The JSON file of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "tests.test_settings"
+    django.setup()
+
+    from tests.benchmarks import find_regressions, result_key, run_benchmarks
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        results = run_benchmarks(args.runs, args.names or None)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    for result in results:
+        print(
+            f"{result_key(result)}: median {result['median_ms']}ms, "
+            + f"p95 {result['p95_ms']}ms, {result['throughput_rps']} req/s"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = find_regressions(
+                results, json.load(baseline), args.threshold, args.min_delta_ms
+            )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        sys.exit(bool(regressions))
@@ -0,0 +1,380 @@
+"""Latency and throughput benchmarks of the django_cypress endpoints.
+
+The benchmarks run against the test database configured by the test
+settings, SQLite by default or PostgreSQL when the
+DJANGO_CYPRESS_TEST_DATABASE environment variable is "postgresql".
+Run them with run_benchmarks.py.
+"""
+
+import contextlib
+import functools
+import io
+import statistics
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import override_settings
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+
+ROW_COUNTS = [0, 1000, 10000]
+REFRESH_DATABASE_MODES = ["flush", "snapshot", "dirty"]
+
+
+def _seed_users(rows: int) -> None:
+    """Insert users.
+
+    Args:
+    ----
+    rows (int): The number of rows.
+    """
+    User.objects.bulk_create(
+        User(username=f"user-{index}", password="!") for index in range(rows)
+    )
+
+
+def _seed_groups(rows: int) -> None:
+    """Insert groups and add them to the first user.
+
+    Args:
+    ----
+    rows (int): The number of rows.
+    """
+    groups = Group.objects.bulk_create(
+        Group(name=f"group-{index}") for index in range(rows)
+    )
+    user = User.objects.order_by("pk").first()
+    if user is not None:
+        user.groups.add(*groups)
+
+
+def _seed_sessions(rows: int) -> None:
+    """Insert sessions.
+
+    Args:
+    ----
+    rows (int): The number of rows.
+    """
+    expire_date = timezone.now() + timedelta(days=1)
+    Session.objects.bulk_create(
+        Session(
+            session_key=f"session-{index}", session_data="", expire_date=expire_date
+        )
+        for index in range(rows)
+    )
+
+
+def _seed(seeders: List[Callable[[int], None]], rows: int) -> None:
+    """Run seeders.
+
+    Args:
+    ----
+    seeders (List[Callable]): The functions inserting the rows of a table.
+    rows (int): The number of rows of each table.
+    """
+    for seeder in seeders:
+        seeder(rows)
+
+
+# The tables written before each reset: 1 table, then 3 with the groups and
+# the user groups, then 4 with the sessions.
+SEEDERS = [
+    [_seed_users],
+    [_seed_users, _seed_groups],
+    [_seed_users, _seed_groups, _seed_sessions],
+]
+TABLE_COUNTS = [1, 3, 4]
+
+
+def summarize(name: str, durations: List[float], **parameters: Any) -> Dict[str, Any]:
+    """Summarize the durations of the runs of a benchmark.
+
+    Args:
+    ----
+    name (str): The name of the benchmark.
+    durations (List[float]): The duration of each run, in seconds.
+    **parameters: The parameters of the benchmark.
+
+    Returns:
+    -------
+    Dict[str, Any]: The latency percentiles in milliseconds and the throughput
+    in requests per second.
+    """
+    milliseconds = sorted(duration * 1000 for duration in durations)
+
+    return {
+        "name": name,
+        "vendor": connection.vendor,
+        "parameters": parameters,
+        "runs": len(milliseconds),
+        "median_ms": round(statistics.median(milliseconds), 3),
+        "p95_ms": round(milliseconds[int(0.95 * (len(milliseconds) - 1))], 3),
+        "max_ms": round(milliseconds[-1], 3),
+        "throughput_rps": round(len(milliseconds) / (sum(milliseconds) / 1000), 1),
+    }
+
+
+def measure(
+    request: Callable[[], Any],
+    runs: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> List[float]:
+    """Time the runs of a request, after one untimed warm up run.
+
+    Args:
+    ----
+    request (Callable): The function sending the request.
+    runs (int): The number of timed runs.
+    setup (Optional[Callable]): The function run, untimed, before each run.
+
+    Returns:
+    -------
+    List[float]: The duration of each timed run, in seconds.
+    """
+    durations = []
+
+    for run in range(runs + 1):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        response = request()
+        duration = time.perf_counter() - start
+
+        if response.status_code >= 400:
+            raise AssertionError(
+                f"The benchmarked request failed with {response.status_code}: "
+                + response.content.decode()
+            )
+        if run > 0:
+            durations.append(duration)
+
+    return durations
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Hide the output of the management commands run by the endpoints."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def benchmark_csrftoken(client: Client, runs: int) -> List[Dict[str, Any]]:
+    """Benchmark the csrftoken endpoint.
+
+    Args:
+    ----
+    client (Client): The test client.
+    runs (int): The number of runs.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results.
+    """
+    durations = measure(lambda: client.get(reverse("csrftoken-view")), runs)
+
+    return [summarize("csrftoken", durations)]
+
+
+def benchmark_create_user(client: Client, runs: int) -> List[Dict[str, Any]]:
+    """Benchmark the createUser endpoint.
+
+    Args:
+    ----
+    client (Client): The test client.
+    runs (int): The number of runs.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results.
+    """
+    usernames = (f"benchmark-user-{index}" for index in range(runs + 1))
+    durations = measure(
+        lambda: client.post(
+            reverse("create-user-view"),
+            {"username": next(usernames), "password": "12345678"},
+            "application/json",
+        ),
+        runs,
+    )
+
+    return [summarize("createUser", durations)]
+
+
+def benchmark_refresh_database(client: Client, runs: int) -> List[Dict[str, Any]]:
+    """Benchmark the refreshDatabase endpoint of each mode.
+
+    The database is seeded before each reset with the rows of a number
+    of tables.
+
+    Args:
+    ----
+    client (Client): The test client.
+    runs (int): The number of runs.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results.
+    """
+    results = []
+
+    for mode in REFRESH_DATABASE_MODES:
+        with override_settings(DJANGO_CYPRESS_REFRESH_DATABASE_MODE=mode), quiet():
+            # The first reset of a mode captures its baseline of the empty database.
+            client.post(reverse("refresh-database-view"))
+
+            for index, seeders in enumerate(SEEDERS):
+                for rows in ROW_COUNTS:
+                    durations = measure(
+                        lambda: client.post(reverse("refresh-database-view")),
+                        runs,
+                        setup=functools.partial(_seed, seeders, rows),
+                    )
+                    results.append(
+                        summarize(
+                            "refreshDatabase",
+                            durations,
+                            mode=mode,
+                            tables=TABLE_COUNTS[index],
+                            rows=rows,
+                        )
+                    )
+
+    return results
+
+
+def benchmark_migrate(client: Client, runs: int) -> List[Dict[str, Any]]:
+    """Benchmark the migrate endpoint of a migrated database.
+
+    Args:
+    ----
+    client (Client): The test client.
+    runs (int): The number of runs.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results.
+    """
+    with quiet():
+        durations = measure(lambda: client.post(reverse("migrate-view")), runs)
+
+    return [summarize("migrate", durations)]
+
+
+def benchmark_manage(client: Client, runs: int) -> List[Dict[str, Any]]:
+    """Benchmark the manage endpoint with the check command.
+
+    Args:
+    ----
+    client (Client): The test client.
+    runs (int): The number of runs.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results.
+    """
+    with quiet():
+        durations = measure(
+            lambda: client.post(
+                reverse("manage-view"),
+                {"command": "check", "parameters": []},
+                "application/json",
+            ),
+            runs,
+        )
+
+    return [summarize("manage", durations, command="check")]
+
+
+BENCHMARKS = {
+    "csrftoken": benchmark_csrftoken,
+    "createUser": benchmark_create_user,
+    "refreshDatabase": benchmark_refresh_database,
+    "migrate": benchmark_migrate,
+    "manage": benchmark_manage,
+}
+
+
+def run_benchmarks(
+    runs: int, names: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Run the benchmarks.
+
+    Args:
+    ----
+    runs (int): The number of timed runs of each benchmark.
+    names (Optional[List[str]]): The names of the benchmarks, or None for all.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]: The results of every benchmark.
+    """
+    client = Client()
+    results = []
+
+    for name, benchmark in BENCHMARKS.items():
+        if names is None or name in names:
+            results.extend(benchmark(client, runs))
+
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Return the key identifying a result across runs.
+
+    Args:
+    ----
+    result (Dict[str, Any]): The result of a benchmark.
+
+    Returns:
+    -------
+    str: The name, the database vendor and the parameters of the benchmark.
+    """
+    parameters = ",".join(
+        f"{name}={value}" for name, value in sorted(result["parameters"].items())
+    )
+
+    return f"{result['name']}[{result['vendor']}]({parameters})"
+
+
+def find_regressions(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    threshold: float,
+    min_delta_ms: float,
+) -> List[str]:
+    """Compare the median latencies with a baseline.
+
+    Args:
+    ----
+    results (List[Dict[str, Any]]): The results of the benchmarks.
+    baseline (List[Dict[str, Any]]): The results of a previous run.
+    threshold (float): The tolerated slowdown, e.g. 0.2 for 20%.
+    min_delta_ms (float): The tolerated slowdown in milliseconds, which
+        ignores the noise of the fastest endpoints.
+
+    Returns:
+    -------
+    List[str]: A description of each regression.
+    """
+    baseline_medians = {result_key(result): result["median_ms"] for result in baseline}
+    regressions = []
+
+    for result in results:
+        baseline_median = baseline_medians.get(result_key(result))
+        if baseline_median is None:
+            continue
+
+        delta = result["median_ms"] - baseline_median
+        if delta > baseline_median * threshold and delta > min_delta_ms:
+            regressions.append(
+                f"{result_key(result)}: {result['median_ms']}ms, "
+                + f"{baseline_median}ms in the baseline"
+            )
+
+    return regressions
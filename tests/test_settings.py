@@ -1,3 +1,5 @@
+import os
+
 SECRET_KEY = "fake-key"
 INSTALLED_APPS = [
     "tests",
@@ -10,6 +12,24 @@ DATABASES = {
     }
 }
 
+if os.environ.get("DJANGO_CYPRESS_TEST_DATABASE") == "postgresql":
+    # The connection parameters are read from the PG* environment variables.
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("PGDATABASE", "django_cypress"),
+        }
+    }
+
 ROOT_URLCONF = "tests.urls"
 
-INSTALLED_APPS = ["django.contrib.contenttypes", "django.contrib.auth"]
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "django.contrib.sessions",
+    "django_cypress",
+]
+
+MIDDLEWARE = [
+    "django_cypress.middleware.TransactionIsolationMiddleware",
+]
@@ -1,12 +1,41 @@
+import importlib
+import io
 import json
+import os
+import tempfile
+import threading
+import time
 from http import HTTPStatus
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List, Tuple, Type
+from unittest import mock
 
-from django.contrib.auth.models import User
-from django.test import TestCase
-from django.test.client import Client
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import send_mail
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import Client, RequestFactory
 from django.urls import reverse
 
+from django_cypress import async_views, fingerprints, sharding, snapshots
+from django_cypress import urls as cypress_urls
+from django_cypress.auth import session_cache
+from django_cypress.factories import factories
+from django_cypress.fixtures import fixture_cache
+from django_cypress.isolation import transaction_isolation
+from django_cypress.management.commands import cypress_run
+from django_cypress.migration_cache import SQLiteMigrationCache
+from django_cypress.tracking import dirty_tables
+from django_cypress.workers import worker_databases
+
 
 class CSRFTokenViewTestCase(TestCase):
     """Test case for testing the CSRF token view."""
@@ -34,6 +63,59 @@ class CSRFTokenViewTestCase(TestCase):
         self.assertIsNotNone(csrf_token)
 
 
+class CSRFProtectionTestCase(TestCase):
+    """Test case for the CSRF protection of the views."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_reject_request_without_csrf_token(self) -> None:
+        """Do an HTTP POST request to the CreateUserView without a CSRF token.
+
+        Make sure that the HTTP Status Code of the response
+        is 403 and the user was not created.
+        """
+        path = reverse("create-user-view")
+
+        request_data = {"username": "django-user"}
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.FORBIDDEN
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        self.assertFalse(User.objects.exists())
+
+    @override_settings(DJANGO_CYPRESS_SECRET="cypress-secret")
+    def test_accept_request_with_secret(self) -> None:
+        """Do HTTP POST requests to the CreateUserView with a secret header.
+
+        Make sure that a request carrying the configured secret
+        is accepted without a CSRF token, while a request carrying
+        a wrong secret is rejected.
+        """
+        path = reverse("create-user-view")
+        content_type = "application/json"
+
+        response = self.client.post(
+            path,
+            {"username": "django-user"},
+            content_type,
+            HTTP_X_CYPRESS_SECRET="cypress-secret",
+        )
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+
+        response = self.client.post(
+            path,
+            {"username": "other-user"},
+            content_type,
+            HTTP_X_CYPRESS_SECRET="wrong-secret",
+        )
+        self.assertEqual(HTTPStatus.FORBIDDEN, response.status_code)
+
+
 class ManageViewTestCase(TestCase):
     """Test case for the Manage view."""
 
@@ -66,12 +148,262 @@ class ManageViewTestCase(TestCase):
         self.assertEqual(expected_status_code, actual_status_code)
 
 
+class LoadFixturesViewTestCase(TestCase):
+    """Test case for the LoadFixtures view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        self.directory = tempfile.TemporaryDirectory()
+        self.fixture = Path(self.directory.name) / "users.json"
+        self.write_fixture("cypress-group")
+
+    def tearDown(self) -> None:
+        """Remove the fixture and forget the parsed fixtures."""
+        fixture_cache.clear()
+        self.directory.cleanup()
+
+    def write_fixture(self, group_name: str) -> None:
+        """Write a fixture whose objects are not in dependency order.
+
+        Args:
+        ----
+        group_name (str): The name of the group of the fixture.
+        """
+        objects = [
+            {
+                "model": "auth.user",
+                "pk": 100,
+                "fields": {"username": "cypress-user", "password": "", "groups": [10]},
+            },
+            {
+                "model": "auth.permission",
+                "pk": 1000,
+                "fields": {
+                    "name": "Can test",
+                    "content_type": 1000,
+                    "codename": "test",
+                },
+            },
+            {"model": "auth.group", "pk": 10, "fields": {"name": group_name}},
+            {
+                "model": "contenttypes.contenttype",
+                "pk": 1000,
+                "fields": {"app_label": "cypress", "model": "test"},
+            },
+        ]
+        self.fixture.write_text(json.dumps(objects))
+
+    def load_fixtures(self) -> Dict:
+        """Load the fixture through the LoadFixturesView.
+
+        Returns
+        -------
+            Dict: The body of the response.
+        """
+        request_data = {"fixtures": [str(self.fixture)]}
+        response = self.client.post(
+            reverse("load-fixtures-view"), request_data, "application/json"
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code, response.content)
+
+        return json.loads(response.content)
+
+    def test_load_fixtures(self) -> None:
+        """Do HTTP POST requests to the LoadFixturesView twice.
+
+        Make sure that the objects and their relations are loaded, and that
+        the second load updates the rows without parsing the fixture again.
+        """
+        expected_counts = {"fixtures": 1, "objects": 4}
+        actual_counts = self.load_fixtures()
+        self.assertEqual(expected_counts, actual_counts)
+
+        expected_groups = ["cypress-group"]
+        actual_groups = list(
+            User.objects.get(pk=100).groups.values_list("name", flat=True)
+        )
+        self.assertEqual(expected_groups, actual_groups)
+        self.assertEqual(1000, Permission.objects.get(codename="test").content_type_id)
+
+        Group.objects.filter(pk=10).update(name="renamed-group")
+        with mock.patch("django_cypress.fixtures.serializers.deserialize") as parse:
+            self.load_fixtures()
+        parse.assert_not_called()
+
+        expected_group_name = "cypress-group"
+        actual_group_name = Group.objects.get(pk=10).name
+        self.assertEqual(expected_group_name, actual_group_name)
+
+    def test_load_fixtures_without_upserts(self) -> None:
+        """Do HTTP POST requests to the LoadFixturesView twice without upserts.
+
+        Make sure that the second load updates the rows when the database
+        cannot update the conflicting rows of a bulk insert.
+        """
+        with mock.patch.object(
+            connection.features, "supports_update_conflicts", False, create=True
+        ):
+            self.load_fixtures()
+            Group.objects.filter(pk=10).update(name="renamed-group")
+            self.load_fixtures()
+
+        expected_group_name = "cypress-group"
+        actual_group_name = Group.objects.get(pk=10).name
+        self.assertEqual(expected_group_name, actual_group_name)
+
+    def test_load_modified_fixtures(self) -> None:
+        """Do HTTP POST requests to the LoadFixturesView before and after a change.
+
+        Make sure that the modified fixture is parsed again.
+        """
+        self.load_fixtures()
+
+        self.write_fixture("modified-group")
+        stat = self.fixture.stat()
+        os.utime(self.fixture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.load_fixtures()
+
+        expected_group_name = "modified-group"
+        actual_group_name = Group.objects.get(pk=10).name
+        self.assertEqual(expected_group_name, actual_group_name)
+
+    def test_load_unknown_fixtures(self) -> None:
+        """Do an HTTP POST request to the LoadFixturesView with an unknown fixture.
+
+        Make sure that the HTTP Status Code of the response is 400.
+        """
+        request_data = {"fixtures": ["unknown-fixture"]}
+        response = self.client.post(
+            reverse("load-fixtures-view"), request_data, "application/json"
+        )
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
+class ManageViewBackgroundTestCase(TransactionTestCase):
+    """Test case for the Manage view running commands in the background."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def run_job(self, request_data: Dict) -> Dict:
+        """Start a background command and poll the JobView until it exits.
+
+        Args:
+        ----
+        request_data (Dict): The body of the request to the ManageView.
+
+        Returns:
+        -------
+        Dict: The final state of the job.
+        """
+        request_data = {**request_data, "background": True}
+        content_type = "application/json"
+        response = self.client.post(reverse("manage-view"), request_data, content_type)
+
+        expected_status_code = HTTPStatus.ACCEPTED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        path = reverse("job-view", args=[response.json()["job_id"]])
+        for _ in range(500):
+            job = self.client.get(path).json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.01)
+
+        self.fail("The background command did not exit.")
+
+    def test_run_background_command(self) -> None:
+        """Run the check command in the background.
+
+        Make sure that the job succeeds and that its output is captured.
+        """
+        job = self.run_job({"command": "check", "parameters": []})
+
+        expected_status = "succeeded"
+        actual_status = job["status"]
+        self.assertEqual(expected_status, actual_status)
+
+        self.assertIn("no issues", job["stdout"])
+        self.assertIsNotNone(job["duration"])
+
+    def test_run_failing_background_command(self) -> None:
+        """Run an unknown command in the background.
+
+        Make sure that the job fails and reports the error.
+        """
+        job = self.run_job({"command": "unknown-command", "parameters": []})
+
+        expected_status = "failed"
+        actual_status = job["status"]
+        self.assertEqual(expected_status, actual_status)
+
+        self.assertIn("unknown-command", job["error"])
+
+    def test_poll_running_background_command(self) -> None:
+        """Poll the JobView while the background command is still running.
+
+        Make sure that the JobView responds without waiting for the command.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def call_command(*args: str, **kwargs: str) -> None:
+            started.set()
+            release.wait(5)
+
+        request_data = {"command": "check", "parameters": [], "background": True}
+        content_type = "application/json"
+
+        with mock.patch(
+            "django_cypress.jobs.management.call_command", side_effect=call_command
+        ):
+            response = self.client.post(
+                reverse("manage-view"), request_data, content_type
+            )
+            started.wait(5)
+
+            start = time.monotonic()
+            path = reverse("job-view", args=[response.json()["job_id"]])
+            job = self.client.get(path).json()
+            duration = time.monotonic() - start
+
+            release.set()
+
+        expected_status = "running"
+        actual_status = job["status"]
+        self.assertEqual(expected_status, actual_status)
+
+        self.assertLess(duration, 1)
+
+    def test_unknown_job(self) -> None:
+        """Do an HTTP GET request to the JobView with an unknown ID.
+
+        Make sure that the HTTP Status Code of the response is 404.
+        """
+        response = self.client.get(reverse("job-view", args=["unknown"]))
+
+        expected_status_code = HTTPStatus.NOT_FOUND
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
 class MigrateViewTestCase(TestCase):
     """Test case for the Migrate view."""
 
     def setUp(self) -> None:
         """Set up the test case."""
         self.client = Client()
+        fingerprints.forget_migrated()
+
+    def tearDown(self) -> None:
+        """Forget the migration state remembered by the test."""
+        fingerprints.forget_migrated()
 
     def test_run_migrate_command(self) -> None:
         """Do an HTTP POST request to the MigrateView.
@@ -87,6 +419,35 @@ class MigrateViewTestCase(TestCase):
         actual_status_code = response.status_code
         self.assertEqual(expected_status_code, actual_status_code)
 
+    def test_skip_migrate_command_when_nothing_changed(self) -> None:
+        """Do two HTTP POST requests to the MigrateView.
+
+        Make sure that the first request runs the migrate
+        command and the second one skips it, because neither
+        the migration files nor the applied migrations changed.
+        """
+        path = reverse("migrate-view")
+
+        response = self.client.post(path)
+        self.assertEqual("migrated", json.loads(response.content)["action"])
+
+        response = self.client.post(path)
+        self.assertEqual("skipped", json.loads(response.content)["action"])
+
+    def test_run_migrate_command_when_applied_migrations_changed(self) -> None:
+        """Do two HTTP POST requests to the MigrateView.
+
+        Record an unknown applied migration between the requests
+        and make sure that the second request runs the migrate command.
+        """
+        path = reverse("migrate-view")
+        self.client.post(path)
+
+        MigrationRecorder(connection).record_applied("tests", "0001_initial")
+
+        response = self.client.post(path)
+        self.assertEqual("migrated", json.loads(response.content)["action"])
+
 
 class RefreshDatabaseViewTestCase(TestCase):
     """Test case for the Migrate view."""
@@ -114,62 +475,1647 @@ class RefreshDatabaseViewTestCase(TestCase):
         self.assertEqual(expected_users_count, actual_users_count)
 
 
-class CreateUserViewTestCase(TestCase):
-    """Test case for the CreateUser view."""
+class MigrateViewMigrationCacheTestCase(TransactionTestCase):
+    """Test case for the Migrate view with the migration cache."""
 
     def setUp(self) -> None:
         """Set up the test case."""
         self.client = Client()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            DJANGO_CYPRESS_MIGRATION_CACHE_DIR=self.directory.name
+        )
+        self.settings_override.enable()
+        fingerprints.forget_migrated()
 
-    def test_run_create_user_command_successfully(self) -> None:
-        """Do an HTTP POST request to the CreateUserView.
+    def tearDown(self) -> None:
+        """Remove the migration cache created by the test."""
+        fingerprints.forget_migrated()
+        self.settings_override.disable()
+        self.directory.cleanup()
 
-        Make sure that the HTTP Status Code of the response
-        is 201, that the response body is in this format.
-        {"success": True, "user_id": <user_id>} and the
-        user exists in the database.
+    def test_restore_cached_database(self) -> None:
+        """Do HTTP POST requests to the MigrateView.
+
+        The first request migrates the database and stores it in
+        the cache. Make sure that a database with the same applied
+        migrations is left as is, while a database with different
+        applied migrations is restored from the cache.
         """
-        path = reverse("create-user-view")
+        path = reverse("migrate-view")
 
-        request_data = {"username": "django-user", "password": "12345678"}
+        response = self.client.post(path)
+        self.assertEqual("migrated", json.loads(response.content)["action"])
+
+        fingerprints.forget_migrated()
+        response = self.client.post(path)
+        self.assertEqual("skipped", json.loads(response.content)["action"])
+
+        MigrationRecorder(connection).record_applied("tests", "0001_initial")
+        response = self.client.post(path)
+        self.assertEqual("restored", json.loads(response.content)["action"])
+
+        self.assertFalse(
+            MigrationRecorder.Migration.objects.filter(app="tests").exists()
+        )
+
+    def test_evict_least_recently_used_entries(self) -> None:
+        """Store three entries in a migration cache of size two.
+
+        Make sure that the least recently used entry is evicted.
+        """
+        cache = SQLiteMigrationCache(self.directory.name, size=2)
+
+        cache.store("first")
+        cache.store("second")
+        cache.restore("first")
+        cache.store("third")
+
+        self.assertTrue(cache.has("first"))
+        self.assertFalse(cache.has("second"))
+        self.assertTrue(cache.has("third"))
+
+
+class SnapshotViewsTestCase(TransactionTestCase):
+    """Test case for the SaveSnapshot and RestoreSnapshot views."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            DJANGO_CYPRESS_SNAPSHOT_DIR=self.directory.name
+        )
+        self.settings_override.enable()
+
+    def tearDown(self) -> None:
+        """Remove the snapshots saved by the test."""
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_refuse_shared_directory(self) -> None:
+        """Save a snapshot in a directory every user can write to.
+
+        Make sure that the snapshot store refuses the directory.
+        """
+        os.chmod(self.directory.name, 0o777)
+
+        with self.assertRaises(ImproperlyConfigured):
+            snapshots.get_snapshot_store().save("shared")
+
+    def test_save_and_restore_snapshot(self) -> None:
+        """Do HTTP POST requests to the snapshot views.
+
+        Save a snapshot containing one user, change the users and
+        restore the snapshot. Make sure that the users of the
+        snapshot are back and that an unknown snapshot is not restored.
+        """
         content_type = "application/json"
-        response = self.client.post(path, request_data, content_type)
+        User.objects.create(username="Snapshotuser")
 
-        expected_status_code = HTTPStatus.CREATED
+        response = self.client.post(
+            reverse("save-snapshot-view"), {"name": "one user"}, content_type
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        User.objects.all().delete()
+        User.objects.create(username="Testuser")
+
+        response = self.client.post(
+            reverse("restore-snapshot-view"), {"name": "one user"}, content_type
+        )
+        self.assertTrue(json.loads(response.content)["restored"])
+
+        expected_usernames = ["Snapshotuser"]
+        actual_usernames = list(User.objects.values_list("username", flat=True))
+        self.assertEqual(expected_usernames, actual_usernames)
+
+        response = self.client.post(
+            reverse("restore-snapshot-view"), {"name": "unknown"}, content_type
+        )
+        self.assertFalse(json.loads(response.content)["restored"])
+
+    def test_invalid_snapshot_requests(self) -> None:
+        """Do HTTP POST requests to the snapshot views that cannot succeed.
+
+        Make sure that a missing name and a shared directory are reported
+        with the 400 status code.
+        """
+        content_type = "application/json"
+
+        for view in ["save-snapshot-view", "restore-snapshot-view"]:
+            response = self.client.post(reverse(view), {}, content_type)
+            self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_code)
+            self.assertIn("error", json.loads(response.content))
+
+        os.chmod(self.directory.name, 0o777)
+
+        for view in ["save-snapshot-view", "restore-snapshot-view"]:
+            response = self.client.post(reverse(view), {"name": "shared"}, content_type)
+            self.assertEqual(HTTPStatus.BAD_REQUEST, response.status_code)
+            self.assertIn("error", json.loads(response.content))
+
+    def test_restore_snapshot_in_atomic_batch(self) -> None:
+        """Do an HTTP POST request to the BatchView with an atomic batch.
+
+        Create a user and restore a snapshot in the same transaction.
+        Make sure that the snapshot is restored.
+        """
+        snapshots.get_snapshot_store().save("empty")
+
+        request_data = {
+            "operations": [
+                {"name": "createUser", "body": {"username": "user"}},
+                {"name": "restoreSnapshot", "body": {"name": "empty"}},
+            ],
+            "atomic": True,
+        }
+        content_type = "application/json"
+        response = self.client.post(reverse("batch-view"), request_data, content_type)
+
+        expected_status_code = HTTPStatus.OK
         actual_status_code = response.status_code
         self.assertEqual(expected_status_code, actual_status_code)
 
-        expected_response = {"user_id": 1}
-        actual_response = json.loads(response.content)
-        self.assertEqual(expected_response, actual_response)
+        self.assertFalse(User.objects.exists())
 
-        new_user_exists = User.objects.filter(username="django-user").exists()
-        self.assertTrue(new_user_exists)
+    def test_discard_snapshot_after_migration_change(self) -> None:
+        """Save a snapshot and change the applied migrations.
 
-    def test_run_create_user_command_invalid_body(self) -> None:
-        """Do an HTTP POST request to the CreateUserView.
+        Make sure that the snapshot is not restored anymore.
+        """
+        store = snapshots.get_snapshot_store()
+        store.save("stale")
 
-        Make sure that the HTTP Status Code of the response
-        is 400, that the response body is in this format.
-        {"success": False, "error": <error>} and the
-        user does not exist in the database.
+        MigrationRecorder(connection).record_applied("tests", "0001_initial")
+
+        self.assertFalse(store.restore("stale"))
+
+    def test_evict_least_recently_used_snapshots(self) -> None:
+        """Save three snapshots in a store that fits two of them.
+
+        Make sure that the least recently used snapshot is evicted.
         """
-        path = reverse("create-user-view")
+        snapshot_size = 0
+        store = snapshots.SnapshotStore(self.directory.name)
+        store.save("size")
+        for path in Path(self.directory.name).glob("*.snapshot"):
+            snapshot_size = path.stat().st_size
 
-        # No username
-        request_data = {"password": "12345678"}
+        store = snapshots.SnapshotStore(
+            self.directory.name, max_size=int(snapshot_size * 2.5)
+        )
+        store.save("first")
+        store.save("second")
+        self.assertTrue(store.restore("first"))
+        store.save("third")
+
+        self.assertTrue(store.restore("first"))
+        self.assertFalse(store.restore("second"))
+        self.assertTrue(store.restore("third"))
+
+
+@override_settings(DJANGO_CYPRESS_REFRESH_DATABASE_MODE="snapshot")
+class RefreshDatabaseViewSnapshotModeTestCase(TransactionTestCase):
+    """Test case for the RefreshDatabase view in snapshot mode."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        snapshots.invalidate_baselines()
+
+    def tearDown(self) -> None:
+        """Discard the baseline and the test transaction of the test."""
+        transaction_isolation.rollback()
+        snapshots.invalidate_baselines()
+
+    def test_restore_snapshot(self) -> None:
+        """Do two HTTP POST requests to the RefreshDatabaseView.
+
+        The first request flushes the database and captures the
+        baseline snapshot, the second one restores it. Make sure
+        that both requests empty the users table while keeping
+        the content types created by the post_migrate signal.
+        """
+        path = reverse("refresh-database-view")
+
+        for _ in range(2):
+            User.objects.create(username="Testuser")
+
+            response = self.client.post(path)
+
+            expected_status_code = HTTPStatus.OK
+            actual_status_code = response.status_code
+            self.assertEqual(expected_status_code, actual_status_code)
+
+            expected_users_count = 0
+            actual_users_count = User.objects.all().count()
+            self.assertEqual(expected_users_count, actual_users_count)
+
+            self.assertTrue(ContentType.objects.exists())
+
+    def test_restore_snapshot_in_atomic_batch(self) -> None:
+        """Do an HTTP POST request to the BatchView with an atomic batch.
+
+        Create users and reset the database in the same transaction.
+        Make sure that the baseline is restored although SQLite refuses
+        to back up into a database with an open transaction.
+        """
+        self.client.post(reverse("refresh-database-view"))
+
+        request_data = {
+            "operations": [
+                {"name": "createUsers", "body": {"users": [{"username": "user"}]}},
+                {"name": "refreshDatabase"},
+            ],
+            "atomic": True,
+        }
         content_type = "application/json"
-        response = self.client.post(path, request_data, content_type)
+        response = self.client.post(reverse("batch-view"), request_data, content_type)
 
-        expected_status_code = HTTPStatus.BAD_REQUEST
+        expected_status_code = HTTPStatus.OK
         actual_status_code = response.status_code
         self.assertEqual(expected_status_code, actual_status_code)
 
-        actual_response: Dict = json.loads(response.content)
+        self.assertFalse(User.objects.exists())
+        self.assertTrue(ContentType.objects.exists())
 
-        # The response body contains the error message
-        self.assertTrue("error" in actual_response)
+    def test_restore_snapshot_in_test_transaction(self) -> None:
+        """Do HTTP POST requests inside a test transaction.
 
-        # User was not created
-        new_user_exists = User.objects.filter(username="django-user").exists()
-        self.assertFalse(new_user_exists)
+        Create users and reset the database after beginning the test
+        transaction. Make sure that the baseline is restored inside it.
+        """
+        self.client.post(reverse("refresh-database-view"))
+        self.client.post(reverse("begin-transaction-view"))
+
+        request_data = {"users": [{"username": "user"}]}
+        content_type = "application/json"
+        self.client.post(reverse("create-users-view"), request_data, content_type)
+
+        response = self.client.post(reverse("refresh-database-view"))
+
+        expected_status_code = HTTPStatus.OK
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        with transaction_isolation.pinned():
+            self.assertFalse(User.objects.exists())
+            self.assertTrue(ContentType.objects.exists())
+
+    def test_restore_table_snapshot(self) -> None:
+        """Capture and restore a TableSnapshot.
+
+        Make sure that the rows created after the capture are
+        removed and the captured ones are restored.
+        """
+        User.objects.create(username="Captureduser")
+
+        snapshot = snapshots.TableSnapshot()
+        snapshot.capture()
+
+        User.objects.all().delete()
+        User.objects.create(username="Testuser")
+        snapshot.restore()
+
+        expected_usernames = ["Captureduser"]
+        actual_usernames = list(User.objects.values_list("username", flat=True))
+        self.assertEqual(expected_usernames, actual_usernames)
+
+
+@override_settings(DJANGO_CYPRESS_REFRESH_DATABASE_MODE="dirty")
+class RefreshDatabaseViewDirtyModeTestCase(TransactionTestCase):
+    """Test case for the RefreshDatabase view in dirty mode."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        snapshots.invalidate_baselines()
+
+    def tearDown(self) -> None:
+        """Discard the baseline and the tracker installed by the test."""
+        snapshots.invalidate_baselines()
+        if dirty_tables in connection.execute_wrappers:
+            connection.execute_wrappers.remove(dirty_tables)
+
+    def test_restore_dirty_tables(self) -> None:
+        """Do two HTTP POST requests to the RefreshDatabaseView.
+
+        Make sure that the users table is tracked as dirty after
+        a user is created, and that the second request empties it
+        and resets its sequence while keeping the content types.
+        A group planted without being tracked must survive, which
+        shows that only the tracked tables are restored.
+        """
+        path = reverse("refresh-database-view")
+        self.client.post(path)
+
+        User.objects.create(username="Testuser")
+        Group.objects.create(name="untracked-group")
+        self.assertIn("auth_user", dirty_tables.pop("default") or set())
+        dirty_tables.add("default", {"auth_user"})
+
+        response = self.client.post(path)
+
+        expected_status_code = HTTPStatus.OK
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_users_count = 0
+        actual_users_count = User.objects.all().count()
+        self.assertEqual(expected_users_count, actual_users_count)
+
+        self.assertTrue(ContentType.objects.exists())
+
+        expected_group_names = ["untracked-group"]
+        actual_group_names = list(Group.objects.values_list("name", flat=True))
+        self.assertEqual(expected_group_names, actual_group_names)
+
+        expected_user_id = 1
+        actual_user_id = User.objects.create(username="Testuser").pk
+        self.assertEqual(expected_user_id, actual_user_id)
+
+
+class CreateUserViewTestCase(TestCase):
+    """Test case for the CreateUser view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def test_run_create_user_command_successfully(self) -> None:
+        """Do an HTTP POST request to the CreateUserView.
+
+        Make sure that the HTTP Status Code of the response
+        is 201, that the response body is in this format.
+        {"success": True, "user_id": <user_id>} and the
+        user exists in the database.
+        """
+        path = reverse("create-user-view")
+
+        request_data = {"username": "django-user", "password": "12345678"}
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.CREATED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_response = {"user_id": 1}
+        actual_response = json.loads(response.content)
+        self.assertEqual(expected_response, actual_response)
+
+        new_user_exists = User.objects.filter(username="django-user").exists()
+        self.assertTrue(new_user_exists)
+
+    def test_run_create_user_command_invalid_body(self) -> None:
+        """Do an HTTP POST request to the CreateUserView.
+
+        Make sure that the HTTP Status Code of the response
+        is 400, that the response body is in this format.
+        {"success": False, "error": <error>} and the
+        user does not exist in the database.
+        """
+        path = reverse("create-user-view")
+
+        # No username
+        request_data = {"password": "12345678"}
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        actual_response: Dict = json.loads(response.content)
+
+        # The response body contains the error message
+        self.assertTrue("error" in actual_response)
+
+        # User was not created
+        new_user_exists = User.objects.filter(username="django-user").exists()
+        self.assertFalse(new_user_exists)
+
+
+class TransactionViewsTestCase(TransactionTestCase):
+    """Test case for the BeginTransaction and RollbackTransaction views."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def tearDown(self) -> None:
+        """Roll back the test transaction if a test left it open."""
+        transaction_isolation.rollback()
+
+    def test_rollback_transaction(self) -> None:
+        """Do HTTP POST requests to the transaction views.
+
+        Open a test transaction, create a user through the
+        CreateUserView and roll the transaction back. Make sure
+        that the user existed inside the transaction and that
+        the database is empty after the rollback.
+        """
+        response = self.client.post(reverse("begin-transaction-view"))
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertTrue(transaction_isolation.is_active)
+
+        request_data = {"username": "django-user", "password": "12345678"}
+        content_type = "application/json"
+        response = self.client.post(
+            reverse("create-user-view"), request_data, content_type
+        )
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+
+        with transaction_isolation.pinned():
+            self.assertTrue(User.objects.filter(username="django-user").exists())
+
+        response = self.client.post(reverse("rollback-transaction-view"))
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertFalse(transaction_isolation.is_active)
+
+        expected_users_count = 0
+        actual_users_count = User.objects.all().count()
+        self.assertEqual(expected_users_count, actual_users_count)
+
+    def test_pinned_without_test_transaction(self) -> None:
+        """Use the shared connection from two threads without a test transaction.
+
+        Make sure that a thread does not wait for the other one.
+        """
+        pinned = threading.Event()
+        done = threading.Event()
+
+        def hold_connection() -> None:
+            with transaction_isolation.pinned():
+                pinned.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=hold_connection)
+        thread.start()
+        pinned.wait(5)
+
+        start = time.monotonic()
+        with transaction_isolation.pinned():
+            duration = time.monotonic() - start
+        done.set()
+        thread.join()
+
+        self.assertLess(duration, 1)
+
+
+class WaitForViewTestCase(TransactionTestCase):
+    """Test case for the WaitFor view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def tearDown(self) -> None:
+        """Roll back the test transaction if a test left it open."""
+        transaction_isolation.rollback()
+
+    def create_user_later(self) -> threading.Thread:
+        """Create a user through the CreateUserView from another thread.
+
+        Returns
+        -------
+            threading.Thread: The thread creating the user.
+        """
+
+        def create_user() -> None:
+            time.sleep(0.2)
+            Client().post(
+                reverse("create-user-view"),
+                {"username": "late-user", "password": "12345678"},
+                "application/json",
+            )
+            connection.close()
+
+        thread = threading.Thread(target=create_user)
+        thread.start()
+
+        return thread
+
+    def wait_for_user(self, timeout: int) -> Tuple[int, Dict]:
+        """Do an HTTP POST request to the WaitForView for the late user.
+
+        Args:
+        ----
+        timeout (int): The timeout in milliseconds.
+
+        Returns:
+        -------
+        Tuple[int, Dict]: The HTTP Status Code and the body of the response.
+        """
+        request_data = {
+            "model": "auth.User",
+            "filter": {"username": "late-user"},
+            "count": 1,
+            "timeout": timeout,
+        }
+        response = self.client.post(
+            reverse("wait-for-view"), request_data, "application/json"
+        )
+
+        return response.status_code, response.json()
+
+    def test_wait_for_rows(self) -> None:
+        """Do an HTTP POST request to the WaitForView before the row is written.
+
+        Make sure that the request returns once the row exists.
+        """
+        thread = self.create_user_later()
+        _, actual_response = self.wait_for_user(timeout=5000)
+        thread.join()
+
+        expected_response = {"success": True, "count": 1}
+        self.assertEqual(expected_response, actual_response)
+
+    def test_wait_for_rows_in_test_transaction(self) -> None:
+        """Do an HTTP POST request to the WaitForView inside a test transaction.
+
+        Make sure that the shared connection is released while waiting, so
+        the other request can write the row.
+        """
+        self.client.post(reverse("begin-transaction-view"))
+
+        thread = self.create_user_later()
+        actual_status_code, _ = self.wait_for_user(timeout=5000)
+        thread.join()
+
+        expected_status_code = HTTPStatus.OK
+        self.assertEqual(expected_status_code, actual_status_code)
+
+    def test_timeout(self) -> None:
+        """Do an HTTP POST request to the WaitForView for a row never written.
+
+        Make sure that the HTTP Status Code of the response is 408.
+        """
+        actual_status_code, body = self.wait_for_user(timeout=100)
+
+        expected_status_code = HTTPStatus.REQUEST_TIMEOUT
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_count = 0
+        actual_count = body["count"]
+        self.assertEqual(expected_count, actual_count)
+
+    def test_zero_timeout(self) -> None:
+        """Do an HTTP POST request to the WaitForView with a zero timeout.
+
+        Make sure that the rows are checked once without waiting.
+        """
+        start = time.monotonic()
+        actual_status_code, _ = self.wait_for_user(timeout=0)
+        duration = time.monotonic() - start
+
+        expected_status_code = HTTPStatus.REQUEST_TIMEOUT
+        self.assertEqual(expected_status_code, actual_status_code)
+        self.assertLess(duration, 1)
+
+    def test_invalid_timeout(self) -> None:
+        """Do an HTTP POST request to the WaitForView with an invalid timeout.
+
+        Make sure that the HTTP Status Code of the response is 400.
+        """
+        request_data = {"model": "auth.User", "timeout": "abc"}
+        response = self.client.post(
+            reverse("wait-for-view"), request_data, "application/json"
+        )
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
+class BatchViewTestCase(TestCase):
+    """Test case for the Batch view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def test_run_batch(self) -> None:
+        """Do an HTTP POST request to the BatchView.
+
+        Run a refreshDatabase and two createUser operations in
+        one request. Make sure that the HTTP Status Code of the
+        response is 200, that the response contains the result
+        of each operation and the users exist in the database.
+        """
+        User.objects.create(username="Testuser")
+
+        path = reverse("batch-view")
+        request_data = {
+            "operations": [
+                {"name": "refreshDatabase"},
+                {"name": "createUser", "body": {"username": "first-user"}},
+                {"name": "createUser", "body": {"username": "second-user"}},
+            ]
+        }
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.OK
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_statuses = [HTTPStatus.OK, HTTPStatus.CREATED, HTTPStatus.CREATED]
+        actual_statuses = [
+            result["status"] for result in json.loads(response.content)["results"]
+        ]
+        self.assertEqual(expected_statuses, actual_statuses)
+
+        expected_usernames = ["first-user", "second-user"]
+        actual_usernames = list(
+            User.objects.order_by("id").values_list("username", flat=True)
+        )
+        self.assertEqual(expected_usernames, actual_usernames)
+
+    def test_run_atomic_batch_with_failing_operation(self) -> None:
+        """Do an HTTP POST request to the BatchView.
+
+        Run an atomic batch whose second operation fails. Make sure
+        that the HTTP Status Code of the response is 400, that the
+        batch stopped at the failing operation and that the first
+        operation was rolled back.
+        """
+        path = reverse("batch-view")
+        request_data = {
+            "operations": [
+                {"name": "createUser", "body": {"username": "django-user"}},
+                {"name": "createUser", "body": {"password": "12345678"}},
+                {"name": "createUser", "body": {"username": "other-user"}},
+            ],
+            "atomic": True,
+        }
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_results_count = 2
+        actual_results_count = len(json.loads(response.content)["results"])
+        self.assertEqual(expected_results_count, actual_results_count)
+
+        self.assertFalse(User.objects.exists())
+
+    def test_login_in_batch(self) -> None:
+        """Do an HTTP POST request to the BatchView with a login operation.
+
+        Make sure that the session cookie of the login is set on the
+        response of the batch.
+        """
+        path = reverse("batch-view")
+        request_data = {
+            "operations": [{"name": "login", "body": {"username": "cypress-user"}}]
+        }
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.OK
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+class AssertViewTestCase(TestCase):
+    """Test case for the Assert view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+        group = Group.objects.create(name="customers")
+        User.objects.create(username="first-user", is_staff=True).groups.add(group)
+        User.objects.create(username="second-user").groups.add(group)
+
+    def post_checks(self, checks: list) -> Dict:
+        """Do an HTTP POST request to the AssertView.
+
+        Args:
+        ----
+        checks (list): The checks.
+
+        Returns:
+        -------
+        Dict: The body of the response.
+        """
+        response = self.client.post(
+            reverse("assert-view"), {"checks": checks}, "application/json"
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        return json.loads(response.content)
+
+    def test_passing_checks(self) -> None:
+        """Do an HTTP POST request to the AssertView with passing checks.
+
+        Make sure that every check passed and that the checks of a model
+        share a single query.
+        """
+        checks = [
+            {"model": "auth.User", "filter": {"username": "first-user"}},
+            {"model": "auth.User", "filter": {"groups__name": "customers"}, "count": 2},
+            {
+                "model": "auth.User",
+                "filter": {"is_staff": True},
+                "values": {"username": "first-user"},
+            },
+            {"model": "auth.Group", "filter": {"name": "admins"}, "exists": False},
+        ]
+
+        with self.assertNumQueries(2):
+            response = self.post_checks(checks)
+
+        expected_results = [True, True, True, True]
+        actual_results = [result["passed"] for result in response["results"]]
+        self.assertEqual(expected_results, actual_results)
+        self.assertTrue(response["passed"])
+
+    def test_failing_checks(self) -> None:
+        """Do an HTTP POST request to the AssertView with failing checks.
+
+        Make sure that each failure is reported with its actual value or error.
+        """
+        checks = [
+            {"model": "auth.User", "count": 3},
+            {"model": "auth.User", "values": {"is_staff": True}},
+            {"model": "auth.User", "filter": {"unknown": 1}},
+            {"model": "shop.Unknown"},
+        ]
+        response = self.post_checks(checks)
+        results = response["results"]
+
+        self.assertFalse(response["passed"])
+
+        expected_count_result = {"passed": False, "expected": 3, "actual": 2}
+        actual_count_result = {key: results[0][key] for key in expected_count_result}
+        self.assertEqual(expected_count_result, actual_count_result)
+
+        expected_values = [{"is_staff": True}, {"is_staff": False}]
+        actual_values = results[1]["actual"]
+        self.assertEqual(expected_values, actual_values)
+
+        self.assertIn("error", results[2])
+        self.assertIn("error", results[3])
+
+    def test_failing_values_check_with_lookups(self) -> None:
+        """Do an HTTP POST request to the AssertView with a values lookup.
+
+        Make sure that the actual rows are read without the lookups.
+        """
+        checks = [{"model": "auth.User", "values": {"username__startswith": "Z"}}]
+        response = self.post_checks(checks)
+        result = response["results"][0]
+
+        self.assertFalse(result["passed"])
+        self.assertNotIn("error", result)
+
+        expected_fields = {"username"}
+        actual_fields = {field for row in result["actual"] for field in row}
+        self.assertEqual(expected_fields, actual_fields)
+
+
+class LoginViewTestCase(TestCase):
+    """Test case for the Login view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def tearDown(self) -> None:
+        """Forget the sessions of the test case."""
+        session_cache.clear()
+
+    def login(self) -> Dict:
+        """Log the Cypress user in through the LoginView.
+
+        Returns
+        -------
+            Dict: The body of the response.
+        """
+        request_data = {"username": "cypress-user", "password": "12345678"}
+        response = self.client.post(
+            reverse("login-view"), request_data, "application/json"
+        )
+        self.assertEqual(HTTPStatus.OK, response.status_code, response.content)
+
+        return json.loads(response.content)
+
+    def test_login(self) -> None:
+        """Do HTTP POST requests to the LoginView twice.
+
+        Make sure that the user is created once, that the client is logged in
+        and that the session is reused by the second login.
+        """
+        response = self.login()
+        self.assertTrue(response["created"])
+
+        user = User.objects.get(username="cypress-user")
+        self.assertTrue(user.check_password("12345678"))
+
+        expected_user_id = str(user.pk)
+        actual_user_id = self.client.session["_auth_user_id"]
+        self.assertEqual(expected_user_id, actual_user_id)
+
+        session_key = self.client.session.session_key
+        response = self.login()
+        self.assertFalse(response["created"])
+
+        expected_session_key = session_key
+        actual_session_key = self.client.session.session_key
+        self.assertEqual(expected_session_key, actual_session_key)
+
+    def test_login_after_password_change(self) -> None:
+        """Do HTTP POST requests to the LoginView before and after a password change.
+
+        Make sure that the session invalidated by the change is not reused.
+        """
+        self.login()
+        session_key = self.client.session.session_key
+
+        user = User.objects.get(username="cypress-user")
+        user.set_password("new-password")
+        user.save()
+        self.login()
+
+        self.assertNotEqual(session_key, self.client.session.session_key)
+
+
+class CreateUsersViewTestCase(TestCase):
+    """Test case for the CreateUsers view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def test_run_create_users_command_successfully(self) -> None:
+        """Do an HTTP POST request to the CreateUsersView.
+
+        Make sure that the HTTP Status Code of the response
+        is 201, that the response body contains the IDs of
+        the new users and that their passwords are usable.
+        """
+        path = reverse("create-users-view")
+
+        request_data = {
+            "users": [
+                {"username": "first-user", "password": "12345678"},
+                {"username": "second-user", "password": "12345678"},
+                {"username": "third-user"},
+            ]
+        }
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.CREATED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_user_ids = list(
+            User.objects.order_by("id").values_list("id", flat=True)
+        )
+        actual_user_ids = json.loads(response.content)["user_ids"]
+        self.assertEqual(expected_user_ids, actual_user_ids)
+        self.assertEqual(3, len(actual_user_ids))
+
+        self.assertTrue(
+            User.objects.get(username="first-user").check_password("12345678")
+        )
+        self.assertFalse(User.objects.get(username="third-user").has_usable_password())
+
+    @override_settings(
+        DJANGO_CYPRESS_PASSWORD_HASHER="md5",
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ],
+    )
+    def test_run_create_users_command_with_fast_hasher(self) -> None:
+        """Do an HTTP POST request to the CreateUsersView with a fast hasher.
+
+        Make sure that the passwords are hashed with the
+        configured hasher and can still be checked.
+        """
+        path = reverse("create-users-view")
+
+        request_data = {"users": [{"username": "django-user", "password": "12345678"}]}
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.CREATED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        user = User.objects.get(username="django-user")
+        self.assertTrue(user.password.startswith("md5$"))
+        self.assertTrue(user.check_password("12345678"))
+
+    def test_run_create_users_command_invalid_body(self) -> None:
+        """Do an HTTP POST request to the CreateUsersView with an unknown field.
+
+        Make sure that the HTTP Status Code of the response
+        is 400 and that no user was created.
+        """
+        path = reverse("create-users-view")
+
+        request_data = {"users": [{"username": "django-user", "unknown": "field"}]}
+        content_type = "application/json"
+        response = self.client.post(path, request_data, content_type)
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        self.assertFalse(User.objects.exists())
+
+
+class SeedViewTestCase(TestCase):
+    """Test case for the Seed view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def tearDown(self) -> None:
+        """Unregister the factories of the test case."""
+        factories.unregister("auth.Group")
+
+    def test_seed_with_overrides(self) -> None:
+        """Do an HTTP POST request to the SeedView for a model without a factory.
+
+        Make sure that the HTTP Status Code of the response is 201 and
+        that the rows are built from the overrides.
+        """
+        request_data = {
+            "model": "auth.User",
+            "count": 3,
+            "overrides": {"username": "user-{n}", "is_staff": True},
+        }
+        response = self.client.post(
+            reverse("seed-view"), request_data, "application/json"
+        )
+
+        expected_status_code = HTTPStatus.CREATED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        expected_pks = list(User.objects.order_by("pk").values_list("pk", flat=True))
+        actual_pks = json.loads(response.content)["pks"]
+        self.assertEqual(expected_pks, actual_pks)
+
+        expected_users = [("user-0", True), ("user-1", True), ("user-2", True)]
+        actual_users = list(
+            User.objects.order_by("pk").values_list("username", "is_staff")
+        )
+        self.assertEqual(expected_users, actual_users)
+
+    def test_seed_with_factory(self) -> None:
+        """Do an HTTP POST request to the SeedView for a model with a factory.
+
+        Make sure that the rows are built by the factory in batches.
+        """
+        factories.register(
+            "auth.Group",
+            lambda model, index, **overrides: model(name=f"group-{index}", **overrides),
+        )
+
+        request_data = {"model": "auth.Group", "count": 2500, "batch_size": 1000}
+        response = self.client.post(
+            reverse("seed-view"), request_data, "application/json"
+        )
+
+        expected_pks_count = 2500
+        actual_pks_count = len(json.loads(response.content)["pks"])
+        self.assertEqual(expected_pks_count, actual_pks_count)
+        self.assertTrue(Group.objects.filter(name="group-2499").exists())
+
+    def test_seed_unknown_model(self) -> None:
+        """Do an HTTP POST request to the SeedView for an unknown model.
+
+        Make sure that the HTTP Status Code of the response is 400.
+        """
+        request_data = {"model": "shop.Unknown"}
+        response = self.client.post(
+            reverse("seed-view"), request_data, "application/json"
+        )
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
+@override_settings(DJANGO_CYPRESS_SECRET="cypress-secret")
+class AsyncViewsTestCase(TransactionTestCase):
+    """Test case for the asynchronous variants of the views."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.factory = RequestFactory()
+
+    def dispatch(
+        self, view_class: Type[async_views.AsyncViewMixin], request: HttpRequest
+    ) -> HttpResponseBase:
+        """Dispatch a request to an asynchronous view from synchronous code.
+
+        Args:
+        ----
+        view_class (Type[AsyncViewMixin]): The class of the view.
+        request (HttpRequest): The request.
+
+        Returns:
+        -------
+        HttpResponseBase: The response of the view.
+        """
+        view = view_class()
+        view.setup(request)
+
+        return async_to_sync(view.dispatch)(request)
+
+    def test_create_user_in_thread_pool(self) -> None:
+        """Call the asynchronous CreateUserView.
+
+        Make sure that the view is asynchronous, that the user is
+        created and that the handler ran in the thread pool.
+        """
+        self.assertTrue(async_views.CreateUserView.view_is_async)
+
+        request = self.factory.post(
+            "/",
+            {"username": "django-user", "password": "12345678"},
+            content_type="application/json",
+            HTTP_X_CYPRESS_SECRET="cypress-secret",
+        )
+        response = self.dispatch(async_views.CreateUserView, request)
+
+        expected_status_code = HTTPStatus.CREATED
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+        self.assertTrue(User.objects.filter(username="django-user").exists())
+        self.assertIn(
+            "django-cypress",
+            [thread.name.split("_")[0] for thread in threading.enumerate()],
+        )
+
+    def test_csrf_protection(self) -> None:
+        """Call the asynchronous RefreshDatabaseView without a secret.
+
+        Make sure that the CSRF check still rejects the request.
+        """
+        request = self.factory.post("/")
+        response = self.dispatch(async_views.RefreshDatabaseView, request)
+
+        expected_status_code = HTTPStatus.FORBIDDEN
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+    @override_settings(DJANGO_CYPRESS_ASYNC_VIEWS=True)
+    def test_reject_django_without_async_views(self) -> None:
+        """Enable the asynchronous views on Django 4.0.
+
+        Make sure that the URLconf refuses them, because Django 4.0 cannot
+        serve asynchronous class-based views.
+        """
+        with mock.patch("django.VERSION", (4, 0, 0, "final", 0)):
+            with self.assertRaises(ImproperlyConfigured):
+                importlib.reload(cypress_urls)
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "django_cypress.middleware.WorkerDatabaseMiddleware",
+        "django_cypress.middleware.TransactionIsolationMiddleware",
+    ]
+)
+class WorkerDatabaseMiddlewareTestCase(TransactionTestCase):
+    """Test case for the WorkerDatabase middleware."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def tearDown(self) -> None:
+        """Forget the databases of the workers created by the test."""
+        worker_databases.reset()
+
+    def test_isolate_workers(self) -> None:
+        """Create a user as one worker and refresh the database as another one.
+
+        Make sure that the user is created in the database of the first
+        worker only, and that the refresh of the second worker keeps it.
+        """
+        request_data = {"username": "django-user", "password": "12345678"}
+        content_type = "application/json"
+        response = self.client.post(
+            reverse("create-user-view"),
+            request_data,
+            content_type,
+            HTTP_X_CYPRESS_WORKER="first",
+        )
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+
+        self.client.cookies["cypress_worker"] = "second"
+        response = self.client.post(reverse("refresh-database-view"))
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+
+        self.assertFalse(User.objects.exists())
+        self.assertTrue(User.objects.using("default_worker_first").exists())
+        self.assertFalse(User.objects.using("default_worker_second").exists())
+
+    def test_reject_invalid_worker(self) -> None:
+        """Do an HTTP POST request with an invalid worker ID.
+
+        Make sure that the HTTP Status Code of the response is 400.
+        """
+        response = self.client.post(
+            reverse("refresh-database-view"), HTTP_X_CYPRESS_WORKER="../first"
+        )
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
+class ShardingTestCase(TestCase):
+    """Test case for splitting the Cypress specs into shards."""
+
+    def test_split_specs(self) -> None:
+        """Find the specs of a directory and split them into two shards.
+
+        Make sure that every spec file is found, that the other files
+        are ignored and that the shards are balanced.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["a.cy.js", "b.cy.ts", "users/c.cy.js", "helpers.js"]:
+                path = Path(directory, name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.touch()
+
+            specs = sharding.find_specs(directory)
+            shards = sharding.split_specs(specs, 2)
+
+        expected_specs = ["a.cy.js", "b.cy.ts", "users/c.cy.js"]
+        actual_specs = [spec.relative_to(directory).as_posix() for spec in specs]
+        self.assertEqual(expected_specs, actual_specs)
+
+        expected_shard_sizes = [2, 1]
+        actual_shard_sizes = [len(shard) for shard in shards]
+        self.assertEqual(expected_shard_sizes, actual_shard_sizes)
+
+        expected_shards_count = 1
+        actual_shards_count = len(sharding.split_specs(specs[:1], 4))
+        self.assertEqual(expected_shards_count, actual_shards_count)
+
+    def test_split_specs_by_timings(self) -> None:
+        """Split specs with recorded durations into two shards.
+
+        Make sure that the long spec gets a shard of its own and that
+        a spec without duration counts as the average duration.
+        """
+        specs = [Path(f"cypress/e2e/{name}.cy.js") for name in "abcd"]
+        timings = {
+            "cypress/e2e/a.cy.js": 100.0,
+            "cypress/e2e/b.cy.js": 10.0,
+            "cypress/e2e/c.cy.js": 10.0,
+        }
+
+        shards = sharding.split_specs(specs, 2, timings)
+
+        expected_shards = [specs[:1], specs[1:]]
+        actual_shards = shards
+        self.assertEqual(expected_shards, actual_shards)
+
+    def test_split_absolute_specs_by_timings(self) -> None:
+        """Split specs given by absolute path into two shards.
+
+        Make sure that they match the durations recorded relative to the
+        Cypress project root.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            specs = [root / f"cypress/e2e/{name}.cy.js" for name in "abcd"]
+            timings = {
+                "cypress/e2e/a.cy.js": 100.0,
+                "cypress/e2e/b.cy.js": 10.0,
+                "cypress/e2e/c.cy.js": 10.0,
+            }
+
+            shards = sharding.split_specs(specs, 2, timings, root)
+
+            expected_shards = [specs[:1], specs[1:]]
+            actual_shards = shards
+            self.assertEqual(expected_shards, actual_shards)
+
+    def test_merge_timings(self) -> None:
+        """Merge the timings files of two shards.
+
+        Make sure that the merged file holds the durations of both
+        shards and that the files of the shards are deleted.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "timings.json")
+            sources = [
+                Path(directory, f"timings.shard{index}.json") for index in range(2)
+            ]
+            path.write_text(json.dumps({"a.cy.js": 1.0, "b.cy.js": 2.0}))
+            sources[0].write_text(json.dumps({"b.cy.js": 3.0}))
+            sources[1].write_text(json.dumps({"c.cy.js": 4.0}))
+
+            sharding.merge_timings(str(path), [str(source) for source in sources])
+
+            expected_timings = {"a.cy.js": 1.0, "b.cy.js": 3.0, "c.cy.js": 4.0}
+            actual_timings = sharding.load_timings(str(path))
+            self.assertEqual(expected_timings, actual_timings)
+
+            self.assertFalse(any(source.exists() for source in sources))
+
+    def test_invalid_shard_count(self) -> None:
+        """Run the cypress_run command without any shard.
+
+        Make sure that the command fails before running anything.
+        """
+        with self.assertRaisesMessage(CommandError, "--shards must be at least 1."):
+            call_command("cypress_run", "--shards", "0")
+
+    def test_terminate_started_shards(self) -> None:
+        """Run the Cypress processes when the second one cannot be started.
+
+        Make sure that the first process is terminated and waited for.
+        """
+        process = mock.Mock(stdout=io.StringIO(""))
+        options = {"timings": "timings.json", "port": 8001, "cypress_args": []}
+
+        with mock.patch(
+            "django_cypress.management.commands.cypress_run.subprocess.Popen",
+            side_effect=[process, OSError("npx not found")],
+        ):
+            with self.assertRaises(OSError):
+                cypress_run.Command()._run_cypress(
+                    [[Path("first.cy.js")], [Path("second.cy.js")]], options
+                )
+
+        process.terminate.assert_called_once_with()
+        process.wait.assert_called_once_with()
+
+
+class InstrumentationTestCase(TestCase):
+    """Test case for the timing of the views and the Stats view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        self.client.delete(reverse("stats-view"))
+
+    def test_timing(self) -> None:
+        """Do HTTP POST requests to the CreateUsersView.
+
+        Make sure that the Server-Timing header is always sent and that
+        the timing block breaks down the phases only when it is requested.
+        """
+        path = reverse("create-users-view")
+        request_data = {"users": [{"username": "first-user", "password": "1234"}]}
+        content_type = "application/json"
+
+        response = self.client.post(path, request_data, content_type)
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertIn("hash_passwords;dur=", response["Server-Timing"])
+        self.assertNotIn("timing", json.loads(response.content))
+
+        request_data = {"users": [{"username": "second-user", "password": "1234"}]}
+        response = self.client.post(
+            path, request_data, content_type, HTTP_X_CYPRESS_TIMING="true"
+        )
+        timing = json.loads(response.content)["timing"]
+
+        expected_phases = ["total", "hash_passwords", "insert"]
+        actual_phases = list(timing)
+        self.assertEqual(expected_phases, actual_phases)
+
+        self.assertGreater(timing["insert"]["queries"], 0)
+        self.assertGreaterEqual(timing["total"]["queries"], timing["insert"]["queries"])
+
+    def test_batch_timing(self) -> None:
+        """Do an HTTP POST request to the BatchView running createUsers twice.
+
+        Make sure that the phases of each operation are reported separately.
+        """
+        request_data = {
+            "operations": [
+                {"name": "createUsers", "body": {"users": [{"username": "first"}]}},
+                {"name": "createUsers", "body": {"users": [{"username": "second"}]}},
+            ]
+        }
+        response = self.client.post(
+            reverse("batch-view"),
+            request_data,
+            "application/json",
+            HTTP_X_CYPRESS_TIMING="true",
+        )
+        timing = json.loads(response.content)["timing"]
+
+        self.assertNotIn("insert", timing)
+        for operation in ["createUsers", "createUsers-2"]:
+            self.assertIn(operation, timing)
+            self.assertGreater(timing[f"{operation}.insert"]["queries"], 0)
+        self.assertIn("createUsers-2.insert;dur=", response["Server-Timing"])
+
+    def test_stats(self) -> None:
+        """Do HTTP requests to the CSRFTokenView and the StatsView.
+
+        Make sure that the requests are counted in the histogram of
+        their endpoint and that an HTTP DELETE request resets them.
+        """
+        for _ in range(3):
+            self.client.get(reverse("csrftoken-view"))
+
+        response = self.client.get(reverse("stats-view"))
+        stats = json.loads(response.content)["endpoints"]["CSRFTokenView"]
+
+        expected_count = 3
+        actual_count = stats["count"]
+        self.assertEqual(expected_count, actual_count)
+
+        expected_histogram_count = 3
+        actual_histogram_count = sum(stats["histogram"].values())
+        self.assertEqual(expected_histogram_count, actual_histogram_count)
+
+        self.client.delete(reverse("stats-view"))
+        response = self.client.get(reverse("stats-view"))
+        self.assertNotIn("CSRFTokenView", json.loads(response.content)["endpoints"])
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "django_cypress.middleware.TransactionIsolationMiddleware",
+        "django_cypress.middleware.QueryCaptureMiddleware",
+    ]
+)
+class QueryCaptureTestCase(TestCase):
+    """Test case for the QueryCapture middleware and the Queries view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        self.client.delete(reverse("queries-view"))
+
+    def test_capture_queries(self) -> None:
+        """Do an HTTP GET request to a view running one query per user.
+
+        Make sure that the queries of the request are captured under
+        its ID and that the query run per user is reported as duplicated.
+        """
+        for username in ["first-user", "second-user", "third-user"]:
+            User.objects.create(username=username)
+
+        response = self.client.get(reverse("users"), HTTP_X_CYPRESS_REQUEST_ID="users")
+        self.assertEqual("users", response["X-Cypress-Request-Id"])
+
+        response = self.client.get(reverse("queries-view"), {"request_id": "users"})
+        captured_requests = json.loads(response.content)["requests"]
+
+        expected_requests_count = 1
+        actual_requests_count = len(captured_requests)
+        self.assertEqual(expected_requests_count, actual_requests_count)
+
+        expected_queries_count = 4
+        actual_queries_count = captured_requests[0]["count"]
+        self.assertEqual(expected_queries_count, actual_queries_count)
+
+        expected_duplicates_count = 3
+        actual_duplicates_count = captured_requests[0]["duplicates"][0]["count"]
+        self.assertEqual(expected_duplicates_count, actual_duplicates_count)
+
+    def test_filter_by_path(self) -> None:
+        """Do HTTP GET requests to the application and to a Cypress endpoint.
+
+        Make sure that only the request of the application is captured.
+        """
+        self.client.get(reverse("users"))
+        self.client.get(reverse("csrftoken-view"))
+
+        response = self.client.get(reverse("queries-view"), {"path": "/users/"})
+
+        expected_requests_count = 1
+        actual_requests_count = len(json.loads(response.content)["requests"])
+        self.assertEqual(expected_requests_count, actual_requests_count)
+
+        response = self.client.get(reverse("queries-view"))
+
+        expected_paths = ["/users/"]
+        actual_paths = [
+            captured_request["path"]
+            for captured_request in json.loads(response.content)["requests"]
+        ]
+        self.assertEqual(expected_paths, actual_paths)
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "django_cypress.middleware.TransactionIsolationMiddleware",
+        "django_cypress.middleware.ProfilingMiddleware",
+    ]
+)
+class ProfilingTestCase(TestCase):
+    """Test case for the Profiling middleware and the Profiles view."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+        self.client.delete(reverse("profiles-view"))
+
+    def test_profile(self) -> None:
+        """Do an HTTP GET request with the X-Cypress-Profile header.
+
+        Make sure that the request is profiled and that its profile is
+        available in every format.
+        """
+        User.objects.create(username="cypress-user")
+
+        response = self.client.get(
+            reverse("users"), HTTP_X_CYPRESS_PROFILE="cpu,memory"
+        )
+        profile_id = response["X-Cypress-Profile"]
+
+        response = self.client.get(reverse("profiles-view"))
+
+        expected_profiles = [(profile_id, "/users/", True)]
+        actual_profiles = [
+            (profile["profile_id"], profile["path"], profile["memory"])
+            for profile in json.loads(response.content)["profiles"]
+        ]
+        self.assertEqual(expected_profiles, actual_profiles)
+
+        url = reverse("profile-view", args=[profile_id])
+
+        response = self.client.get(url)
+        self.assertIn("function calls", response.content.decode())
+
+        response = self.client.get(url, {"format": "collapsed"})
+        stacks = response.content.decode().splitlines()
+        self.assertTrue(stacks)
+        self.assertTrue(all(stack.rsplit(" ", 1)[1].isdigit() for stack in stacks))
+
+        response = self.client.get(url, {"format": "memory"})
+        self.assertTrue(json.loads(response.content)["allocations"])
+
+    def test_no_profile(self) -> None:
+        """Do HTTP GET requests without the header and to an unknown profile.
+
+        Make sure that nothing is profiled and that the unknown profile is
+        not found.
+        """
+        response = self.client.get(reverse("users"))
+        self.assertNotIn("X-Cypress-Profile", response)
+
+        response = self.client.get(reverse("profiles-view"))
+
+        expected_profiles: List[Dict] = []
+        actual_profiles = json.loads(response.content)["profiles"]
+        self.assertEqual(expected_profiles, actual_profiles)
+
+        response = self.client.get(reverse("profile-view", args=["unknown"]))
+
+        expected_status_code = 404
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+
+@override_settings(EMAIL_BACKEND="django_cypress.mail.EmailBackend")
+class MailViewTestCase(TransactionTestCase):
+    """Test case for the Mail view and the in-memory email backend."""
+
+    def setUp(self) -> None:
+        """Set up the test case."""
+        self.client = Client()
+
+    def test_filter_messages(self) -> None:
+        """Send two email messages and do an HTTP GET request to the MailView.
+
+        Make sure that only the message matching the filters is returned.
+        """
+        send_mail("Welcome", "Hello", "shop@example.com", ["first@example.com"])
+        send_mail("Invoice", "Paid", "shop@example.com", ["second@example.com"])
+
+        response = self.client.get(
+            reverse("mail-view"), {"to": "second@example.com", "subject": "invoice"}
+        )
+
+        expected_subjects = ["Invoice"]
+        actual_subjects = [
+            message["subject"] for message in json.loads(response.content)["messages"]
+        ]
+        self.assertEqual(expected_subjects, actual_subjects)
+
+    def test_wait_for_message(self) -> None:
+        """Do an HTTP GET request to the MailView before the message is sent.
+
+        Make sure that the request returns the message once it is sent, and
+        that a request for a message never sent times out.
+        """
+
+        def send_welcome_mail() -> None:
+            time.sleep(0.2)
+            send_mail("Welcome", "Hello", "shop@example.com", ["user@example.com"])
+
+        thread = threading.Thread(target=send_welcome_mail)
+        thread.start()
+        response = self.client.get(
+            reverse("mail-view"), {"to": "user@example.com", "timeout": "5000"}
+        )
+        thread.join()
+
+        expected_to = [["user@example.com"]]
+        actual_to = [
+            message["to"] for message in json.loads(response.content)["messages"]
+        ]
+        self.assertEqual(expected_to, actual_to)
+
+        response = self.client.get(
+            reverse("mail-view"), {"subject": "Invoice", "timeout": "100"}
+        )
+
+        expected_status_code = HTTPStatus.REQUEST_TIMEOUT
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+    def test_invalid_timeout(self) -> None:
+        """Do an HTTP GET request to the MailView with an invalid timeout.
+
+        Make sure that the HTTP Status Code of the response is 400.
+        """
+        response = self.client.get(reverse("mail-view"), {"timeout": "abc"})
+
+        expected_status_code = HTTPStatus.BAD_REQUEST
+        actual_status_code = response.status_code
+        self.assertEqual(expected_status_code, actual_status_code)
+
+    def test_refresh_database_clears_messages(self) -> None:
+        """Send an email message and do an HTTP POST request to refresh the database.
+
+        Make sure that the outbox is empty afterwards.
+        """
+        send_mail("Welcome", "Hello", "shop@example.com", ["user@example.com"])
+        self.client.post(reverse("refresh-database-view"))
+
+        response = self.client.get(reverse("mail-view"))
+
+        expected_messages: List[Dict] = []
+        actual_messages = json.loads(response.content)["messages"]
+        self.assertEqual(expected_messages, actual_messages)
+
+
+class WarmupViewTestCase(TestCase):
+    """Test case for the Warmup view."""
+
+    def setUp(self) -> None:
+        """Set up the test case with a valid and an invalid template."""
+        self.client = Client()
+        self.directory = tempfile.TemporaryDirectory()
+        Path(self.directory.name, "page.html").write_text("{{ title }}")
+        Path(self.directory.name, "broken.html").write_text("{% unknown_tag %}")
+
+        self.settings_override = override_settings(
+            TEMPLATES=[
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "DIRS": [self.directory.name],
+                }
+            ]
+        )
+        self.settings_override.enable()
+
+    def tearDown(self) -> None:
+        """Restore the templates setting and remove the templates."""
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_warmup(self) -> None:
+        """Do HTTP POST requests to the WarmupView.
+
+        Make sure that every phase ran, that the valid template was
+        compiled and that the warm up runs only once unless forced.
+        """
+        response = self.client.post(
+            reverse("warmup-view"), {"force": True}, "application/json"
+        )
+        report = json.loads(response.content)
+
+        expected_phases = ["urls", "models", "templates", "databases"]
+        actual_phases = list(report["phases"])
+        self.assertEqual(expected_phases, actual_phases)
+        self.assertTrue(report["warmed"])
+
+        expected_templates = {"count": 1, "skipped": 1}
+        actual_templates = {
+            key: report["phases"]["templates"][key] for key in expected_templates
+        }
+        self.assertEqual(expected_templates, actual_templates)
+
+        response = self.client.post(reverse("warmup-view"), {}, "application/json")
+        self.assertFalse(json.loads(response.content)["warmed"])
@@ -4,8 +4,22 @@ Django expects ROOT_URLCONF to exist in the test_settings.py.
 It is not used by installed instances of this app.
 """
 
+from django.contrib.auth.models import User
+from django.http import HttpRequest, JsonResponse
 from django.urls import include, path
 
+
+def users_view(_: HttpRequest) -> JsonResponse:
+    """List the users with their groups, running one query per user."""
+    users = {
+        user.username: [group.name for group in user.groups.all()]
+        for user in User.objects.all()
+    }
+
+    return JsonResponse({"users": users})
+
+
 urlpatterns = [
     path("", include("django_cypress.urls")),
+    path("users/", users_view, name="users"),
 ]